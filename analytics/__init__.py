@@ -1,6 +1,23 @@
 """Analytics helpers for backend features."""
 
-from .metrics import MetricsEvent, MetricsExporter
+from .funnel import DurationHistogram, TutorialFunnel
+from .metrics import CompactEventStore, MetricsEvent, MetricsExporter
+from .sampling import AdaptiveSampler, FixedRateSampler, Sampler
+from .sinks import RotatingNDJSONSink, aggregate_segments, iter_events, list_segments
 from .tutorial import TutorialAnalytics
 
-__all__ = ["MetricsEvent", "MetricsExporter", "TutorialAnalytics"]
+__all__ = [
+    "AdaptiveSampler",
+    "CompactEventStore",
+    "DurationHistogram",
+    "FixedRateSampler",
+    "MetricsEvent",
+    "MetricsExporter",
+    "RotatingNDJSONSink",
+    "Sampler",
+    "TutorialAnalytics",
+    "TutorialFunnel",
+    "aggregate_segments",
+    "iter_events",
+    "list_segments",
+]
@@ -0,0 +1,242 @@
+"""Incremental tutorial funnel aggregation."""
+
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence
+
+from .metrics import MetricsEvent
+
+DEFAULT_DURATION_BUCKETS = (1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0)
+
+
+class DurationHistogram:
+    """Fixed-bucket histogram of durations in seconds.
+
+    ``counts[i]`` holds observations ``<= bounds[i]``; the final slot
+    collects everything above the last bound.
+    """
+
+    __slots__ = ("bounds", "counts", "total", "sum")
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_DURATION_BUCKETS) -> None:
+        self.bounds = tuple(bounds)
+        self.counts: List[float] = [0] * (len(self.bounds) + 1)
+        self.total: float = 0
+        self.sum: float = 0.0
+
+    def observe(self, seconds: float, weight: float = 1) -> None:
+        self.counts[bisect_left(self.bounds, seconds)] += weight
+        self.total += weight
+        self.sum += seconds * weight
+
+    def merge(self, other: "DurationHistogram") -> None:
+        """Add ``other``'s observations; both must share the same bounds."""
+
+        for index, count in enumerate(list(other.counts)):
+            self.counts[index] += count
+        self.total += other.total
+        self.sum += other.sum
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Return the upper bound of the bucket holding ``fraction`` of samples.
+
+        ``None`` means there are no samples; ``inf`` means the percentile
+        falls in the overflow bucket.
+        """
+
+        if not self.total:
+            return None
+        threshold = self.total * fraction
+        running = 0.0
+        for index, count in enumerate(self.counts):
+            running += count
+            if running >= threshold and count:
+                return self.bounds[index] if index < len(self.bounds) else float("inf")
+        return float("inf")
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "bounds": list(self.bounds),
+            "counts": list(self.counts),
+            "total": self.total,
+            "mean": self.sum / self.total if self.total else None,
+            "p50": self.percentile(0.5),
+            "p90": self.percentile(0.9),
+        }
+
+
+class _StepStats:
+    __slots__ = ("engaged", "completed", "durations")
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self.engaged: float = 0
+        self.completed: float = 0
+        self.durations = DurationHistogram(bounds)
+
+    def merge(self, other: "_StepStats") -> None:
+        self.engaged += other.engaged
+        self.completed += other.completed
+        self.durations.merge(other.durations)
+
+
+class _TutorialStats:
+    __slots__ = ("started", "completed", "durations", "steps", "order")
+
+    def __init__(self, bounds: Sequence[float], order: Dict[str, None]) -> None:
+        self.started: float = 0
+        self.completed: float = 0
+        self.durations = DurationHistogram(bounds)
+        self.steps: Dict[str, _StepStats] = {}
+        # Shared by every thread's stats for this tutorial; insertion order
+        # is the order steps were first engaged.
+        self.order = order
+
+    def merge(self, other: "_TutorialStats") -> None:
+        self.started += other.started
+        self.completed += other.completed
+        self.durations.merge(other.durations)
+        for step_id, step in other.steps.copy().items():
+            mine = self.steps.get(step_id)
+            if mine is None:
+                mine = self.steps[step_id] = _StepStats(self.durations.bounds)
+            mine.merge(step)
+
+
+class _Shard:
+    """Per-tutorial stats written only by ``thread``."""
+
+    __slots__ = ("thread", "tutorials")
+
+    def __init__(self, thread: threading.Thread) -> None:
+        self.thread = thread
+        self.tutorials: Dict[str, _TutorialStats] = {}
+
+
+class TutorialFunnel:
+    """Maintains per-tutorial, per-step conversion counts as events arrive.
+
+    Counters are updated in :meth:`record`, so :meth:`funnel` costs
+    ``O(steps)`` regardless of how many events were seen. Durations are read
+    from the ``seconds`` payload field of ``tutorial_step_completed`` and
+    ``tutorial_completed`` events. Steps are reported in the order they were
+    first engaged.
+
+    Each recording thread updates its own counters without taking a lock;
+    :meth:`funnel` sums them, and counters of finished threads are folded
+    into a shared total. A read may miss an update that is still in flight.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_DURATION_BUCKETS) -> None:
+        self._buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._local = threading.local()
+        self._shards: List[_Shard] = []
+        self._retired: Dict[str, _TutorialStats] = {}
+        self._orders: Dict[str, Dict[str, None]] = {}
+
+    def observe(self, event: MetricsEvent) -> None:
+        """Emitter-compatible entry point for ``MetricsExporter``."""
+
+        self.record(event.name, event.payload, event.weight)
+
+    def record(self, name: str, payload: Dict[str, object], weight: float = 1) -> None:
+        tutorial = payload.get("tutorial")
+        if not isinstance(tutorial, str):
+            return
+        tutorials = getattr(self._local, "tutorials", None)
+        if tutorials is None:
+            tutorials = self._register_shard()
+        stats = tutorials.get(tutorial)
+        if stats is None:
+            # dict.setdefault is atomic, so every thread shares one order.
+            stats = tutorials[tutorial] = _TutorialStats(self._buckets, self._orders.setdefault(tutorial, {}))
+        if name == "tutorial_started":
+            stats.started += weight
+        elif name == "tutorial_completed":
+            stats.completed += weight
+            seconds = payload.get("seconds")
+            if isinstance(seconds, (int, float)):
+                stats.durations.observe(seconds, weight)
+        elif name == "tutorial_step_engaged":
+            self._step(stats, payload).engaged += weight
+        elif name == "tutorial_step_completed":
+            step = self._step(stats, payload)
+            step.completed += weight
+            seconds = payload.get("seconds")
+            if isinstance(seconds, (int, float)):
+                step.durations.observe(seconds, weight)
+
+    def _register_shard(self) -> Dict[str, _TutorialStats]:
+        shard = _Shard(threading.current_thread())
+        with self._lock:
+            self._shards.append(shard)
+        self._local.tutorials = shard.tutorials
+        return shard.tutorials
+
+    def _step(self, stats: _TutorialStats, payload: Dict[str, object]) -> _StepStats:
+        step_id = str(payload.get("step"))
+        step = stats.steps.get(step_id)
+        if step is None:
+            step = stats.steps[step_id] = _StepStats(self._buckets)
+            stats.order.setdefault(step_id, None)
+        return step
+
+    def _parts(self, tutorial_id: str) -> List[_TutorialStats]:
+        with self._lock:
+            for shard in [shard for shard in self._shards if not shard.thread.is_alive()]:
+                self._shards.remove(shard)
+                for key, stats in shard.tutorials.items():
+                    retired = self._retired.get(key)
+                    if retired is None:
+                        retired = self._retired[key] = _TutorialStats(self._buckets, stats.order)
+                    retired.merge(stats)
+            sources = [self._retired] + [shard.tutorials for shard in self._shards]
+        return [stats for stats in (source.get(tutorial_id) for source in sources) if stats is not None]
+
+    def tutorials(self) -> List[str]:
+        return list(self._orders.copy())
+
+    def funnel(self, tutorial_id: str) -> Dict[str, object]:
+        """Return conversion and drop-off per step for ``tutorial_id``."""
+
+        parts = self._parts(tutorial_id)
+        if not parts:
+            return {"tutorial": tutorial_id, "started": 0, "completed": 0, "conversion": None, "steps": []}
+        stats = _TutorialStats(self._buckets, parts[0].order)
+        for part in parts:
+            stats.merge(part)
+        steps = []
+        for step_id in list(stats.order.copy()):
+            step = stats.steps.get(step_id)
+            if step is None:
+                continue
+            steps.append(
+                {
+                    "step": step_id,
+                    "engaged": step.engaged,
+                    "completed": step.completed,
+                    "conversion": step.completed / step.engaged if step.engaged else None,
+                    "dropOff": max(step.engaged - step.completed, 0),
+                    "duration": step.durations.to_dict(),
+                }
+            )
+        return {
+            "tutorial": tutorial_id,
+            "started": stats.started,
+            "completed": stats.completed,
+            "conversion": stats.completed / stats.started if stats.started else None,
+            "duration": stats.durations.to_dict(),
+            "steps": steps,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reset()
+
+
+__all__ = ["DEFAULT_DURATION_BUCKETS", "DurationHistogram", "TutorialFunnel"]
@@ -2,8 +2,17 @@
 
 from __future__ import annotations
 
+import heapq
+import itertools
+import threading
+import time
+from array import array
+from collections import deque
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Callable, Dict, List, Optional
+from typing import Callable, Deque, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union, overload
+
+from .sampling import Sampler
 
 
 @dataclass(frozen=True)
@@ -12,46 +21,361 @@ class MetricsEvent:
 
     name: str
     payload: Dict[str, object]
+    weight: float = 1
+
+
+def _count_key(name: str, tutorial: object) -> str:
+    return f"{name}:{tutorial}" if tutorial else name
+
+
+class CompactEventStore(Sequence[MetricsEvent]):
+    """Column-oriented event buffer with interned names and payload values.
+
+    Events are kept as integer handles in typed arrays instead of one
+    ``MetricsEvent`` plus payload ``dict`` per event. Names, payload key
+    tuples and hashable payload values are interned, so a stream of
+    ``{"tutorial": ..., "step": ...}`` payloads costs a handful of bytes per
+    event. ``MetricsEvent`` objects are only materialized when indexed or
+    iterated. A weight column is only allocated once a sampled event with a
+    weight other than ``1`` arrives.
+    """
+
+    def __init__(self) -> None:
+        self._names: List[str] = []
+        self._name_index: Dict[str, int] = {}
+        self._shapes: List[Tuple[str, ...]] = []
+        self._shape_index: Dict[Tuple[str, ...], int] = {}
+        self._values: List[object] = []
+        self._value_index: Dict[Tuple[type, object], int] = {}
+        self._name_ids = array("I")
+        self._shape_ids = array("I")
+        self._offsets = array("I")
+        self._value_ids = array("I")
+        self._weights: Optional[array] = None
+
+    def add(self, name: str, payload: Dict[str, object], weight: float = 1) -> None:
+        """Append an event without allocating a ``MetricsEvent``."""
+
+        name_id = self._name_index.get(name)
+        if name_id is None:
+            name_id = self._name_index[name] = len(self._names)
+            self._names.append(name)
+        shape = tuple(payload)
+        shape_id = self._shape_index.get(shape)
+        if shape_id is None:
+            shape_id = self._shape_index[shape] = len(self._shapes)
+            self._shapes.append(shape)
+        self._name_ids.append(name_id)
+        self._shape_ids.append(shape_id)
+        self._offsets.append(len(self._value_ids))
+        for value in payload.values():
+            self._value_ids.append(self._intern_value(value))
+        if self._weights is not None:
+            self._weights.append(weight)
+        elif weight != 1:
+            self._weights = array("d", [1.0]) * (len(self._name_ids) - 1)
+            self._weights.append(weight)
+
+    def _intern_value(self, value: object) -> int:
+        try:
+            key = (type(value), value)
+            value_id = self._value_index.get(key)
+        except TypeError:
+            # Unhashable values (lists, dicts) are stored as-is.
+            self._values.append(value)
+            return len(self._values) - 1
+        if value_id is None:
+            value_id = self._value_index[key] = len(self._values)
+            self._values.append(value)
+        return value_id
+
+    def _materialize(self, index: int) -> MetricsEvent:
+        shape = self._shapes[self._shape_ids[index]]
+        start = self._offsets[index]
+        values = self._values
+        value_ids = self._value_ids
+        payload = {key: values[value_ids[start + offset]] for offset, key in enumerate(shape)}
+        weight = self._weights[index] if self._weights is not None else 1
+        return MetricsEvent(name=self._names[self._name_ids[index]], payload=payload, weight=weight)
+
+    @overload
+    def __getitem__(self, index: int) -> MetricsEvent: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[MetricsEvent]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[MetricsEvent, List[MetricsEvent]]:
+        if isinstance(index, slice):
+            return [self._materialize(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("event index out of range")
+        return self._materialize(index)
+
+    def __len__(self) -> int:
+        return len(self._name_ids)
+
+    def __iter__(self) -> Iterator[MetricsEvent]:
+        for index in range(len(self)):
+            yield self._materialize(index)
+
+    def iter_field(self, field: str) -> Iterator[Tuple[str, object]]:
+        """Yield ``(name, payload[field])`` pairs without materializing events.
+
+        Events whose payload lacks ``field`` yield ``None`` for the value.
+        """
+
+        positions = [shape.index(field) if field in shape else -1 for shape in self._shapes]
+        names = self._names
+        values = self._values
+        value_ids = self._value_ids
+        offsets = self._offsets
+        for index, (name_id, shape_id) in enumerate(zip(self._name_ids, self._shape_ids)):
+            position = positions[shape_id]
+            value = values[value_ids[offsets[index] + position]] if position >= 0 else None
+            yield names[name_id], value
+
+    def iter_weights(self) -> Iterator[float]:
+        """Yield each event's sampling weight in insertion order."""
+
+        if self._weights is None:
+            return itertools.repeat(1, len(self))
+        return iter(self._weights)
+
+    def clear(self) -> None:
+        """Drop all events and interned values."""
+
+        self.__init__()
+
+
+class _ThreadBuffer:
+    """Append-only queue owned by one recording thread.
+
+    ``started`` and ``finished`` count appends begun and completed. Only the
+    owning thread writes them, so a merge can tell whether an event holding
+    an already-issued sequence number is still on its way into ``items``.
+    ``dropped`` counts this thread's events discarded by sampling.
+    """
+
+    __slots__ = ("thread", "items", "started", "finished", "dropped")
+
+    def __init__(self, thread: threading.Thread) -> None:
+        self.thread = thread
+        self.items: Deque[Tuple[int, str, Dict[str, object], float]] = deque()
+        self.started = 0
+        self.finished = 0
+        self.dropped: Dict[str, int] = {}
 
 
 class MetricsExporter:
-    """Collects analytics events and optionally forwards them to a sink."""
+    """Collects analytics events and optionally forwards them to a sink.
+
+    Pass ``compact=True`` to keep events in a :class:`CompactEventStore`,
+    which trades a small materialization cost on read for a much smaller
+    per-event memory footprint.
+
+    Pass ``concurrent=True`` when many threads share one exporter. Each
+    thread then appends to its own buffer without taking a lock, and the
+    buffers are merged in record order on :meth:`flush` or on any read.
+    Reads see every event recorded before the read started, and events
+    recorded later are always stored after them. The emitter, if any, is
+    called on the recording thread and must be thread-safe.
+
+    ``sampling`` maps event names to :class:`~analytics.sampling.Sampler`
+    rules. Sampling decisions are made before the payload is copied; kept
+    events carry the sampler's weight, and :meth:`export_counts` sums
+    weights so the counts remain unbiased estimates.
+    """
 
     def __init__(
         self,
         emitter: Optional[Callable[[MetricsEvent], None]] = None,
+        *,
+        compact: bool = False,
+        concurrent: bool = False,
+        sampling: Optional[Mapping[str, Sampler]] = None,
     ) -> None:
-        self._events: List[MetricsEvent] = []
+        self._compact = compact
+        self._events: Union[List[MetricsEvent], CompactEventStore] = CompactEventStore() if compact else []
         self._emitter = emitter
+        self._local: Optional[threading.local] = threading.local() if concurrent else None
+        self._buffers: List[_ThreadBuffer] = []
+        self._registry_lock = threading.Lock()
+        self._merge_lock = threading.Lock()
+        self._sequence = itertools.count()
+        self._samplers: Dict[str, Sampler] = dict(sampling or {})
+        self._dropped: Dict[str, int] = {}
+
+    @property
+    def compact(self) -> bool:
+        return self._compact
+
+    @property
+    def concurrent(self) -> bool:
+        return self._local is not None
+
+    def set_sampler(self, name: str, sampler: Optional[Sampler]) -> None:
+        """Install or, with ``None``, remove the sampling rule for ``name``."""
+
+        if sampler is None:
+            self._samplers.pop(name, None)
+        else:
+            self._samplers[name] = sampler
+
+    @property
+    def dropped(self) -> Dict[str, int]:
+        """Number of events discarded by sampling, per event name."""
+
+        with self._registry_lock:
+            totals = dict(self._dropped)
+            for buffer in self._buffers:
+                for name, count in buffer.dropped.copy().items():
+                    totals[name] = totals.get(name, 0) + count
+        return totals
 
     def record(self, name: str, payload: Optional[Dict[str, object]] = None) -> None:
         """Store an event and emit it if a sink is configured."""
 
-        event = MetricsEvent(name=name, payload=dict(payload or {}))
+        weight: float = 1
+        if self._samplers:
+            sampler = self._samplers.get(name)
+            if sampler is not None:
+                weight = sampler.sample()
+                if not weight:
+                    # Concurrent recorders count drops in their own buffer.
+                    dropped = self._dropped if self._local is None else self._thread_buffer().dropped
+                    dropped[name] = dropped.get(name, 0) + 1
+                    return
+        if self._local is not None:
+            buffer = self._thread_buffer()
+            data = dict(payload or {})
+            # deque.append and next() on itertools.count are atomic under the GIL;
+            # the counters around them let a concurrent merge wait for this append.
+            buffer.started += 1
+            buffer.items.append((next(self._sequence), name, data, weight))
+            buffer.finished += 1
+            if self._emitter is not None:
+                self._emitter(MetricsEvent(name=name, payload=dict(data), weight=weight))
+            return
+        if self._compact:
+            self._events.add(name, payload or {}, weight)
+            if self._emitter is not None:
+                self._emitter(self._events[-1])
+            return
+        event = MetricsEvent(name=name, payload=dict(payload or {}), weight=weight)
         self._events.append(event)
         if self._emitter is not None:
             self._emitter(event)
 
+    def _thread_buffer(self) -> _ThreadBuffer:
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            buffer = self._register_buffer()
+        return buffer
+
+    def _register_buffer(self) -> _ThreadBuffer:
+        buffer = _ThreadBuffer(threading.current_thread())
+        with self._registry_lock:
+            self._buffers.append(buffer)
+        self._local.buffer = buffer
+        return buffer
+
+    def flush(self) -> int:
+        """Merge per-thread buffers into the shared store.
+
+        Returns the number of events merged; always ``0`` when the exporter
+        is not in concurrent mode.
+        """
+
+        if self._local is None:
+            return 0
+        with self._merge_lock:
+            return self._merge_unlocked()
+
+    def _merge_unlocked(self) -> int:
+        cutoff = next(self._sequence)
+        with self._registry_lock:
+            buffers = list(self._buffers)
+        # An append that began before the cutoff may hold a lower sequence
+        # number without having reached its queue yet. Wait for it, so no
+        # event below the cutoff can arrive after this merge has passed it.
+        for buffer in buffers:
+            started = buffer.started
+            while buffer.finished < started and buffer.thread.is_alive():
+                time.sleep(0)
+        drained: List[List[Tuple[int, str, Dict[str, object], float]]] = []
+        for buffer in buffers:
+            items = buffer.items
+            batch = []
+            while items and items[0][0] < cutoff:
+                batch.append(items.popleft())
+            if batch:
+                drained.append(batch)
+        dead = [buffer for buffer in buffers if not buffer.items and not buffer.thread.is_alive()]
+        if dead:
+            with self._registry_lock:
+                self._buffers = [buffer for buffer in self._buffers if buffer not in dead]
+                for buffer in dead:
+                    for name, count in buffer.dropped.items():
+                        self._dropped[name] = self._dropped.get(name, 0) + count
+        merged = 0
+        for _, name, data, weight in heapq.merge(*drained):
+            self._store_unlocked(name, data, weight)
+            merged += 1
+        return merged
+
+    def _store_unlocked(self, name: str, data: Dict[str, object], weight: float) -> None:
+        if self._compact:
+            self._events.add(name, data, weight)
+        else:
+            self._events.append(MetricsEvent(name=name, payload=data, weight=weight))
+
+    @contextmanager
+    def _reading(self) -> Iterator[None]:
+        if self._local is None:
+            yield
+            return
+        with self._merge_lock:
+            self._merge_unlocked()
+            yield
+
     @property
     def events(self) -> List[MetricsEvent]:
         """Return a snapshot of the collected events."""
 
-        return list(self._events)
+        with self._reading():
+            return list(self._events)
+
+    def export_counts(self) -> Dict[str, float]:
+        """Aggregate counts per metric for quick assertions and summaries.
 
-    def export_counts(self) -> Dict[str, int]:
-        """Aggregate counts per metric for quick assertions and summaries."""
+        Sampled events contribute their weight, so counts for sampled names
+        are estimates and may be fractional.
+        """
 
-        counts: Dict[str, int] = {}
-        for event in self._events:
-            tutorial = event.payload.get("tutorial")
-            key = f"{event.name}:{tutorial}" if tutorial else event.name
-            counts[key] = counts.get(key, 0) + 1
-        return counts
+        with self._reading():
+            if self._compact:
+                rows: Iterator[Tuple[str, object, float]] = (
+                    (name, tutorial, weight)
+                    for (name, tutorial), weight in zip(
+                        self._events.iter_field("tutorial"),
+                        self._events.iter_weights(),
+                    )
+                )
+            else:
+                rows = ((event.name, event.payload.get("tutorial"), event.weight) for event in self._events)
+            counts: Dict[str, float] = {}
+            for name, tutorial, weight in rows:
+                key = _count_key(name, tutorial)
+                counts[key] = counts.get(key, 0) + weight
+            return counts
 
     def clear(self) -> None:
         """Reset the internal event buffer."""
 
-        self._events.clear()
+        with self._reading():
+            self._events.clear()
 
 
-__all__ = ["MetricsEvent", "MetricsExporter"]
+__all__ = ["CompactEventStore", "MetricsEvent", "MetricsExporter"]
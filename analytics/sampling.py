@@ -0,0 +1,95 @@
+"""Per-event sampling rules for :class:`MetricsExporter`."""
+
+from __future__ import annotations
+
+import itertools
+import random
+import threading
+import time
+from typing import Callable, Optional
+
+
+class Sampler:
+    """Decides whether an event is kept and with what weight.
+
+    :meth:`sample` returns ``0`` to drop the event, or the inverse of the
+    keep probability so weighted sums stay unbiased estimates of the true
+    totals.
+    """
+
+    def sample(self) -> float:  # pragma: no cover - interface
+        raise NotImplementedError
+
+
+class FixedRateSampler(Sampler):
+    """Keeps each event independently with probability ``rate``."""
+
+    def __init__(self, rate: float, *, rng: Optional[random.Random] = None) -> None:
+        if not 0 < rate <= 1:
+            raise ValueError("rate must be in (0, 1]")
+        self.rate = float(rate)
+        self._weight = 1 if rate == 1 else 1.0 / rate
+        self._random = (rng or random.Random()).random
+
+    def sample(self) -> float:
+        if self._weight == 1 or self._random() < self.rate:
+            return self._weight
+        return 0
+
+
+class AdaptiveSampler(Sampler):
+    """Keeps roughly ``target_per_second`` events per second.
+
+    The keep probability is recomputed at the end of every ``window`` from the
+    number of events offered during it. Until traffic exceeds the budget every
+    event is kept with weight ``1``. Safe to share between threads: offers are
+    counted atomically and only one thread rolls each window over.
+    """
+
+    def __init__(
+        self,
+        target_per_second: float,
+        *,
+        window: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        if target_per_second <= 0:
+            raise ValueError("target_per_second must be positive")
+        self.target_per_second = float(target_per_second)
+        self._window = max(float(window), 1e-3)
+        self._clock = clock
+        self._random = (rng or random.Random()).random
+        self._window_started = clock()
+        self._offered = itertools.count()
+        self._roll = threading.Lock()
+        self._probability = 1.0
+
+    @property
+    def probability(self) -> float:
+        return self._probability
+
+    def sample(self) -> float:
+        now = self._clock()
+        if now - self._window_started >= self._window and self._roll.acquire(blocking=False):
+            try:
+                elapsed = now - self._window_started
+                if elapsed >= self._window:
+                    # next() on itertools.count is atomic under the GIL; its
+                    # value is the number of offers counted so far.
+                    offered, self._offered = self._offered, itertools.count()
+                    rate = next(offered) / elapsed
+                    self._probability = min(1.0, self.target_per_second / rate) if rate else 1.0
+                    self._window_started = now
+            finally:
+                self._roll.release()
+        next(self._offered)
+        probability = self._probability
+        if probability >= 1.0:
+            return 1
+        if self._random() < probability:
+            return 1.0 / probability
+        return 0
+
+
+__all__ = ["AdaptiveSampler", "FixedRateSampler", "Sampler"]
@@ -0,0 +1,335 @@
+"""Durable NDJSON sink for :class:`MetricsExporter` and a streaming reader."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import shutil
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, IO, Iterable, Iterator, List, Optional
+
+from .funnel import TutorialFunnel
+from .metrics import MetricsEvent, _count_key
+from .timers import start_flush_timer, stop_flush_timer
+
+_ACTIVE_SUFFIX = ".ndjson.active"
+_SEGMENT_SUFFIX = ".ndjson"
+_COMPRESSED_SUFFIX = ".ndjson.gz"
+_PARTIAL_SUFFIX = ".tmp"
+
+
+class RotatingNDJSONSink:
+    """Buffers events and appends them to rotating NDJSON segment files.
+
+    The sink is callable, so it can be passed straight to
+    ``MetricsExporter(emitter=...)``. Lines are buffered until
+    ``buffer_size`` events are pending or the oldest pending event is older
+    than ``flush_interval`` seconds. The active segment is written as
+    ``<prefix>-<timestamp>-<seq>.ndjson.active`` and renamed to ``.ndjson``
+    once it exceeds ``max_bytes`` or ``max_age`` seconds.
+
+    When ``compress`` is set, sealed segments are gzipped to ``.ndjson.gz``
+    off the recording thread: by the flush timer, by :meth:`rotate` or by
+    :meth:`close`. Until then they stay readable as ``.ndjson``.
+
+    Unless ``autoflush`` is false, a daemon thread applies both deadlines
+    while no events arrive, and the sink is closed at interpreter exit. A
+    directory and prefix belong to one sink at a time: on startup, active
+    segments left behind by a crashed process are sealed so readers see them.
+    """
+
+    def __init__(
+        self,
+        directory: os.PathLike[str] | str,
+        *,
+        prefix: str = "events",
+        max_bytes: int = 8 * 1024 * 1024,
+        max_age: float = 300.0,
+        buffer_size: int = 256,
+        flush_interval: float = 1.0,
+        compress: bool = False,
+        autoflush: bool = True,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._prefix = prefix
+        self._max_bytes = max(int(max_bytes), 1)
+        self._max_age = max(float(max_age), 0.0)
+        self._buffer_size = max(int(buffer_size), 1)
+        self._flush_interval = max(float(flush_interval), 0.0)
+        self._compress = compress
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._compress_lock = threading.Lock()
+        self._to_compress: List[Path] = []
+        self._buffer: List[str] = []
+        self._buffer_started: float = 0.0
+        self._handle: Optional[IO[str]] = None
+        self._active_path: Optional[Path] = None
+        self._segment_started: float = 0.0
+        self._segment_bytes: int = 0
+        self._sequence: int = 0
+        self._stop: Optional[threading.Event] = None
+        self._recover()
+        if autoflush:
+            self._start_timer()
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    def __call__(self, event: MetricsEvent) -> None:
+        record: Dict[str, object] = {"name": event.name, "payload": event.payload}
+        if event.weight != 1:
+            record["weight"] = event.weight
+        line = json.dumps(
+            record,
+            ensure_ascii=False,
+            separators=(",", ":"),
+            default=str,
+        )
+        now = self._clock()
+        with self._lock:
+            if not self._buffer:
+                self._buffer_started = now
+            self._buffer.append(line)
+            if len(self._buffer) >= self._buffer_size or now - self._buffer_started >= self._flush_interval:
+                self._flush_unlocked(now)
+
+    def flush(self) -> None:
+        """Write any buffered events to the active segment."""
+
+        with self._lock:
+            self._flush_unlocked(self._clock())
+
+    def rotate(self) -> Optional[Path]:
+        """Flush and seal the active segment, returning its final path."""
+
+        with self._lock:
+            self._flush_unlocked(self._clock(), rotate=False)
+            sealed = self._seal_unlocked()
+        if self._compress:
+            self._compress_pending()
+            if sealed is not None:
+                return _compressed_path(sealed)
+        return sealed
+
+    def close(self) -> None:
+        """Stop the flush timer, flush pending events and seal the active segment."""
+
+        if self._stop is not None:
+            stop_flush_timer(self, self._stop)
+            self._stop = None
+        self.rotate()
+
+    def _start_timer(self) -> None:
+        interval = min((value for value in (self._flush_interval, self._max_age) if value > 0), default=1.0)
+        self._stop = start_flush_timer(self, RotatingNDJSONSink._tick, interval, name="ndjson-sink-flush")
+
+    def _tick(self) -> None:
+        """Apply ``flush_interval`` and ``max_age`` without waiting for an event."""
+
+        with self._lock:
+            now = self._clock()
+            if self._buffer and now - self._buffer_started >= self._flush_interval:
+                self._flush_unlocked(now)
+            elif self._handle is not None and now - self._segment_started >= self._max_age:
+                self._seal_unlocked()
+        self._compress_pending()
+
+    def _compress_pending(self) -> None:
+        """Gzip sealed segments outside the sink lock so recording never waits on it."""
+
+        with self._compress_lock:
+            while True:
+                with self._lock:
+                    if not self._to_compress:
+                        return
+                    path = self._to_compress[0]
+                _compress_segment(path)
+                with self._lock:
+                    self._to_compress.remove(path)
+
+    def _recover(self) -> None:
+        for path in self._directory.glob(f"{self._prefix}-*{_COMPRESSED_SUFFIX}{_PARTIAL_SUFFIX}"):
+            path.unlink()
+        for path in self._directory.glob(f"{self._prefix}-*{_SEGMENT_SUFFIX}"):
+            if _compressed_path(path).exists():
+                path.unlink()
+        for path in list_segments(self._directory, prefix=self._prefix, include_active=True):
+            stem = path.name[len(self._prefix) + 1 :].split(".", 1)[0]
+            try:
+                self._sequence = max(self._sequence, int(stem.rsplit("-", 1)[-1]))
+            except ValueError:
+                continue
+            if path.name.endswith(_ACTIVE_SUFFIX):
+                self._seal_path(path)
+            elif self._compress and path.name.endswith(_SEGMENT_SUFFIX):
+                self._to_compress.append(path)
+
+    def segments(self) -> List[Path]:
+        """Return sealed segment paths in the order they were written."""
+
+        return list_segments(self._directory, prefix=self._prefix)
+
+    def _flush_unlocked(self, now: float, *, rotate: bool = True) -> None:
+        if self._buffer:
+            if self._handle is None:
+                self._open_segment_unlocked(now)
+            data = "\n".join(self._buffer) + "\n"
+            self._buffer.clear()
+            self._handle.write(data)
+            self._handle.flush()
+            self._segment_bytes += len(data.encode("utf-8"))
+        if rotate and self._handle is not None and (
+            self._segment_bytes >= self._max_bytes or now - self._segment_started >= self._max_age
+        ):
+            self._seal_unlocked()
+
+    def _open_segment_unlocked(self, now: float) -> None:
+        self._sequence += 1
+        stem = f"{self._prefix}-{int(now * 1000):013d}-{self._sequence:04d}"
+        self._active_path = self._directory / f"{stem}{_ACTIVE_SUFFIX}"
+        self._handle = self._active_path.open("a", encoding="utf-8")
+        self._segment_started = now
+        self._segment_bytes = 0
+
+    def _seal_unlocked(self) -> Optional[Path]:
+        if self._handle is None or self._active_path is None:
+            return None
+        self._handle.close()
+        active = self._active_path
+        self._handle = None
+        self._active_path = None
+        return self._seal_path(active)
+
+    def _seal_path(self, active: Path) -> Path:
+        target = active.with_name(active.name[: -len(_ACTIVE_SUFFIX)] + _SEGMENT_SUFFIX)
+        active.replace(target)
+        if self._compress:
+            self._to_compress.append(target)
+        return target
+
+
+def _compressed_path(segment: Path) -> Path:
+    return segment.with_name(segment.name[: -len(_SEGMENT_SUFFIX)] + _COMPRESSED_SUFFIX)
+
+
+def _compress_segment(segment: Path) -> None:
+    # The gzip file appears under its final name only once complete, and
+    # list_segments hides the plain copy from then until it is unlinked.
+    target = _compressed_path(segment)
+    partial = target.with_name(target.name + _PARTIAL_SUFFIX)
+    try:
+        with segment.open("rb") as source, gzip.open(partial, "wb") as sink:
+            shutil.copyfileobj(source, sink)
+    except FileNotFoundError:
+        return
+    os.replace(partial, target)
+    segment.unlink()
+
+
+def list_segments(
+    directory: os.PathLike[str] | str,
+    *,
+    prefix: str = "events",
+    include_active: bool = False,
+) -> List[Path]:
+    """Return segment files under ``directory`` sorted by write order.
+
+    A plain segment whose gzipped copy already exists is skipped.
+    """
+
+    suffixes = [_SEGMENT_SUFFIX, _COMPRESSED_SUFFIX]
+    if include_active:
+        suffixes.append(_ACTIVE_SUFFIX)
+    paths = [
+        path
+        for path in Path(directory).glob(f"{prefix}-*")
+        if any(path.name.endswith(suffix) for suffix in suffixes)
+    ]
+    names = {path.name for path in paths}
+    paths = [
+        path
+        for path in paths
+        if not (path.name.endswith(_SEGMENT_SUFFIX) and _compressed_path(path).name in names)
+    ]
+    return sorted(paths, key=lambda path: path.name)
+
+
+def iter_events(paths: Iterable[os.PathLike[str] | str]) -> Iterator[MetricsEvent]:
+    """Stream events from NDJSON segments one line at a time.
+
+    Blank and truncated lines, such as a partial write left behind by a
+    crashed process, are skipped.
+    """
+
+    for path in paths:
+        path = Path(path)
+        opener = gzip.open if path.name.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as handle:
+            for line in handle:
+                if not line.strip():
+                    continue
+                try:
+                    raw = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if not isinstance(raw, dict) or not isinstance(raw.get("name"), str):
+                    continue
+                payload = raw.get("payload")
+                weight = raw.get("weight", 1)
+                yield MetricsEvent(
+                    name=raw["name"],
+                    payload=payload if isinstance(payload, dict) else {},
+                    weight=weight if isinstance(weight, (int, float)) else 1,
+                )
+
+
+@dataclass
+class SegmentSummary:
+    """Aggregated counts and tutorial funnels read back from segments."""
+
+    events: int = 0
+    counts: Dict[str, float] = field(default_factory=dict)
+    funnel: TutorialFunnel = field(default_factory=TutorialFunnel)
+
+
+def aggregate_events(events: Iterable[MetricsEvent]) -> SegmentSummary:
+    """Fold an event stream into counts and a :class:`TutorialFunnel`.
+
+    Memory use is bounded by the number of distinct counters, tutorials and
+    steps, not by the number of events. Sampled events count with their
+    weight.
+    """
+
+    summary = SegmentSummary()
+    counts = summary.counts
+    funnel = summary.funnel
+    for event in events:
+        summary.events += 1
+        key = _count_key(event.name, event.payload.get("tutorial"))
+        counts[key] = counts.get(key, 0) + event.weight
+        funnel.observe(event)
+    return summary
+
+
+def aggregate_segments(paths: Iterable[os.PathLike[str] | str]) -> SegmentSummary:
+    """Stream ``paths`` and aggregate them with :func:`aggregate_events`."""
+
+    return aggregate_events(iter_events(paths))
+
+
+__all__ = [
+    "RotatingNDJSONSink",
+    "SegmentSummary",
+    "aggregate_events",
+    "aggregate_segments",
+    "iter_events",
+    "list_segments",
+]
@@ -0,0 +1,64 @@
+"""Background flush timers for write-behind buffers."""
+
+from __future__ import annotations
+
+import atexit
+import threading
+import weakref
+from typing import Callable, Tuple, Type, TypeVar
+
+T = TypeVar("T")
+
+_OPEN: "weakref.WeakSet[object]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open() -> None:
+    for owner in list(_OPEN):
+        owner.close()
+
+
+def start_flush_timer(
+    owner: T,
+    tick: Callable[[T], None],
+    interval: float,
+    *,
+    name: str,
+    retry: Tuple[Type[BaseException], ...] = (OSError,),
+) -> threading.Event:
+    """Call ``tick(owner)`` every ``interval`` seconds on a daemon thread.
+
+    The thread holds only a weak reference, so an unclosed owner can still be
+    collected. Until :func:`stop_flush_timer` is called, ``owner.close()``
+    runs at interpreter exit. Errors listed in ``retry`` are retried on the
+    next tick. Returns the event that stops the thread.
+    """
+
+    stop = threading.Event()
+    ref = weakref.ref(owner)
+    interval = max(interval, 0.01)
+
+    def run() -> None:
+        while not stop.wait(interval):
+            target = ref()
+            if target is None:
+                return
+            try:
+                tick(target)
+            except retry:  # pragma: no cover - retried on the next tick
+                pass
+            del target
+
+    threading.Thread(target=run, name=name, daemon=True).start()
+    _OPEN.add(owner)
+    return stop
+
+
+def stop_flush_timer(owner: object, stop: threading.Event) -> None:
+    """Stop a timer from :func:`start_flush_timer` and drop ``owner`` from the exit hook."""
+
+    stop.set()
+    _OPEN.discard(owner)
+
+
+__all__ = ["start_flush_timer", "stop_flush_timer"]
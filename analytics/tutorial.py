@@ -2,41 +2,66 @@
 
 from __future__ import annotations
 
-from typing import Optional
+from typing import Dict, Optional
 
+from .funnel import TutorialFunnel
 from .metrics import MetricsExporter
 
 
 class TutorialAnalytics:
-    """Wraps metric exports for tutorial-specific events."""
+    """Wraps metric exports for tutorial-specific events.
 
-    def __init__(self, exporter: Optional[MetricsExporter] = None) -> None:
+    Every tracked event also updates a :class:`TutorialFunnel`, so funnel
+    queries never need to re-scan the exporter's raw events. The funnel is
+    fed before exporter sampling and therefore stays exact.
+    """
+
+    def __init__(
+        self,
+        exporter: Optional[MetricsExporter] = None,
+        *,
+        funnel: Optional[TutorialFunnel] = None,
+    ) -> None:
         self._exporter = exporter or MetricsExporter()
+        self._funnel = funnel or TutorialFunnel()
 
     @property
     def exporter(self) -> MetricsExporter:
         return self._exporter
 
+    @property
+    def funnel(self) -> TutorialFunnel:
+        return self._funnel
+
+    def _record(self, name: str, payload: Dict[str, object]) -> None:
+        self._exporter.record(name, payload)
+        self._funnel.record(name, payload)
+
     def track_tutorial_start(self, tutorial_id: str) -> None:
-        self._exporter.record("tutorial_started", {"tutorial": tutorial_id})
+        self._record("tutorial_started", {"tutorial": tutorial_id})
 
     def track_step_engaged(self, tutorial_id: str, step_id: str) -> None:
-        self._exporter.record(
+        self._record(
             "tutorial_step_engaged",
             {"tutorial": tutorial_id, "step": step_id},
         )
 
-    def track_step_completed(self, tutorial_id: str, step_id: str) -> None:
-        self._exporter.record(
-            "tutorial_step_completed",
-            {"tutorial": tutorial_id, "step": step_id},
-        )
+    def track_step_completed(self, tutorial_id: str, step_id: str, seconds: Optional[float] = None) -> None:
+        payload: Dict[str, object] = {"tutorial": tutorial_id, "step": step_id}
+        if seconds is not None:
+            payload["seconds"] = round(seconds, 3)
+        self._record("tutorial_step_completed", payload)
 
-    def track_tutorial_completed(self, tutorial_id: str, steps_completed: int) -> None:
-        self._exporter.record(
-            "tutorial_completed",
-            {"tutorial": tutorial_id, "steps": steps_completed},
-        )
+    def track_tutorial_completed(
+        self,
+        tutorial_id: str,
+        steps_completed: int,
+        seconds: Optional[float] = None,
+    ) -> None:
+        payload: Dict[str, object] = {"tutorial": tutorial_id, "steps": steps_completed}
+        if seconds is not None:
+            payload["seconds"] = round(seconds, 3)
+        self._record("tutorial_completed", payload)
 
     def track_hint_visibility(self, tutorial_id: str, enabled: bool) -> None:
         self._exporter.record(
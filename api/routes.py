@@ -1,5 +1,7 @@
 from __future__ import annotations
+import hmac
 import json
+import os
 import time
 from http import HTTPStatus
 from collections import defaultdict, deque
@@ -8,7 +10,8 @@ from typing import Callable, DefaultDict, Deque, Dict, Iterable, Tuple
 from urllib.parse import parse_qs
 
 from config import get_settings
-from server.leaderboard import get_top_scores, submit_score
+from server.leaderboard import get_top_scores, submit_score, submit_score_and_rank
+from server.profiling import PROFILER
 
 StartResponse = Callable[[str, list[Tuple[str, str]]], None]
 
@@ -72,11 +75,25 @@ def reset_rate_limiter() -> None:
     _rate_limiter.reset()
 
 
+_PROFILE_PATH = "/api/admin/profile"
+
+
 def application(environ: Dict[str, object], start_response: StartResponse) -> Iterable[bytes]:
+    if PROFILER.active:
+        return PROFILER.call(_application, environ, start_response)
+    return _application(environ, start_response)
+
+
+def _application(environ: Dict[str, object], start_response: StartResponse) -> Iterable[bytes]:
     method = environ.get("REQUEST_METHOD", "GET").upper()
     path = environ.get("PATH_INFO", "")
     client_ip = environ.get("REMOTE_ADDR", "anonymous")
 
+    if path == _PROFILE_PATH:
+        status, headers, body = _handle_profile(environ, method)
+        start_response(status, headers)
+        return [body]
+
     if path != "/api/leaderboard":
         status, headers, body = _json_response(
             HTTPStatus.NOT_FOUND,
@@ -147,6 +164,7 @@ def _handle_post(environ: Dict[str, object], client_ip: str) -> Tuple[str, list[
     score = payload.get("score")
     handle = payload.get("handle")
     share = payload.get("share")
+    limit = payload.get("limit")
 
     if not isinstance(game_id, str) or not game_id.strip():
         raise ValueError("game must be a non-empty string")
@@ -156,18 +174,76 @@ def _handle_post(environ: Dict[str, object], client_ip: str) -> Tuple[str, list[
         raise ValueError("handle must be a string when provided")
     if share is not None and not isinstance(share, bool):
         raise ValueError("share must be a boolean when provided")
+    if limit is not None and (isinstance(limit, bool) or not isinstance(limit, int) or limit <= 0):
+        raise ValueError("limit must be a positive integer when provided")
 
     identifier = f"{client_ip}:{game_id}"
     if not _rate_limiter.check(identifier):
         return _rate_limit_response(identifier, f"submissions to {game_id}")
 
-    entry = submit_score(game_id, score, handle=handle, shared=share)
-
-    response: Dict[str, object] = {"submitted": entry}
+    if limit is None:
+        response: Dict[str, object] = {"submitted": submit_score(game_id, score, handle=handle, shared=share)}
+    else:
+        response = submit_score_and_rank(game_id, score, handle=handle, shared=share, limit=limit)
+    entry = response["submitted"]
     if entry.get("shared"):
         response["share"] = {"prompt": "Would you like to share your score?"}
 
     return _json_response(HTTPStatus.CREATED, response)
 
 
+def _handle_profile(environ: Dict[str, object], method: str) -> Tuple[str, list[Tuple[str, str]], bytes]:
+    """Admin-only profiler control, enabled by setting ``PROFILING_ADMIN_TOKEN``.
+
+    ``GET`` returns the aggregated stats; ``POST`` accepts ``{"action":
+    "enable", "every": N, "seconds": S}``, ``{"action": "disable"}``,
+    ``{"action": "dump"}`` or ``{"action": "reset"}``.
+    """
+    expected = os.getenv("PROFILING_ADMIN_TOKEN")
+    if not expected:
+        return _json_response(HTTPStatus.NOT_FOUND, {"error": "Not Found"})
+    token = str(environ.get("HTTP_X_ADMIN_TOKEN", ""))
+    if not hmac.compare_digest(token.encode("utf-8"), expected.encode("utf-8")):
+        return _json_response(HTTPStatus.FORBIDDEN, {"error": "Forbidden"})
+
+    if method == "GET":
+        query = parse_qs(environ.get("QUERY_STRING", ""), keep_blank_values=False)
+        try:
+            summary = PROFILER.summary(
+                sort=query.get("sort", ["cumulative"])[0],
+                limit=int(query.get("limit", ["30"])[0]),
+            )
+        except (KeyError, ValueError) as exc:
+            return _json_response(HTTPStatus.BAD_REQUEST, {"error": str(exc)})
+        return _json_response(HTTPStatus.OK, summary)
+    if method != "POST":
+        return _json_response(HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Method not allowed"})
+
+    try:
+        payload = json.loads(_read_body(environ) or b"{}")
+    except json.JSONDecodeError:
+        return _json_response(HTTPStatus.BAD_REQUEST, {"error": "Request body must be valid JSON"})
+    if not isinstance(payload, dict):
+        return _json_response(HTTPStatus.BAD_REQUEST, {"error": "Request body must be a JSON object"})
+    action = payload.get("action")
+    try:
+        if action == "enable":
+            PROFILER.enable(every=payload.get("every"), seconds=payload.get("seconds"))
+        elif action == "disable":
+            PROFILER.disable()
+        elif action == "dump":
+            try:
+                path = PROFILER.dump()
+            except OSError as exc:
+                return _json_response(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"Could not write profile: {exc}"})
+            return _json_response(HTTPStatus.OK, {"path": str(path) if path else None})
+        elif action == "reset":
+            PROFILER.reset()
+        else:
+            raise ValueError("action must be one of enable, disable, dump, reset")
+    except (TypeError, ValueError) as exc:
+        return _json_response(HTTPStatus.BAD_REQUEST, {"error": str(exc)})
+    return _json_response(HTTPStatus.OK, PROFILER.summary(limit=0))
+
+
 __all__ = ["application", "reset_rate_limiter"]
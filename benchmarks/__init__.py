@@ -0,0 +1,5 @@
+"""Standalone benchmarks for the Python backend helpers.
+
+Each module is runnable with ``python -m benchmarks.<name>`` and prints a
+JSON report to stdout.
+"""
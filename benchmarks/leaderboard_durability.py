@@ -0,0 +1,72 @@
+"""Measure leaderboard submit throughput under each durability mode.
+
+Scratch files are written to a temporary directory inside ``--directory``,
+which defaults to the configured storage location, so fsync costs reflect
+the disk the leaderboard actually uses rather than a tmpfs ``/tmp``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from server import leaderboard
+
+
+def _run(mode: str, writes: int, interval: float, parent: Path) -> Dict[str, object]:
+    with tempfile.TemporaryDirectory(prefix=".durability-benchmark-", dir=parent) as directory:
+        leaderboard.configure_storage(Path(directory) / "leaderboard.json")
+        leaderboard.configure_durability(mode, interval=interval)
+        latencies: List[float] = []
+        started = time.perf_counter()
+        for index in range(writes):
+            before = time.perf_counter()
+            leaderboard.submit_score(f"game-{index % 8}", index, handle=f"player-{index}")
+            latencies.append(time.perf_counter() - before)
+        elapsed = time.perf_counter() - started
+        leaderboard.configure_durability(None)
+    latencies.sort()
+    return {
+        "mode": mode,
+        "writes": writes,
+        "seconds": round(elapsed, 4),
+        "writesPerSecond": round(writes / elapsed, 1) if elapsed else None,
+        "p50Millis": round(latencies[len(latencies) // 2] * 1000, 3) if latencies else None,
+        "p99Millis": round(latencies[int(len(latencies) * 0.99)] * 1000, 3) if latencies else None,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--writes", type=int, default=500, help="number of submissions per mode")
+    parser.add_argument("--interval", type=float, default=1.0, help="fsync interval for the interval mode")
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        default=list(leaderboard.DURABILITY_MODES),
+        choices=leaderboard.DURABILITY_MODES,
+        help="durability modes to compare",
+    )
+    original = leaderboard._STORAGE_PATH
+    parser.add_argument(
+        "--directory",
+        type=Path,
+        default=original.parent,
+        help="directory on the disk to measure (default: the leaderboard storage directory)",
+    )
+    args = parser.parse_args(argv)
+    args.directory.mkdir(parents=True, exist_ok=True)
+    try:
+        report = [_run(mode, args.writes, args.interval, args.directory) for mode in args.modes]
+    finally:
+        leaderboard.configure_storage(original)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,69 @@
+"""Compare the memory footprint of list-backed and compact event storage."""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+from analytics import MetricsExporter
+
+_TUTORIALS = {
+    "getting_started": ["welcome", "movement", "jump"],
+    "combat_basics": ["equip", "target", "dodge"],
+}
+
+
+def _record_events(exporter: MetricsExporter, count: int) -> None:
+    # Tutorial, event and step advance on independent strides so every event
+    # name is recorded for every tutorial and step.
+    tutorials = list(_TUTORIALS.items())
+    for index in range(count):
+        tutorial, steps = tutorials[index % len(tutorials)]
+        kind = (index // len(tutorials)) % 4
+        step = steps[(index // (len(tutorials) * 4)) % len(steps)]
+        if kind == 0:
+            exporter.record("tutorial_step_engaged", {"tutorial": tutorial, "step": step})
+        elif kind == 1:
+            exporter.record("tutorial_step_completed", {"tutorial": tutorial, "step": step})
+        elif kind == 2:
+            exporter.record("tutorial_hints_toggled", {"tutorial": tutorial, "enabled": index % 16 < 8})
+        else:
+            exporter.record("tutorial_started", {"tutorial": tutorial})
+
+
+def measure(compact: bool, count: int) -> Dict[str, object]:
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    exporter = MetricsExporter(compact=compact)
+    _record_events(exporter, count)
+    elapsed = time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    counts = exporter.export_counts()
+    return {
+        "mode": "compact" if compact else "list",
+        "events": count,
+        "retainedBytes": current,
+        "peakBytes": peak,
+        "bytesPerEvent": round(current / count, 2) if count else 0,
+        "recordSeconds": round(elapsed, 3),
+        "distinctCounters": len(counts),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=1_000_000, help="number of events to record")
+    args = parser.parse_args(argv)
+    report = [measure(compact, args.events) for compact in (False, True)]
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,49 @@
+"""Measure TutorialEngine.load throughput with and without the script cache."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Dict, List, Optional
+
+from analytics import MetricsExporter, TutorialAnalytics
+from tutorial.engine import FileSystemScriptLoader, ScriptCache, TutorialEngine, preload_scripts
+
+_SCRIPTS = ("getting_started", "combat_basics")
+
+
+def _run(loads: int, *, shared: bool) -> Dict[str, object]:
+    loader = FileSystemScriptLoader()
+    analytics = TutorialAnalytics(MetricsExporter(compact=True))
+    cache = ScriptCache()
+    if shared:
+        preload_scripts(loader, cache)
+    started = time.perf_counter()
+    for index in range(loads):
+        engine = TutorialEngine(
+            loader,
+            analytics=analytics,
+            script_cache=cache if shared else ScriptCache(),
+        )
+        engine.load(_SCRIPTS[index % len(_SCRIPTS)])
+    elapsed = time.perf_counter() - started
+    return {
+        "mode": "shared-cache" if shared else "uncached",
+        "loads": loads,
+        "seconds": round(elapsed, 4),
+        "loadsPerSecond": round(loads / elapsed, 1) if elapsed else None,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--loads", type=int, default=20_000, help="number of engine loads per mode")
+    args = parser.parse_args(argv)
+    report = [_run(args.loads, shared=shared) for shared in (False, True)]
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,144 @@
+"""Replay synthetic player streams through the tutorial engine, scene and analytics."""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import random
+import time
+import tracemalloc
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from analytics import MetricsExporter, TutorialAnalytics
+from scenes.tutorial_scene import TutorialScene
+from tutorial.engine import SCRIPT_CACHE, FileSystemScriptLoader, TutorialEngine, TutorialScript
+
+_SCRIPTS = ("getting_started", "combat_basics")
+_NOISE_EVENTS = (
+    "ui:menu_opened",
+    "ui:menu_closed",
+    "input:look",
+    "input:idle",
+    "movement:step",
+    "combat:shot_fired",
+    "inventory:opened",
+)
+
+Stream = List[Tuple[str, Dict[str, object]]]
+
+
+def _flag_pool(script: TutorialScript) -> List[str]:
+    flags = {flag for step in script.step_list for branch in step.hints.branches for flag in branch.when}
+    return sorted(flags)
+
+
+def generate_stream(script: TutorialScript, rng: random.Random, noise: float) -> Stream:
+    """Build one player's ``(event, context)`` stream that completes ``script``.
+
+    Before each completion event the player emits on average ``noise``
+    unrelated events, including completion events of other steps. Contexts
+    carry random subsets of the flags the script's hint branches test.
+    """
+
+    flags = _flag_pool(script)
+    foreign = [event for step in script.step_list for event in step.complete_events]
+    stream: Stream = []
+    for step in script.step_list:
+        for _ in range(int(rng.expovariate(1 / noise)) if noise > 0 else 0):
+            event = rng.choice(foreign) if rng.random() < 0.2 else rng.choice(_NOISE_EVENTS)
+            stream.append((event, {"flags": rng.sample(flags, rng.randint(0, min(2, len(flags))))}))
+        stream.append((rng.choice(step.complete_events), {"flags": []}))
+    return stream
+
+
+def _percentile(sorted_values: Sequence[int], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index] / 1000
+
+
+def _replay(streams: List[Tuple[str, Stream]], latencies: Optional[List[int]]) -> Tuple[float, TutorialAnalytics]:
+    analytics = TutorialAnalytics(MetricsExporter(compact=True))
+    scenes = []
+    for script_id, _ in streams:
+        scene = TutorialScene(TutorialEngine(analytics=analytics))
+        scene.start(script_id)
+        scenes.append(scene)
+    cursors = [0] * len(streams)
+    active = list(range(len(streams)))
+    clock = time.perf_counter_ns
+    started = time.perf_counter()
+    # Round-robin across sessions so caches see interleaved traffic.
+    while active:
+        still_active = []
+        for index in active:
+            event, context = streams[index][1][cursors[index]]
+            if latencies is None:
+                scenes[index].on_player_event(event, context)
+            else:
+                before = clock()
+                scenes[index].on_player_event(event, context)
+                latencies.append(clock() - before)
+            cursors[index] += 1
+            if cursors[index] < len(streams[index][1]):
+                still_active.append(index)
+        active = still_active
+    return time.perf_counter() - started, analytics
+
+
+def run(sessions: int, *, noise: float = 3.0, seed: int = 0) -> Dict[str, object]:
+    """Replay ``sessions`` synthetic players and return the JSON report row."""
+
+    loader = FileSystemScriptLoader()
+    scripts = [SCRIPT_CACHE.get(loader, script_id) for script_id in _SCRIPTS]
+    rng = random.Random(seed)
+    streams = []
+    for index in range(sessions):
+        script = scripts[index % len(scripts)]
+        streams.append((script.id, generate_stream(script, rng, noise)))
+    events = sum(len(stream) for _, stream in streams)
+
+    gc.collect()
+    latencies: List[int] = []
+    elapsed, analytics = _replay(streams, latencies)
+    latencies.sort()
+
+    gc.collect()
+    tracemalloc.start()
+    _replay(streams, None)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    completed = sum(analytics.funnel.funnel(script.id)["completed"] for script in scripts)
+    return {
+        "sessions": sessions,
+        "events": events,
+        "noise": noise,
+        "seconds": round(elapsed, 4),
+        "eventsPerSecond": round(events / elapsed, 1) if elapsed else None,
+        "latencyMicros": {
+            "p50": _percentile(latencies, 0.5),
+            "p90": _percentile(latencies, 0.9),
+            "p99": _percentile(latencies, 0.99),
+            "max": _percentile(latencies, 1.0),
+        },
+        "peakBytes": peak,
+        "completedSessions": completed,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 100, 1000], help="session counts to replay")
+    parser.add_argument("--noise", type=float, default=3.0, help="mean noise events before each completion")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for stream generation")
+    args = parser.parse_args(argv)
+    report = [run(count, noise=args.noise, seed=args.seed) for count in args.sessions]
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -2,16 +2,20 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, List, Optional
+from dataclasses import asdict, dataclass, fields, replace
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple, Union
 
 from analytics import TutorialAnalytics
-from tutorial.engine import TutorialEngine, TutorialStep
+from tutorial.engine import TutorialEngine, TutorialStep, flags_key
 
 
 @dataclass
 class SceneState:
-    """Serializable snapshot consumed by the UI layer."""
+    """Serializable snapshot consumed by the UI layer.
+
+    States returned by :class:`TutorialScene` may be shared between calls
+    and should be treated as read-only.
+    """
 
     tutorial: Optional[str]
     step: Optional[str]
@@ -24,17 +28,71 @@ class SceneState:
 
 
 class TutorialScene:
-    """High-level façade that wires the tutorial engine to the UI."""
+    """High-level façade that wires the tutorial engine to the UI.
+
+    The last :class:`SceneState` is cached against the engine's ``version``
+    and the context flags, so events that change nothing return the cached
+    state without copying lists or recomputing hints. Hints are recomputed
+    when the step, the hint toggle or the flags change; call
+    :meth:`invalidate` to force a refresh (for example once an asynchronous
+    hint generator has new results).
+    """
 
     def __init__(self, engine: Optional[TutorialEngine] = None) -> None:
         self.engine = engine or TutorialEngine()
         self.analytics: TutorialAnalytics = self.engine.analytics
+        self._cached: Optional[SceneState] = None
+        self._cached_key: Optional[Tuple[int, Hashable]] = None
+        self._delivered: Optional[SceneState] = None
 
     def start(self, tutorial_id: str) -> SceneState:
         self.engine.load(tutorial_id)
         return self.state()
 
+    def invalidate(self) -> None:
+        """Drop the cached state so the next :meth:`state` rebuilds it."""
+
+        self._cached = None
+        self._cached_key = None
+
     def state(self, context: Optional[Dict[str, object]] = None) -> SceneState:
+        key = (self.engine.version, flags_key(context))
+        cached = self._cached
+        if cached is not None and self._cached_key is not None:
+            if key == self._cached_key:
+                return cached
+            if key[0] == self._cached_key[0]:
+                # Only the flags moved: keep the engine-derived fields.
+                state = replace(cached, hints=self.engine.get_hints(context))
+                return self._remember(key, state)
+        return self._remember(key, self._build_state(context))
+
+    def _remember(self, key: Tuple[int, Hashable], state: SceneState) -> SceneState:
+        self._cached = state
+        self._cached_key = key
+        return state
+
+    def delta(self, context: Optional[Dict[str, object]] = None) -> Dict[str, object]:
+        """Return only the :class:`SceneState` fields changed since the last delta.
+
+        The first call returns every field; an empty dict means the UI is
+        already up to date.
+        """
+
+        state = self.state(context)
+        previous, self._delivered = self._delivered, state
+        if previous is None:
+            return asdict(state)
+        if state is previous:
+            return {}
+        changed: Dict[str, object] = {}
+        for item in fields(SceneState):
+            value = getattr(state, item.name)
+            if value != getattr(previous, item.name):
+                changed[item.name] = value
+        return changed
+
+    def _build_state(self, context: Optional[Dict[str, object]]) -> SceneState:
         engine_state = self.engine.snapshot()
         step: Optional[TutorialStep] = self.engine.current_step
         hints = self.engine.get_hints(context)
@@ -42,7 +100,7 @@ class TutorialScene:
             tutorial=engine_state["tutorial"],
             step=engine_state["step"],
             text=step.text if step else None,
-            objectives=step.objectives if step else [],
+            objectives=list(step.objectives) if step else [],
             hints=hints,
             completed=engine_state["completed"],
             hints_enabled=engine_state["hintsEnabled"],
@@ -59,6 +117,16 @@ class TutorialScene:
         self.engine.record_event(event, context)
         return self.state(context)
 
+    def on_player_events(
+        self,
+        events: Iterable[Union[str, int]],
+        context: Optional[Dict[str, object]] = None,
+    ) -> SceneState:
+        """Apply a burst of events and build the resulting state once."""
+
+        self.engine.record_events(events, context)
+        return self.state(context)
+
     def toggle_hints(self) -> None:
         self.set_hints_enabled(not self.engine.hints_enabled)
 
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import mmap
 import os
+import struct
 import threading
 import time
+import uuid
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Iterator, List, Optional
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
 
 try:  # pragma: no cover - platform specific imports
     import fcntl  # type: ignore
@@ -19,6 +24,7 @@ except ImportError:  # pragma: no cover - non-Windows
     msvcrt = None  # type: ignore
 
 from config import get_settings
+from server import leaderboard_binary
 
 _DEFAULT_STORAGE_PATH = (
     Path(os.getenv("LEADERBOARD_STORAGE_PATH", ""))
@@ -29,6 +35,19 @@ _DEFAULT_STORAGE_PATH = (
 _LOCK = threading.RLock()
 _STORAGE_PATH = _DEFAULT_STORAGE_PATH
 
+Snapshot = Mapping[str, Tuple[Dict[str, object], ...]]
+_EMPTY_SNAPSHOT: Snapshot = MappingProxyType({})
+# Digest of the storage file's bytes and the table snapshot() built from
+# them. Only snapshot() fills it, so writers never hold a second copy.
+_SNAPSHOT: Optional[Tuple[bytes, Snapshot]] = None
+
+DURABILITY_MODES = ("none", "interval", "always")
+_DURABILITY_OVERRIDE: Optional[Tuple[str, float]] = None
+_CHANGE_LOG_OVERRIDE: Optional[Tuple[bool, int]] = None
+
+STORAGE_FORMATS = ("json", "binary")
+_FORMAT_OVERRIDE: Optional[str] = None
+
 
 def configure_storage(path: os.PathLike[str] | str) -> None:
     """Update the persistent storage location used for leaderboard data.
@@ -42,6 +61,170 @@ def configure_storage(path: os.PathLike[str] | str) -> None:
         _STORAGE_PATH.parent.mkdir(parents=True, exist_ok=True)
 
 
+def configure_durability(mode: Optional[str] = None, *, interval: Optional[float] = None) -> None:
+    """Override the ``leaderboard.durability`` setting; ``None`` restores it.
+
+    ``none`` relies on the OS to write data back eventually, ``interval``
+    fsyncs from a background thread every ``fsyncIntervalSeconds`` and
+    ``always`` fsyncs the data file and its directory on every write.
+    """
+    global _DURABILITY_OVERRIDE
+    with _LOCK:
+        if mode is None:
+            _DURABILITY_OVERRIDE = None
+        else:
+            _DURABILITY_OVERRIDE = _validate_durability(mode, interval if interval is not None else 1.0)
+        _FSYNC.stop()
+
+
+def configure_storage_format(storage_format: Optional[str] = None) -> None:
+    """Override the ``leaderboard.storageFormat`` setting; ``None`` restores it.
+
+    Reads detect the format of the existing file, so switching formats takes
+    effect on the next write without a migration step.
+    """
+    global _FORMAT_OVERRIDE
+    if storage_format is not None and storage_format not in STORAGE_FORMATS:
+        raise ValueError(f"leaderboard storage format must be one of {', '.join(STORAGE_FORMATS)}")
+    with _LOCK:
+        _FORMAT_OVERRIDE = storage_format
+
+
+def _storage_format() -> str:
+    if _FORMAT_OVERRIDE is not None:
+        return _FORMAT_OVERRIDE
+    storage_format = get_settings().get("leaderboard", {}).get("storageFormat", "json")
+    if storage_format not in STORAGE_FORMATS:
+        raise ValueError(f"leaderboard storage format must be one of {', '.join(STORAGE_FORMATS)}")
+    return storage_format
+
+
+def configure_change_log(enabled: Optional[bool] = None, *, max_bytes: Optional[int] = None) -> None:
+    """Override the ``leaderboard.changeLog`` setting; ``None`` restores it.
+
+    Every process writing to the same storage must agree on this setting,
+    otherwise followers miss their writes.
+    """
+    global _CHANGE_LOG_OVERRIDE
+    with _LOCK:
+        if enabled is None:
+            _CHANGE_LOG_OVERRIDE = None
+        else:
+            _CHANGE_LOG_OVERRIDE = (bool(enabled), int(max_bytes or 8 * 1024 * 1024))
+
+
+def _change_log_settings() -> Tuple[bool, int]:
+    if _CHANGE_LOG_OVERRIDE is not None:
+        return _CHANGE_LOG_OVERRIDE
+    settings = get_settings().get("leaderboard", {})
+    return bool(settings.get("changeLog", False)), int(settings.get("changeLogMaxBytes", 8 * 1024 * 1024))
+
+
+def change_log_path(storage_path: Optional[os.PathLike[str] | str] = None) -> Path:
+    """Return the change log that accompanies ``storage_path`` (default: current storage)."""
+    return Path(storage_path or _STORAGE_PATH).with_suffix(".changes.ndjson")
+
+
+_GENERATION_PREFIX = b'{"generation":"'
+_GENERATION_LENGTH = 32
+
+
+def change_log_generation(handle) -> Optional[bytes]:
+    """Return the generation id that opens the change log in ``handle``.
+
+    Every compaction starts the log with a ``reset`` record whose first
+    field is a fresh random id, so a follower can tell two logs apart even
+    when the filesystem reuses an inode. ``None`` means the log has no id.
+    """
+    handle.seek(0)
+    head = handle.read(len(_GENERATION_PREFIX) + _GENERATION_LENGTH + 1)
+    if not head.startswith(_GENERATION_PREFIX) or head[-1:] != b'"':
+        return None
+    return head[len(_GENERATION_PREFIX):-1]
+
+
+def _validate_durability(mode: object, interval: object) -> Tuple[str, float]:
+    if mode not in DURABILITY_MODES:
+        raise ValueError(f"leaderboard durability must be one of {', '.join(DURABILITY_MODES)}")
+    if not isinstance(interval, (int, float)) or interval <= 0:
+        raise ValueError("fsyncIntervalSeconds must be a positive number")
+    return str(mode), float(interval)
+
+
+def _durability() -> Tuple[str, float]:
+    if _DURABILITY_OVERRIDE is not None:
+        return _DURABILITY_OVERRIDE
+    settings = get_settings().get("leaderboard", {})
+    return _validate_durability(settings.get("durability", "none"), settings.get("fsyncIntervalSeconds", 1.0))
+
+
+def _fsync_path(path: Path) -> None:
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except FileNotFoundError:
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _fsync_directory(path: Path) -> None:
+    if os.name == "nt":  # pragma: no cover - directories cannot be fsynced on Windows
+        return
+    _fsync_path(path)
+
+
+class _IntervalFsync:
+    """Background thread that fsyncs the files written since its last tick."""
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._dirty: Set[Path] = set()
+        self._thread: Optional[threading.Thread] = None
+        self._interval = 1.0
+
+    def mark_dirty(self, interval: float, path: Path) -> None:
+        with self._condition:
+            self._dirty.add(path)
+            self._interval = interval
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="leaderboard-fsync", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait(self._interval)
+                if self._thread is not threading.current_thread():
+                    return
+                dirty, self._dirty = self._dirty, set()
+            _sync_paths(dirty)
+
+    def stop(self) -> None:
+        with self._condition:
+            dirty, self._dirty = self._dirty, set()
+            self._thread = None
+            self._condition.notify_all()
+        _sync_paths(dirty)
+
+
+_FSYNC = _IntervalFsync()
+
+
+def _sync_paths(paths: Iterable[Path]) -> None:
+    paths = list(paths)
+    for path in paths:
+        _fsync_path(path)
+    for directory in {path.parent for path in paths}:
+        _fsync_directory(directory)
+
+
+def sync_storage() -> None:
+    """Flush the storage file, its change log and their directory to stable storage."""
+    _sync_paths([_STORAGE_PATH, change_log_path()])
+
+
 def _lock_path() -> Path:
     return _STORAGE_PATH.with_suffix(".lock")
 
@@ -81,19 +264,27 @@ def _release_lock(handle) -> None:
     raise RuntimeError("No file locking mechanism available on this platform")
 
 
-def _load_unlocked() -> Dict[str, List[Dict[str, object]]]:
-    if not _STORAGE_PATH.exists():
-        return {}
-    with _STORAGE_PATH.open("r", encoding="utf-8") as handle:
+def _decode_storage(raw: bytes) -> Dict[str, List[Dict[str, object]]]:
+    if leaderboard_binary.is_binary(raw):
         try:
-            data = json.load(handle)
-        except json.JSONDecodeError:
+            return leaderboard_binary.decode(raw)
+        except (ValueError, struct.error):
             return {}
+    try:
+        data = json.loads(raw)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return {}
     if isinstance(data, dict):
         return data
     return {}
 
 
+def _load_unlocked() -> Dict[str, List[Dict[str, object]]]:
+    if not _STORAGE_PATH.exists():
+        return {}
+    return _decode_storage(_STORAGE_PATH.read_bytes())
+
+
 def _load() -> Dict[str, List[Dict[str, object]]]:
     with _storage_file_lock():
         return _load_unlocked()
@@ -105,11 +296,149 @@ def _persist(data: Dict[str, List[Dict[str, object]]]) -> None:
 
 
 def _persist_unlocked(data: Dict[str, List[Dict[str, object]]]) -> None:
+    mode, interval = _durability()
     _STORAGE_PATH.parent.mkdir(parents=True, exist_ok=True)
     tmp_path = _STORAGE_PATH.with_suffix(".tmp")
-    with tmp_path.open("w", encoding="utf-8") as handle:
-        json.dump(data, handle, ensure_ascii=False, indent=2)
+    if _storage_format() == "binary":
+        raw = leaderboard_binary.encode(data)
+    else:
+        raw = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+    with tmp_path.open("wb") as handle:
+        handle.write(raw)
+        if mode == "always":
+            handle.flush()
+            os.fsync(handle.fileno())
     tmp_path.replace(_STORAGE_PATH)
+    if mode == "always":
+        _fsync_directory(_STORAGE_PATH.parent)
+    elif mode == "interval":
+        _FSYNC.mark_dirty(interval, _STORAGE_PATH)
+
+
+def _encode_change(record: Dict[str, object]) -> bytes:
+    return (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _log_change_unlocked(record: Dict[str, object], data: Dict[str, List[Dict[str, object]]]) -> None:
+    """Append ``record`` to the change log, compacting it when it grows too large.
+
+    The log always starts with a ``reset`` record holding the full table, so
+    followers never need the storage file. Compaction writes a fresh log
+    whose ``reset`` record already includes ``record`` and carries a new
+    generation id (see :func:`change_log_generation`).
+    """
+    enabled, max_bytes = _change_log_settings()
+    if not enabled:
+        return
+    path = change_log_path()
+    record["at"] = time.time()
+    try:
+        size = path.stat().st_size
+    except FileNotFoundError:
+        size = 0
+    mode, interval = _durability()
+    if size == 0 or size >= max_bytes or record["op"] == "reset":
+        tmp_path = path.with_suffix(".tmp")
+        with tmp_path.open("wb") as handle:
+            reset = {"generation": uuid.uuid4().hex, "op": "reset", "data": data, "at": record["at"]}
+            handle.write(_encode_change(reset))
+            if mode == "always":
+                handle.flush()
+                os.fsync(handle.fileno())
+        tmp_path.replace(path)
+        if mode == "always":
+            _fsync_directory(path.parent)
+    else:
+        with path.open("ab") as handle:
+            handle.write(_encode_change(record))
+            if mode == "always":
+                handle.flush()
+                os.fsync(handle.fileno())
+    if mode == "interval":
+        _FSYNC.mark_dirty(interval, path)
+
+
+def _digest(raw) -> bytes:
+    return hashlib.blake2b(raw, digest_size=16).digest()
+
+
+def _map_storage():
+    """Return the storage file's contents as an ``mmap``, or ``bytes`` where mapping does not fit."""
+    with _STORAGE_PATH.open("rb") as handle:
+        # Windows cannot replace a file that is still mapped.
+        if os.name != "nt":
+            try:
+                return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file
+                return b""
+        return handle.read()
+
+
+def _freeze(data: Dict[str, List[Dict[str, object]]]) -> Snapshot:
+    return MappingProxyType(
+        {
+            game_id: tuple(
+                dict(entry) for entry in sorted(entries, key=lambda item: item.get("score", 0), reverse=True)
+            )
+            for game_id, entries in data.items()
+            if isinstance(entries, list)
+        }
+    )
+
+
+def snapshot() -> Snapshot:
+    """Return a point-in-time, read-only view of every game's scores.
+
+    Writers replace the storage file atomically, so reading the file through
+    one open handle is consistent without taking the storage lock, and
+    ``submit_score`` is never blocked. The view is built on the first call
+    after the file's contents change and reused while they hash the same.
+
+    For the binary format the view maps the file and decodes one game per
+    lookup, so the table is never held in memory as Python objects; each
+    lookup returns fresh entries. For JSON the decoded entries are shared
+    by every caller of the same snapshot and must not be mutated.
+    """
+    global _SNAPSHOT
+    try:
+        buffer = _map_storage()
+    except FileNotFoundError:
+        return _EMPTY_SNAPSHOT
+    digest = _digest(buffer)
+    cached = _SNAPSHOT
+    if cached is not None and cached[0] == digest:
+        _release(buffer)
+        return cached[1]
+    table: Snapshot = _EMPTY_SNAPSHOT
+    if leaderboard_binary.is_binary(buffer):
+        try:
+            # The view keeps the mapping open for as long as it is referenced.
+            table = leaderboard_binary.SnapshotView(buffer)
+        except (ValueError, struct.error, UnicodeDecodeError):
+            _release(buffer)
+    else:
+        table = _freeze(_decode_storage(bytes(buffer)))
+        _release(buffer)
+    _SNAPSHOT = (digest, table)
+    return table
+
+
+def _release(buffer) -> None:
+    if isinstance(buffer, mmap.mmap):
+        buffer.close()
+
+
+def export_stream(games: Optional[Iterable[str]] = None) -> Iterator[str]:
+    """Yield one NDJSON line per score from a single :func:`snapshot`.
+
+    Each line is ``{"game": ..., <entry fields>}``, highest score first per
+    game. Pass ``games`` to export a subset.
+    """
+    table = snapshot()
+    selected = table.keys() if games is None else [game_id for game_id in games if game_id in table]
+    for game_id in selected:
+        for entry in table[game_id]:
+            yield json.dumps({"game": game_id, **entry}, ensure_ascii=False, separators=(",", ":")) + "\n"
 
 
 def get_top_scores(game_id: str, limit: int = 10) -> List[Dict[str, object]]:
@@ -119,6 +448,12 @@ def get_top_scores(game_id: str, limit: int = 10) -> List[Dict[str, object]]:
     if not isinstance(limit, int) or limit <= 0:
         raise ValueError("limit must be a positive integer")
 
+    if _storage_format() == "binary":
+        # The file is replaced atomically, so the mapping needs no lock.
+        entries = leaderboard_binary.read_top_scores(_STORAGE_PATH, game_id, limit)
+        if entries is not None:
+            return entries
+
     with _LOCK:
         data = _load()
         entries = data.get(game_id, [])
@@ -127,15 +462,13 @@ def get_top_scores(game_id: str, limit: int = 10) -> List[Dict[str, object]]:
     return entries[:limit]
 
 
-def submit_score(
+def _build_entry(
     game_id: str,
     score: int | float,
-    *,
-    handle: Optional[str] = None,
-    shared: bool | None = None,
-    metadata: Optional[Dict[str, object]] = None,
+    handle: Optional[str],
+    shared: bool | None,
+    metadata: Optional[Dict[str, object]],
 ) -> Dict[str, object]:
-    """Persist a score entry and return the stored representation."""
     if not isinstance(game_id, str) or not game_id.strip():
         raise ValueError("game_id must be a non-empty string")
     if not isinstance(score, (int, float)):
@@ -144,7 +477,6 @@ def submit_score(
     settings = get_settings().get("leaderboard", {})
     allow_handles = settings.get("collectUserHandle", True)
     allow_sharing = settings.get("enableSharing", True)
-    max_entries = settings.get("maxEntries", 10)
 
     entry: Dict[str, object] = {
         "score": int(score),
@@ -163,20 +495,92 @@ def submit_score(
         entry["shared"] = bool(shared)
     else:
         entry["shared"] = False
+    return entry
+
+
+def _max_entries() -> int:
+    max_entries = get_settings().get("leaderboard", {}).get("maxEntries", 10)
+    if max_entries and isinstance(max_entries, int) and max_entries > 0:
+        return max_entries
+    return 0
+
+
+def apply_submission(
+    data: Dict[str, List[Dict[str, object]]],
+    game_id: str,
+    entry: Dict[str, object],
+    keep: int,
+) -> List[Dict[str, object]]:
+    """Insert ``entry`` into ``data`` keeping the best ``keep`` scores (0 keeps all).
+
+    Shared with change-log followers so replicas order ties identically.
+    """
+    entries = data.setdefault(game_id, [])
+    entries.append(entry)
+    entries.sort(key=lambda item: item.get("score", 0), reverse=True)
+    data[game_id] = entries[:keep] if keep else entries
+    return data[game_id]
+
+
+def _commit_submission_unlocked(
+    data: Dict[str, List[Dict[str, object]]],
+    game_id: str,
+    entry: Dict[str, object],
+) -> List[Dict[str, object]]:
+    keep = _max_entries()
+    entries = apply_submission(data, game_id, entry, keep)
+    _persist_unlocked(data)
+    _log_change_unlocked({"op": "submit", "game": game_id, "entry": entry, "keep": keep}, data)
+    return entries
+
+
+def submit_score(
+    game_id: str,
+    score: int | float,
+    *,
+    handle: Optional[str] = None,
+    shared: bool | None = None,
+    metadata: Optional[Dict[str, object]] = None,
+) -> Dict[str, object]:
+    """Persist a score entry and return the stored representation."""
+    entry = _build_entry(game_id, score, handle, shared, metadata)
 
     with _LOCK:
         with _storage_file_lock():
             data = _load_unlocked()
-            entries = data.setdefault(game_id, [])
-            entries.append(entry)
-            entries.sort(key=lambda item: item.get("score", 0), reverse=True)
-            if max_entries and isinstance(max_entries, int) and max_entries > 0:
-                data[game_id] = entries[:max_entries]
-            else:
-                data[game_id] = entries
-            _persist_unlocked(data)
+            _commit_submission_unlocked(data, game_id, entry)
 
-    return entry
+    # The stored dict backs the lazily built snapshot; callers get their own.
+    return dict(entry)
+
+
+def submit_score_and_rank(
+    game_id: str,
+    score: int | float,
+    *,
+    handle: Optional[str] = None,
+    shared: bool | None = None,
+    metadata: Optional[Dict[str, object]] = None,
+    limit: int = 10,
+) -> Dict[str, object]:
+    """Persist a score and return it with the updated top scores and its rank.
+
+    The top ``limit`` scores and the 1-based ``rank`` are taken from the same
+    locked read-modify-write as the submission, so callers do not need a
+    follow-up :func:`get_top_scores`. ``rank`` is ``None`` when the score did
+    not make the stored ``maxEntries`` cut.
+    """
+    if not isinstance(limit, int) or limit <= 0:
+        raise ValueError("limit must be a positive integer")
+    entry = _build_entry(game_id, score, handle, shared, metadata)
+
+    with _LOCK:
+        with _storage_file_lock():
+            data = _load_unlocked()
+            entries = _commit_submission_unlocked(data, game_id, entry)
+
+    rank = next((index for index, item in enumerate(entries, start=1) if item is entry), None)
+    return {"submitted": dict(entry), "scores": [dict(item) for item in entries[:limit]], "rank": rank}
 
 
 def clear_scores(game_id: Optional[str] = None) -> None:
@@ -186,6 +590,12 @@ def clear_scores(game_id: Optional[str] = None) -> None:
             with _storage_file_lock():
                 if _STORAGE_PATH.exists():
                     _STORAGE_PATH.unlink(missing_ok=True)
+                    mode, interval = _durability()
+                    if mode == "always":
+                        _fsync_directory(_STORAGE_PATH.parent)
+                    elif mode == "interval":
+                        _FSYNC.mark_dirty(interval, _STORAGE_PATH)
+                _log_change_unlocked({"op": "reset"}, {})
             return
 
         with _storage_file_lock():
@@ -193,11 +603,24 @@ def clear_scores(game_id: Optional[str] = None) -> None:
             if game_id in data:
                 del data[game_id]
                 _persist_unlocked(data)
+                _log_change_unlocked({"op": "clear", "game": game_id}, data)
 
 
 __all__ = [
+    "DURABILITY_MODES",
+    "STORAGE_FORMATS",
+    "apply_submission",
+    "change_log_generation",
+    "change_log_path",
+    "configure_change_log",
+    "configure_durability",
     "configure_storage",
+    "configure_storage_format",
+    "export_stream",
+    "snapshot",
+    "sync_storage",
     "get_top_scores",
     "submit_score",
+    "submit_score_and_rank",
     "clear_scores",
 ]
@@ -0,0 +1,265 @@
+"""Fixed-width binary leaderboard format designed for ``mmap`` readers.
+
+Layout (little-endian)::
+
+    header   magic "GGLB", version, record size, game count, strings offset
+    index    one slot per game, sorted by UTF-8 game id:
+             name offset/length, first record, record count
+    records  fixed-size rows, grouped per game, highest score first
+    strings  UTF-8 side table for game ids, handles and extra JSON fields
+
+Known fields with the expected type (an int ``score``, a float
+``submittedAt``, a string ``handle``, a bool ``shared``) use the fixed
+columns; anything else, including those fields with other types, goes
+through the extra JSON block so entries round-trip exactly.
+
+Reading one game's top ``limit`` scores is a binary search over the index
+plus ``limit`` fixed-size unpacks, independent of how many games or how much
+metadata the file holds.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+
+MAGIC = b"GGLB"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHHIQ")
+_INDEX = struct.Struct("<IIII")
+# score, submittedAt, handle offset/length, extra offset/length, flags
+_RECORD = struct.Struct("<qdIIIIB3x")
+
+_SHARED = 0x01
+_HAS_SHARED = 0x02
+_HAS_HANDLE = 0x04
+_HAS_SUBMITTED_AT = 0x08
+# Set when ``score`` is missing or not an int64; the extra JSON then holds it.
+_SCORE_IN_EXTRA = 0x10
+_INT64 = (-(1 << 63), (1 << 63) - 1)
+_KNOWN_FIELDS = frozenset({"score", "submittedAt", "handle", "shared"})
+
+
+class _Strings:
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+        self._offsets: Dict[bytes, int] = {}
+        self.size = 0
+
+    def add(self, value: str) -> Tuple[int, int]:
+        encoded = value.encode("utf-8")
+        offset = self._offsets.get(encoded)
+        if offset is None:
+            offset = self._offsets[encoded] = self.size
+            self._chunks.append(encoded)
+            self.size += len(encoded)
+        return offset, len(encoded)
+
+    def getvalue(self) -> bytes:
+        return b"".join(self._chunks)
+
+
+def is_binary(raw: bytes) -> bool:
+    return raw[:4] == MAGIC
+
+
+def encode(data: Dict[str, List[Dict[str, object]]]) -> bytes:
+    """Serialize ``{game_id: [entry, ...]}`` into the binary format."""
+
+    strings = _Strings()
+    games = sorted((game_id for game_id, entries in data.items() if isinstance(entries, list)), key=lambda g: g.encode("utf-8"))
+    index = bytearray()
+    records = bytearray()
+    first = 0
+    for game_id in games:
+        entries = sorted(data[game_id], key=lambda item: item.get("score", 0), reverse=True)
+        name_offset, name_length = strings.add(game_id)
+        index += _INDEX.pack(name_offset, name_length, first, len(entries))
+        for entry in entries:
+            flags = 0
+            handle_offset = handle_length = extra_offset = extra_length = 0
+            extra = {key: value for key, value in entry.items() if key not in _KNOWN_FIELDS}
+            score = entry.get("score")
+            if type(score) is int and _INT64[0] <= score <= _INT64[1]:
+                fixed_score = score
+            else:
+                flags |= _SCORE_IN_EXTRA
+                if "score" in entry:
+                    extra["score"] = score
+                # The fixed column still orders records; the extra value wins on read.
+                fixed_score = _clamp(score)
+            handle = entry.get("handle")
+            if isinstance(handle, str):
+                flags |= _HAS_HANDLE
+                handle_offset, handle_length = strings.add(handle)
+            elif "handle" in entry:
+                extra["handle"] = handle
+            shared = entry.get("shared")
+            if isinstance(shared, bool):
+                flags |= _HAS_SHARED | (_SHARED if shared else 0)
+            elif "shared" in entry:
+                extra["shared"] = shared
+            submitted_at = entry.get("submittedAt")
+            if type(submitted_at) is float:
+                flags |= _HAS_SUBMITTED_AT
+            elif "submittedAt" in entry:
+                extra["submittedAt"] = submitted_at
+            if extra:
+                extra_offset, extra_length = strings.add(json.dumps(extra, ensure_ascii=False, separators=(",", ":")))
+            records += _RECORD.pack(
+                fixed_score,
+                submitted_at if flags & _HAS_SUBMITTED_AT else 0.0,
+                handle_offset,
+                handle_length,
+                extra_offset,
+                extra_length,
+                flags,
+            )
+        first += len(entries)
+    strings_offset = _HEADER.size + len(index) + len(records)
+    header = _HEADER.pack(MAGIC, VERSION, _RECORD.size, len(games), strings_offset)
+    return header + bytes(index) + bytes(records) + strings.getvalue()
+
+
+def _clamp(score: object) -> int:
+    if isinstance(score, (int, float)) and score == score:
+        return int(min(max(score, _INT64[0]), _INT64[1]))
+    return 0
+
+
+class _View:
+    """Zero-copy accessors over an encoded buffer (``bytes`` or ``mmap``)."""
+
+    def __init__(self, buffer) -> None:
+        magic, version, record_size, game_count, strings_offset = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != VERSION or record_size != _RECORD.size:
+            raise ValueError("Unsupported leaderboard binary format")
+        self._buffer = buffer
+        self._game_count = game_count
+        self._strings = strings_offset
+        self._records = _HEADER.size + game_count * _INDEX.size
+        if not self._records <= strings_offset <= len(buffer):
+            raise ValueError("Truncated leaderboard binary file")
+
+    def _string(self, offset: int, length: int) -> bytes:
+        start = self._strings + offset
+        if start + length > len(self._buffer):
+            raise ValueError("Truncated leaderboard binary file")
+        return self._buffer[start:start + length]
+
+    def _slot(self, position: int) -> Tuple[bytes, int, int]:
+        name_offset, name_length, first, count = _INDEX.unpack_from(self._buffer, _HEADER.size + position * _INDEX.size)
+        return self._string(name_offset, name_length), first, count
+
+    def find(self, game_id: str) -> Optional[Tuple[int, int]]:
+        target = game_id.encode("utf-8")
+        low, high = 0, self._game_count
+        while low < high:
+            middle = (low + high) // 2
+            name, first, count = self._slot(middle)
+            if name == target:
+                return first, count
+            if name < target:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def entries(self, first: int, count: int) -> List[Dict[str, object]]:
+        result = []
+        offset = self._records + first * _RECORD.size
+        for _ in range(count):
+            score, submitted_at, handle_offset, handle_length, extra_offset, extra_length, flags = _RECORD.unpack_from(
+                self._buffer, offset
+            )
+            offset += _RECORD.size
+            entry: Dict[str, object] = {} if flags & _SCORE_IN_EXTRA else {"score": score}
+            if flags & _HAS_SUBMITTED_AT:
+                entry["submittedAt"] = submitted_at
+            if extra_length:
+                entry.update(json.loads(self._string(extra_offset, extra_length)))
+            if flags & _HAS_HANDLE:
+                entry["handle"] = self._string(handle_offset, handle_length).decode("utf-8")
+            if flags & _HAS_SHARED:
+                entry["shared"] = bool(flags & _SHARED)
+            result.append(entry)
+        return result
+
+    def to_dict(self) -> Dict[str, List[Dict[str, object]]]:
+        data = {}
+        for position in range(self._game_count):
+            name, first, count = self._slot(position)
+            data[name.decode("utf-8")] = self.entries(first, count)
+        return data
+
+
+class SnapshotView(Mapping[str, Tuple[Dict[str, object], ...]]):
+    """Read-only ``{game_id: entries}`` mapping that decodes one game per lookup.
+
+    ``buffer`` is an encoded document (``bytes`` or an ``mmap``); nothing
+    beyond the index is decoded until a game is read, and each lookup
+    returns fresh entries, highest score first. The index is checked up
+    front, so a truncated file raises ``ValueError`` here rather than
+    midway through an export.
+    """
+
+    def __init__(self, buffer) -> None:
+        view = _View(buffer)
+        records = (view._strings - view._records) // _RECORD.size
+        names = []
+        for position in range(view._game_count):
+            name, first, count = view._slot(position)
+            if first + count > records:
+                raise ValueError("Truncated leaderboard binary file")
+            names.append(name.decode("utf-8"))
+        self._view = view
+        self._names = names
+
+    def __getitem__(self, game_id: str) -> Tuple[Dict[str, object], ...]:
+        found = self._view.find(game_id) if isinstance(game_id, str) else None
+        if found is None:
+            raise KeyError(game_id)
+        return tuple(self._view.entries(*found))
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+
+def decode(raw: bytes) -> Dict[str, List[Dict[str, object]]]:
+    """Decode a whole binary document back into ``{game_id: [entry, ...]}``."""
+
+    return _View(raw).to_dict()
+
+
+def read_top_scores(path: os.PathLike[str] | str, game_id: str, limit: int) -> Optional[List[Dict[str, object]]]:
+    """Return the best ``limit`` entries for ``game_id`` by mapping ``path``.
+
+    Returns ``None`` when ``path`` is not in the binary format or is
+    truncated or corrupt, so callers can fall back to the full decode, and
+    ``[]`` when the file does not exist.
+    """
+
+    try:
+        handle = open(path, "rb")
+    except FileNotFoundError:
+        return []
+    with handle:
+        if handle.read(len(MAGIC)) != MAGIC:
+            return None
+        try:
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = _View(mapped)
+                found = view.find(game_id)
+                return view.entries(found[0], min(found[1], limit)) if found else []
+        except (ValueError, struct.error):
+            return None
+
+
+__all__ = ["MAGIC", "SnapshotView", "decode", "encode", "is_binary", "read_top_scores"]
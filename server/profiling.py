@@ -0,0 +1,214 @@
+"""Opt-in ``cProfile`` sampling for the API and tutorial hot paths.
+
+Profiling is off by default. It can be enabled at startup through
+environment variables or at runtime through the admin route in
+:mod:`api.routes`:
+
+- ``PROFILE_EVERY=N`` profiles one in every ``N`` calls;
+- ``PROFILE_WINDOW_SECONDS=S`` profiles every call for ``S`` seconds;
+- ``PROFILE_DIR`` is where :meth:`Profiler.dump` writes ``.pstats`` files.
+
+Invalid values are ignored with a ``RuntimeWarning``.
+
+When disabled, ``api.routes.application`` pays a single attribute check and
+the tutorial ``record_event`` methods a single ``None`` check on
+``tutorial.engine._RECORD_HOOK``.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import itertools
+import os
+import pstats
+import threading
+import time
+import warnings
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+_DEFAULT_DIR = Path(__file__).resolve().parent.parent / "data" / "profiles"
+
+# Every enabled profiler is listed here, and tutorial.engine._RECORD_HOOK is
+# installed while the tuple is non-empty.
+_HOOK_LOCK = threading.Lock()
+_HOOKED: Tuple["Profiler", ...] = ()
+# cProfile cannot nest, so one call is profiled at a time per process and its
+# stats are merged into every profiler that sampled it.
+_RUNNING = threading.Lock()
+
+
+class Profiler:
+    """Samples calls with ``cProfile`` and aggregates the results in memory.
+
+    At most one call is profiled at a time across all profilers; calls that
+    overlap it (nested ``record_event`` calls inside a profiled request, or
+    other threads) run unprofiled. A request that reaches ``record_event`` is
+    therefore captured once, engine time included, and ``cProfile`` never
+    competes with itself. A ``record_event`` call sampled by several enabled
+    profilers is profiled once and counted by each of them.
+    """
+
+    def __init__(
+        self,
+        *,
+        output_dir: os.PathLike[str] | str = _DEFAULT_DIR,
+        max_files: int = 10,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.active = False
+        self._output_dir = Path(output_dir)
+        self._max_files = max(int(max_files), 1)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._every = 1
+        self._deadline: Optional[float] = None
+        self._counter = itertools.count()
+        self._stats: Optional[pstats.Stats] = None
+        self._profiled = 0
+        self._sequence = itertools.count()
+
+    def enable(self, *, every: Optional[int] = None, seconds: Optional[float] = None) -> None:
+        """Profile one in ``every`` calls, or every call for ``seconds``."""
+
+        if every is not None and (isinstance(every, bool) or not isinstance(every, int) or every <= 0):
+            raise ValueError("every must be a positive integer")
+        if seconds is not None and seconds <= 0:
+            raise ValueError("seconds must be positive")
+        with self._lock:
+            self._every = every or 1
+            self._deadline = self._clock() + seconds if seconds is not None else None
+            self._counter = itertools.count()
+            _hook_tutorial(self)
+            self.active = True
+
+    def disable(self) -> None:
+        with self._lock:
+            self.active = False
+            _unhook_tutorial(self)
+
+    def _should_profile(self) -> bool:
+        if self._deadline is not None:
+            if self._clock() >= self._deadline:
+                self.disable()
+                return False
+            return True
+        return next(self._counter) % self._every == 0
+
+    def call(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """Run ``func``, profiling it if this call is sampled."""
+
+        return _run((self,), func, *args, **kwargs)
+
+    def _merge(self, profile: cProfile.Profile) -> None:
+        with self._lock:
+            if self._stats is None:
+                self._stats = pstats.Stats(profile)
+            else:
+                self._stats.add(profile)
+            self._profiled += 1
+
+    def summary(self, *, sort: str = "cumulative", limit: int = 30) -> Dict[str, object]:
+        """Return the aggregated statistics as a JSON-friendly dict.
+
+        ``stats`` holds the ``pstats`` report for the top ``limit`` functions;
+        pass ``limit=0`` for counters only.
+        """
+
+        with self._lock:
+            text = ""
+            if self._stats is not None and limit > 0:
+                buffer = io.StringIO()
+                self._stats.stream = buffer
+                self._stats.sort_stats(sort).print_stats(limit)
+                text = buffer.getvalue()
+            return {
+                "enabled": self.active,
+                "every": self._every,
+                "windowRemaining": max(self._deadline - self._clock(), 0.0) if self._deadline is not None else None,
+                "profiled": self._profiled,
+                "stats": text,
+            }
+
+    def dump(self, directory: Optional[os.PathLike[str] | str] = None) -> Optional[Path]:
+        """Write the aggregated stats as a ``.pstats`` file, keeping the newest ``max_files``."""
+
+        output_dir = Path(directory) if directory is not None else self._output_dir
+        with self._lock:
+            if self._stats is None:
+                return None
+            output_dir.mkdir(parents=True, exist_ok=True)
+            path = output_dir / f"profile-{time.strftime('%Y%m%d-%H%M%S')}-{next(self._sequence):04d}.pstats"
+            self._stats.dump_stats(str(path))
+        existing: List[Path] = sorted(output_dir.glob("profile-*.pstats"), key=lambda item: item.stat().st_mtime_ns)
+        for stale in existing[: max(len(existing) - self._max_files, 0)]:
+            stale.unlink(missing_ok=True)
+        return path
+
+    def reset(self) -> None:
+        """Discard aggregated statistics."""
+
+        with self._lock:
+            self._stats = None
+            self._profiled = 0
+
+
+def _run(profilers: Tuple[Profiler, ...], func: Callable[..., T], *args, **kwargs) -> T:
+    if _RUNNING.locked():
+        return func(*args, **kwargs)
+    sampled = [profiler for profiler in profilers if profiler.active and profiler._should_profile()]
+    if not sampled or not _RUNNING.acquire(blocking=False):
+        return func(*args, **kwargs)
+    profile = cProfile.Profile()
+    try:
+        return profile.runcall(func, *args, **kwargs)
+    finally:
+        _RUNNING.release()
+        for profiler in sampled:
+            profiler._merge(profile)
+
+
+def _record_hook(func: Callable[..., T], *args) -> T:
+    return _run(_HOOKED, func, *args)
+
+
+def _hook_tutorial(profiler: Profiler) -> None:
+    global _HOOKED
+    from tutorial import engine
+
+    with _HOOK_LOCK:
+        if profiler not in _HOOKED:
+            _HOOKED = _HOOKED + (profiler,)
+        engine._RECORD_HOOK = _record_hook
+
+
+def _unhook_tutorial(profiler: Profiler) -> None:
+    global _HOOKED
+    from tutorial import engine
+
+    with _HOOK_LOCK:
+        _HOOKED = tuple(hooked for hooked in _HOOKED if hooked is not profiler)
+        if not _HOOKED:
+            engine._RECORD_HOOK = None
+
+
+def _from_environment() -> Profiler:
+    profiler = Profiler(output_dir=os.getenv("PROFILE_DIR") or _DEFAULT_DIR)
+    every = os.getenv("PROFILE_EVERY")
+    window = os.getenv("PROFILE_WINDOW_SECONDS")
+    if every or window:
+        # A bad value must not stop api.routes from importing.
+        try:
+            profiler.enable(every=int(every) if every else None, seconds=float(window) if window else None)
+        except ValueError as exc:
+            warnings.warn(f"Profiling not enabled: {exc}", RuntimeWarning, stacklevel=2)
+    return profiler
+
+
+PROFILER = _from_environment()
+
+
+__all__ = ["PROFILER", "Profiler"]
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from analytics import MetricsExporter
+from server.leaderboard import apply_submission, change_log_generation, change_log_path
+
+
+class LeaderboardFollower:
+    """In-memory leaderboard replica fed by the leader's change log.
+
+    The writer appends one NDJSON record per ``submit_score`` /
+    ``clear_scores`` call when ``leaderboard.changeLog`` is enabled. A
+    follower tails that file from its last byte offset and serves
+    :meth:`get_top_scores` from memory, without touching the storage file or
+    its lock. Every poll compares the generation id at the head of the log
+    (as well as its inode and size), so a follower notices compaction even
+    after missing several of them on a filesystem that reuses inodes, and
+    rebuilds from the ``reset`` record at the start of the new log.
+    Only complete lines are applied, so a write in progress is picked up on
+    the next :meth:`poll`. Records that cannot be decoded or applied are
+    skipped and counted in :meth:`lag` as ``errors``.
+
+    With ``metrics``, every :meth:`poll` records a
+    ``leaderboard_replication_lag`` event whose payload is :meth:`lag`; give
+    the exporter a sampler for that name to bound the volume.
+    """
+
+    def __init__(
+        self,
+        path: Optional[os.PathLike[str] | str] = None,
+        *,
+        clock: Callable[[], float] = time.time,
+        metrics: Optional[MetricsExporter] = None,
+    ) -> None:
+        self._path = Path(path) if path is not None else change_log_path()
+        self._clock = clock
+        self._metrics = metrics
+        self._lock = threading.Lock()
+        self._table: Dict[str, List[Dict[str, object]]] = {}
+        self._inode: Optional[int] = None
+        self._generation: Optional[bytes] = None
+        self._offset = 0
+        self._last_applied_at: Optional[float] = None
+        self._applied = 0
+        self._errors = 0
+        self._stop: Optional[threading.Event] = None
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def poll(self) -> int:
+        """Apply any new change records and return how many were applied."""
+
+        applied = self._poll()
+        if self._metrics is not None:
+            self._metrics.record("leaderboard_replication_lag", self.lag())
+        return applied
+
+    def _poll(self) -> int:
+        with self._lock:
+            try:
+                handle = self._path.open("rb")
+            except FileNotFoundError:
+                return 0
+            with handle:
+                stat = os.fstat(handle.fileno())
+                generation = change_log_generation(handle)
+                if not self._same_log(stat, generation) or stat.st_size < self._offset:
+                    self._inode = stat.st_ino
+                    self._generation = generation
+                    self._offset = 0
+                    self._table = {}
+                handle.seek(self._offset)
+                chunk = handle.read()
+            complete = chunk.rfind(b"\n") + 1
+            applied = 0
+            for line in chunk[:complete].splitlines(keepends=True):
+                # Advance per line so a bad record is never applied twice.
+                self._offset += len(line)
+                if not line.strip():
+                    continue
+                try:
+                    self._apply(json.loads(line))
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    self._errors += 1
+                    continue
+                applied += 1
+            self._applied += applied
+            return applied
+
+    def _apply(self, record: Dict[str, object]) -> None:
+        op = record.get("op")
+        if op == "submit":
+            apply_submission(self._table, record["game"], record["entry"], int(record.get("keep", 0)))
+        elif op == "clear":
+            self._table.pop(record["game"], None)
+        elif op == "reset":
+            self._table = {game_id: list(entries) for game_id, entries in record.get("data", {}).items()}
+        self._last_applied_at = record.get("at", self._last_applied_at)
+
+    def _same_log(self, stat: os.stat_result, generation: Optional[bytes]) -> bool:
+        return stat.st_ino == self._inode and generation == self._generation
+
+    def get_top_scores(self, game_id: str, limit: int = 10) -> List[Dict[str, object]]:
+        """Same contract as :func:`server.leaderboard.get_top_scores`, served from memory."""
+
+        if not isinstance(game_id, str) or not game_id.strip():
+            raise ValueError("game_id must be a non-empty string")
+        if not isinstance(limit, int) or limit <= 0:
+            raise ValueError("limit must be a positive integer")
+        with self._lock:
+            return list(self._table.get(game_id, ())[:limit])
+
+    def lag(self) -> Dict[str, object]:
+        """Return how far this replica trails the change log right now.
+
+        ``bytes`` counts log bytes not yet applied. ``seconds`` is ``0`` when
+        caught up; otherwise it is the time since the newest applied record
+        was written by the leader. ``None`` means nothing was applied yet.
+        ``errors`` counts skipped records; any error means the replica may
+        have drifted from the leader.
+        """
+
+        stat = generation = None
+        try:
+            with self._path.open("rb") as handle:
+                stat = os.fstat(handle.fileno())
+                generation = change_log_generation(handle)
+        except FileNotFoundError:
+            pass
+        with self._lock:
+            if stat is None:
+                behind = 0
+            elif self._same_log(stat, generation):
+                behind = max(stat.st_size - self._offset, 0)
+            else:
+                behind = stat.st_size
+            if behind == 0:
+                seconds: Optional[float] = 0.0
+            elif self._last_applied_at is None:
+                seconds = None
+            else:
+                seconds = max(self._clock() - self._last_applied_at, 0.0)
+            return {
+                "bytes": behind,
+                "seconds": seconds,
+                "offset": self._offset,
+                "applied": self._applied,
+                "errors": self._errors,
+            }
+
+    def start(self, interval: float = 0.1) -> None:
+        """Poll from a daemon thread every ``interval`` seconds."""
+
+        if self._stop is not None:
+            return
+        stop = self._stop = threading.Event()
+
+        def run() -> None:
+            while not stop.wait(interval):
+                try:
+                    self.poll()
+                except OSError:  # pragma: no cover - retried on the next tick
+                    continue
+
+        threading.Thread(target=run, name="leaderboard-follower", daemon=True).start()
+
+    def stop(self) -> None:
+        if self._stop is not None:
+            self._stop.set()
+            self._stop = None
+
+
+__all__ = ["LeaderboardFollower"]
@@ -0,0 +1,13 @@
+"""Shared test doubles for the Python test suite."""
+
+from __future__ import annotations
+
+
+class FakeClock:
+    """Callable clock whose time only moves when a test sets ``now``."""
+
+    def __init__(self, now: float = 0.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import threading
 import unittest
 
 from ui.game_over_screen import GameOverScreen
+from ui.leaderboard_client import AsyncLeaderboardClient
 
 
 class FakeClient:
@@ -23,6 +25,21 @@ class FakeClient:
         return entry
 
 
+class RankingClient(FakeClient):
+    def __init__(self) -> None:
+        super().__init__()
+        self.fetches = 0
+
+    def get_top_scores(self, game_id, limit=5):
+        self.fetches += 1
+        return super().get_top_scores(game_id, limit)
+
+    def submit_score_and_rank(self, game_id, score, *, handle=None, share=False, limit=5):
+        entry = self.submit_score(game_id, score, handle=handle, share=share)
+        rank = next(index for index, item in enumerate(self.scores, start=1) if item is entry)
+        return {"submitted": entry, "scores": self.scores[:limit], "rank": rank}
+
+
 class GameOverScreenTestCase(unittest.TestCase):
     def setUp(self) -> None:
         self.client = FakeClient()
@@ -56,6 +73,71 @@ class GameOverScreenTestCase(unittest.TestCase):
         self.screen.submit(15, handle="Quin", share=False)
         self.assertIsNone(self.client.submissions[0]["handle"])
 
+    def test_submit_and_rank_skips_refresh(self):
+        client = RankingClient()
+        client.scores = [{"score": 80, "handle": "Ada", "shared": False}]
+        screen = GameOverScreen("pong", client)
+        screen.submit(40, handle="Kim", share=True)
+        self.assertEqual(client.fetches, 0)
+        self.assertEqual(screen.rank, 2)
+        self.assertEqual([entry.score for entry in screen.top_scores], [80, 40])
+        self.assertTrue(screen.share_prompt)
+
+
+class GameOverScreenAsyncTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.client = FakeClient()
+        self.client.scores = [{"score": 80, "handle": "Ada", "shared": False}]
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+    async def test_timeout_falls_back_to_last_known_scores(self):
+        async_client = AsyncLeaderboardClient(self.client, timeout=0.05)
+        await GameOverScreen("pong", async_client).load_async()
+
+        get_top_scores = self.client.get_top_scores
+
+        def stalled(game_id, limit=5):
+            self.release.wait(5)
+            return get_top_scores(game_id, limit)
+
+        self.client.get_top_scores = stalled
+        screen = GameOverScreen("pong", async_client)
+        entries = await screen.load_async()
+        self.assertTrue(screen.error)
+        self.assertEqual([entry.score for entry in entries], [80])
+
+    async def test_submit_overlaps_fetch_and_merges_entry(self):
+        screen = GameOverScreen("pong", AsyncLeaderboardClient(self.client))
+        submitted = await screen.submit_async(90, handle="Kim", share=True)
+        self.assertEqual(submitted["score"], 90)
+        self.assertEqual([entry.score for entry in screen.top_scores], [90, 80])
+        self.assertEqual(screen.rank, 1)
+        self.assertTrue(screen.share_prompt)
+        self.assertIsNone(screen.error)
+
+    async def test_failed_submit_keeps_fresh_fetch(self):
+        async_client = AsyncLeaderboardClient(self.client)
+        screen = GameOverScreen("pong", async_client)
+        await screen.load_async()
+        self.client.scores.insert(0, {"score": 95, "handle": "Lin", "shared": False})
+
+        def failing(game_id, score, **kwargs):
+            raise ConnectionError("leaderboard unavailable")
+
+        self.client.submit_score = failing
+        self.assertIsNone(await screen.submit_async(90))
+        self.assertEqual(screen.error, "leaderboard unavailable")
+        self.assertEqual([entry.score for entry in screen.top_scores], [95, 80])
+
+    async def test_submit_and_rank_used_when_available(self):
+        client = RankingClient()
+        client.scores = list(self.client.scores)
+        screen = GameOverScreen("pong", AsyncLeaderboardClient(client))
+        await screen.submit_async(40)
+        self.assertEqual(client.fetches, 0)
+        self.assertEqual(screen.rank, 2)
+
 
 if __name__ == "__main__":  # pragma: no cover
     unittest.main()
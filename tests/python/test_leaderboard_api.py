@@ -8,6 +8,7 @@ import tempfile
 import unittest
 from pathlib import Path
 from typing import Dict
+from unittest import mock
 from wsgiref.util import setup_testing_defaults
 
 import api.routes as routes
@@ -75,6 +76,104 @@ class LeaderboardAPITestCase(unittest.TestCase):
         self.assertEqual(len(results["scores"]), 1)
         self.assertEqual(results["scores"][0]["score"], 42)
 
+    def test_submit_with_limit_returns_scores_and_rank(self):
+        leaderboard.submit_score("pong", 90, handle="Ada")
+        leaderboard.submit_score("pong", 10, handle="Bo")
+        payload = json.dumps({"game": "pong", "score": 50, "handle": "Cy", "limit": 2}).encode()
+        status, _, body = self._invoke(
+            {
+                "REQUEST_METHOD": "POST",
+                "PATH_INFO": "/api/leaderboard",
+                "CONTENT_LENGTH": str(len(payload)),
+                "wsgi.input": io.BytesIO(payload),
+            }
+        )
+        self.assertTrue(status.startswith("201"), body)
+        response = json.loads(body)
+        self.assertEqual(response["rank"], 2)
+        self.assertEqual([entry["score"] for entry in response["scores"]], [90, 50])
+        self.assertEqual(response["submitted"]["handle"], "Cy")
+
+    def test_durability_modes_control_fsync(self):
+        self.addCleanup(leaderboard.configure_durability, None)
+        self.assertEqual(leaderboard._durability()[0], "none")
+        with mock.patch.object(leaderboard.os, "fsync", wraps=os.fsync) as fsync:
+            leaderboard.configure_durability("none")
+            leaderboard.submit_score("pong", 1)
+            self.assertEqual(fsync.call_count, 0)
+
+            leaderboard.configure_durability("always")
+            leaderboard.submit_score("pong", 2)
+            self.assertEqual(fsync.call_count, 2)
+
+            leaderboard.configure_durability("interval", interval=60)
+            leaderboard.submit_score("pong", 3)
+            self.assertEqual(fsync.call_count, 2)
+            leaderboard.configure_durability(None)
+            self.assertEqual(fsync.call_count, 4)
+
+        with self.assertRaises(ValueError):
+            leaderboard.configure_durability("sometimes")
+
+    def test_interval_fsync_targets_the_files_that_were_written(self):
+        self.addCleanup(leaderboard.configure_durability, None)
+        self.addCleanup(leaderboard.configure_change_log, None)
+        written = leaderboard._STORAGE_PATH
+        leaderboard.configure_change_log(True)
+        leaderboard.configure_durability("interval", interval=60)
+        leaderboard.submit_score("pong", 1)
+        leaderboard.configure_storage(Path(self.tempdir.name) / "other" / "leaderboard.json")
+        self.addCleanup(leaderboard.configure_storage, written)
+
+        with mock.patch.object(leaderboard, "_fsync_path") as fsync_path:
+            leaderboard.configure_durability(None)
+        synced = {call.args[0] for call in fsync_path.call_args_list}
+        self.assertEqual(synced, {written, leaderboard.change_log_path(written), written.parent})
+
+    def test_snapshot_is_point_in_time_and_streams_ndjson(self):
+        leaderboard.submit_score("pong", 10, handle="Ada")
+        leaderboard.submit_score("snake", 30, handle="Bo")
+        before = leaderboard.snapshot()
+        self.assertIs(leaderboard.snapshot(), before)
+
+        leaderboard.submit_score("pong", 20, handle="Cy")
+        self.assertEqual([entry["score"] for entry in before["pong"]], [10])
+        after = leaderboard.snapshot()
+        self.assertEqual([entry["score"] for entry in after["pong"]], [20, 10])
+        with self.assertRaises(TypeError):
+            after["pong"] = ()  # type: ignore[index]
+
+        lines = [json.loads(line) for line in leaderboard.export_stream()]
+        self.assertEqual([(line["game"], line["score"]) for line in lines], [("pong", 20), ("pong", 10), ("snake", 30)])
+        self.assertEqual(len(list(leaderboard.export_stream(["snake", "missing"]))), 1)
+
+    def test_writers_do_not_retain_a_snapshot(self):
+        with mock.patch.object(leaderboard, "_SNAPSHOT", None):
+            leaderboard.submit_score("pong", 10)
+            self.assertIsNone(leaderboard._SNAPSHOT)
+            table = leaderboard.snapshot()
+            self.assertEqual(leaderboard._SNAPSHOT[1], table)
+
+    def test_snapshot_sees_writes_from_other_processes(self):
+        leaderboard.submit_score("pong", 10)
+        self.assertEqual(len(leaderboard.snapshot()["pong"]), 1)
+        storage = leaderboard._STORAGE_PATH
+        storage.write_text(json.dumps({"pong": [{"score": 5}, {"score": 7}]}), encoding="utf-8")
+        self.assertEqual([entry["score"] for entry in leaderboard.snapshot()["pong"]], [7, 5])
+
+    def test_snapshot_detects_same_size_rewrite_and_owns_its_entries(self):
+        submitted = leaderboard.submit_score("pong", 10)
+        submitted["score"] = 999
+        self.assertEqual(leaderboard.snapshot()["pong"][0]["score"], 10)
+
+        storage = leaderboard._STORAGE_PATH
+        stat = storage.stat()
+        raw = storage.read_bytes().replace(b'"score": 10', b'"score": 42')
+        with storage.open("r+b") as handle:  # same inode, same size
+            handle.write(raw)
+        os.utime(storage, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertEqual(leaderboard.snapshot()["pong"][0]["score"], 42)
+
     def test_invalid_payload_rejected(self):
         payload = json.dumps({"game": "", "score": "oops"}).encode()
         status, _, body = self._invoke(
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from server import leaderboard, leaderboard_binary
+
+
+class LeaderboardBinaryFormatTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tempdir.cleanup)
+        self.storage_path = Path(tempdir.name) / "leaderboard.json"
+        leaderboard.configure_storage(self.storage_path)
+        self.addCleanup(leaderboard.configure_storage_format, None)
+
+    def test_round_trip_preserves_entries(self) -> None:
+        data = {
+            "pong": [
+                {"score": 5, "submittedAt": 1.5, "handle": "Ada", "shared": True},
+                {"score": 9, "metadata": {"seed": "daily-1"}, "shared": False},
+            ],
+            "änder": [{"score": 1}],
+        }
+        decoded = leaderboard_binary.decode(leaderboard_binary.encode(data))
+        self.assertEqual(decoded["pong"], sorted(data["pong"], key=lambda item: item["score"], reverse=True))
+        self.assertEqual(decoded["änder"], [{"score": 1}])
+
+    def test_round_trip_is_exact_for_unexpected_types(self) -> None:
+        entries = [
+            {"score": 7, "handle": None, "shared": None, "submittedAt": "yesterday"},
+            {"score": 6.5, "submittedAt": 3},
+            {"handle": "NoScore"},
+            {"score": 1 << 70},
+        ]
+        decoded = leaderboard_binary.decode(leaderboard_binary.encode({"pong": entries}))["pong"]
+        self.assertEqual(decoded, [entries[3], entries[0], entries[1], entries[2]])
+        self.assertIs(type(decoded[2]["submittedAt"]), int)
+
+    def test_corrupt_file_falls_back_instead_of_raising(self) -> None:
+        leaderboard.configure_storage_format("binary")
+        leaderboard.submit_score("pong", 10)
+        raw = self.storage_path.read_bytes()
+        self.storage_path.write_bytes(raw[: len(raw) // 2])
+        self.assertIsNone(leaderboard_binary.read_top_scores(self.storage_path, "pong", 5))
+        self.assertEqual(leaderboard.get_top_scores("pong"), [])
+
+    def test_binary_storage_serves_top_scores(self) -> None:
+        leaderboard.configure_storage_format("json")
+        leaderboard.submit_score("pong", 10, handle="Ada")
+        self.assertTrue(self.storage_path.read_bytes().startswith(b"{"))
+
+        leaderboard.configure_storage_format("binary")
+        leaderboard.submit_score("pong", 30, handle="Bo", metadata={"mode": "hard"})
+        for index in range(20):
+            leaderboard.submit_score(f"game-{index:02d}", index)
+        self.assertTrue(self.storage_path.read_bytes().startswith(leaderboard_binary.MAGIC))
+
+        top = leaderboard.get_top_scores("pong", limit=5)
+        self.assertEqual([entry["score"] for entry in top], [30, 10])
+        self.assertEqual(top[0]["metadata"], {"mode": "hard"})
+        self.assertEqual(leaderboard.get_top_scores("game-07"), [leaderboard.snapshot()["game-07"][0]])
+        self.assertEqual(leaderboard.get_top_scores("missing"), [])
+
+        leaderboard.configure_storage_format("json")
+        self.assertEqual([entry["score"] for entry in leaderboard.get_top_scores("pong")], [30, 10])
+
+    def test_binary_snapshot_decodes_games_on_demand(self) -> None:
+        leaderboard.configure_storage_format("binary")
+        leaderboard.submit_score("pong", 10, handle="Ada")
+        leaderboard.submit_score("snake", 3)
+        before = leaderboard.snapshot()
+        self.assertIsInstance(before, leaderboard_binary.SnapshotView)
+        self.assertIs(leaderboard.snapshot(), before)
+
+        leaderboard.submit_score("pong", 20)
+        self.assertEqual([entry["score"] for entry in before["pong"]], [10])
+        self.assertEqual(list(before), ["pong", "snake"])
+        self.assertNotIn("missing", before)
+        after = leaderboard.snapshot()
+        self.assertEqual([entry["score"] for entry in after["pong"]], [20, 10])
+        lines = [json.loads(line) for line in leaderboard.export_stream()]
+        self.assertEqual([(line["game"], line["score"]) for line in lines], [("pong", 20), ("pong", 10), ("snake", 3)])
+
+        raw = self.storage_path.read_bytes()
+        self.storage_path.write_bytes(raw[: len(raw) // 3])
+        self.assertEqual(dict(leaderboard.snapshot()), {})
+
+    def test_unknown_format_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            leaderboard.configure_storage_format("xml")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
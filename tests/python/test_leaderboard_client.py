@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import threading
+import unittest
+
+from ui.game_over_screen import GameOverScreen
+from ui.leaderboard_client import CachingLeaderboardClient
+
+from fakes import FakeClock
+
+
+class CountingClient:
+    def __init__(self) -> None:
+        self.scores = []
+        self.fetches = 0
+        self.release = threading.Event()
+        self.release.set()
+
+    def get_top_scores(self, game_id, limit=5):
+        self.fetches += 1
+        self.release.wait(5)
+        return self.scores[:limit]
+
+    def submit_score(self, game_id, score, *, handle=None, share=False):
+        entry = {"score": score, "handle": handle, "shared": share}
+        self.scores.append(entry)
+        self.scores.sort(key=lambda item: item["score"], reverse=True)
+        return entry
+
+
+class CachingLeaderboardClientTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.inner = CountingClient()
+        self.inner.scores = [{"score": 70, "handle": "Ada", "shared": False}]
+        self.clock = FakeClock()
+        self.client = CachingLeaderboardClient(self.inner, ttl=5, clock=self.clock)
+
+    def test_screens_share_cached_scores_until_ttl(self) -> None:
+        cabinet = GameOverScreen("pong", self.client)
+        overlay = GameOverScreen("pong", self.client)
+        cabinet.load()
+        overlay.load()
+        self.assertEqual(self.inner.fetches, 1)
+        self.assertEqual(overlay.top_scores[0].score, 70)
+
+        cabinet.load(limit=3)
+        self.assertEqual(self.inner.fetches, 2)
+        self.clock.now = 5
+        overlay.load()
+        self.assertEqual(self.inner.fetches, 3)
+
+    def test_concurrent_requests_are_coalesced(self) -> None:
+        self.inner.release.clear()
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.client.get_top_scores("pong", limit=5)))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        while self.client.stats()["coalesced"] < 3:
+            threading.Event().wait(0.001)
+        self.inner.release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.inner.fetches, 1)
+        self.assertEqual(len(results), 4)
+
+    def test_submit_invalidates_game(self) -> None:
+        screen = GameOverScreen("pong", self.client)
+        screen.load()
+        screen.submit(90, handle="Kim")
+        self.assertEqual(self.inner.fetches, 2)
+        self.assertFalse(hasattr(self.client, "submit_score_and_rank"))
+        self.assertEqual([entry.score for entry in screen.top_scores], [90, 70])
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from analytics import MetricsExporter
+from server import leaderboard, replication
+from server.replication import LeaderboardFollower
+
+
+def _submit_logged_scores(storage_path: str, game_id: str, scores: list) -> None:
+    from server import leaderboard as lb
+
+    lb.configure_storage(storage_path)
+    lb.configure_change_log(True)
+    for score in scores:
+        lb.submit_score(game_id, score, handle=f"player-{score}")
+
+
+class LeaderboardFollowerTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tempdir.cleanup)
+        self.storage_path = Path(tempdir.name) / "leaderboard.json"
+        leaderboard.configure_storage(self.storage_path)
+        leaderboard.configure_change_log(True, max_bytes=4096)
+        self.addCleanup(leaderboard.configure_change_log, None)
+        self.follower = LeaderboardFollower(leaderboard.change_log_path())
+
+    def test_follower_tracks_submits_clears_and_lag(self) -> None:
+        self.assertEqual(self.follower.poll(), 0)
+        leaderboard.submit_score("pong", 10, handle="Ada")
+        leaderboard.submit_score("pong", 30, handle="Bo")
+        leaderboard.submit_score("snake", 5)
+        lag = self.follower.lag()
+        self.assertGreater(lag["bytes"], 0)
+        self.assertIsNone(lag["seconds"])
+
+        self.assertEqual(self.follower.poll(), 3)
+        self.assertEqual(self.follower.get_top_scores("pong"), leaderboard.get_top_scores("pong"))
+        self.assertEqual(self.follower.lag()["bytes"], 0)
+        self.assertEqual(self.follower.lag()["seconds"], 0.0)
+
+        leaderboard.clear_scores("pong")
+        self.follower.poll()
+        self.assertEqual(self.follower.get_top_scores("pong"), [])
+        leaderboard.clear_scores()
+        self.follower.poll()
+        self.assertEqual(self.follower.get_top_scores("snake"), [])
+
+    def test_follower_survives_compaction(self) -> None:
+        for score in range(60):
+            leaderboard.submit_score("pong", score, handle="x" * 20)
+            if score % 7 == 0:
+                self.follower.poll()
+        self.follower.poll()
+        self.assertLess(leaderboard.change_log_path().stat().st_size, 4096 + 512)
+        self.assertEqual(self.follower.get_top_scores("pong"), leaderboard.get_top_scores("pong"))
+
+    def test_two_compactions_between_polls_with_a_reused_inode(self) -> None:
+        real_fstat = os.fstat
+
+        def reused_inode(fd):
+            # Every log looks like the same inode, as when the filesystem reuses it.
+            stat = real_fstat(fd)
+            return os.stat_result((stat.st_mode, 1) + tuple(stat)[2:])
+
+        path = leaderboard.change_log_path()
+        with mock.patch.object(replication.os, "fstat", side_effect=reused_inode):
+            for score in range(25):
+                leaderboard.submit_score("pong", score, handle="x" * 20)
+            self.follower.poll()
+            offset = self.follower.lag()["offset"]
+
+            generations = set()
+            score = 100
+            while len(generations) < 3 or path.stat().st_size <= offset:
+                leaderboard.submit_score(f"game-{score % 9}", score, handle="y" * 20)
+                with path.open("rb") as handle:
+                    generations.add(leaderboard.change_log_generation(handle))
+                score += 1
+            self.follower.poll()
+
+        self.assertEqual(self.follower.lag()["errors"], 0)
+        for game_id in ["pong"] + [f"game-{index}" for index in range(9)]:
+            self.assertEqual(self.follower.get_top_scores(game_id), leaderboard.get_top_scores(game_id))
+
+    def test_bad_records_are_counted_and_never_reapplied(self) -> None:
+        metrics = MetricsExporter()
+        follower = LeaderboardFollower(leaderboard.change_log_path(), metrics=metrics)
+        leaderboard.submit_score("pong", 10)
+        with leaderboard.change_log_path().open("ab") as handle:
+            handle.write(b'{"op": "submit", "game": "pong"}\n{"op": "sub\n')
+        leaderboard.submit_score("pong", 20)
+
+        self.assertEqual(follower.poll(), 2)
+        self.assertEqual(follower.poll(), 0)
+        self.assertEqual([entry["score"] for entry in follower.get_top_scores("pong")], [20, 10])
+        lag = follower.lag()
+        self.assertEqual((lag["errors"], lag["bytes"]), (2, 0))
+        self.assertEqual(metrics.events[-1].name, "leaderboard_replication_lag")
+        self.assertEqual(metrics.events[-1].payload["errors"], 2)
+
+    def test_follower_replicates_writes_from_multiple_processes(self) -> None:
+        ctx = multiprocessing.get_context("spawn")
+        leaderboard.configure_change_log(True)
+        batches = {"alpha": list(range(0, 12)), "beta": list(range(100, 112)), "gamma": list(range(50, 62))}
+        processes = [
+            ctx.Process(target=_submit_logged_scores, args=(str(self.storage_path), game_id, scores))
+            for game_id, scores in batches.items()
+        ]
+        for proc in processes:
+            proc.start()
+        for proc in processes:
+            proc.join(timeout=20)
+            self.assertEqual(proc.exitcode, 0)
+
+        self.follower.poll()
+        self.assertEqual(self.follower.lag()["bytes"], 0)
+        for game_id in batches:
+            self.assertEqual(self.follower.get_top_scores(game_id), leaderboard.get_top_scores(game_id))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
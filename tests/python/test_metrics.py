@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import threading
+import unittest
+
+from analytics import CompactEventStore, MetricsEvent, MetricsExporter
+
+
+class CompactEventStoreTestCase(unittest.TestCase):
+    def test_materializes_events_on_demand(self) -> None:
+        store = CompactEventStore()
+        store.add("tutorial_started", {"tutorial": "getting_started"})
+        store.add("tutorial_step_engaged", {"tutorial": "getting_started", "step": "welcome"})
+        store.add("custom", {"tags": ["a", "b"], "flag": True, "count": 1})
+
+        self.assertEqual(len(store), 3)
+        self.assertEqual(store[0], MetricsEvent("tutorial_started", {"tutorial": "getting_started"}))
+        self.assertEqual(store[-1].payload, {"tags": ["a", "b"], "flag": True, "count": 1})
+        self.assertIs(type(store[-1].payload["flag"]), bool)
+        self.assertIs(type(store[-1].payload["count"]), int)
+        self.assertEqual([event.name for event in store[1:]], ["tutorial_step_engaged", "custom"])
+        with self.assertRaises(IndexError):
+            store[3]
+
+    def test_iter_field_skips_materialization(self) -> None:
+        store = CompactEventStore()
+        store.add("a", {"tutorial": "t1"})
+        store.add("b", {})
+        self.assertEqual(list(store.iter_field("tutorial")), [("a", "t1"), ("b", None)])
+        store.clear()
+        self.assertEqual(len(store), 0)
+
+
+class MetricsExporterTestCase(unittest.TestCase):
+    def test_compact_mode_matches_list_mode(self) -> None:
+        emitted = []
+        regular = MetricsExporter()
+        compact = MetricsExporter(emitted.append, compact=True)
+        for exporter in (regular, compact):
+            exporter.record("tutorial_started", {"tutorial": "combat_basics"})
+            exporter.record("tutorial_step_completed", {"tutorial": "combat_basics", "step": "equip"})
+            exporter.record("tutorial_step_completed", {"tutorial": "combat_basics", "step": "target"})
+            exporter.record("heartbeat")
+
+        self.assertEqual(compact.events, regular.events)
+        self.assertEqual(compact.export_counts(), regular.export_counts())
+        self.assertEqual(compact.export_counts()["tutorial_step_completed:combat_basics"], 2)
+        self.assertEqual(emitted, regular.events)
+
+    def test_concurrent_mode_merges_thread_buffers(self) -> None:
+        for compact in (False, True):
+            exporter = MetricsExporter(concurrent=True, compact=compact)
+            barrier = threading.Barrier(8)
+
+            def worker(index: int) -> None:
+                barrier.wait()
+                for step in range(500):
+                    exporter.record("tutorial_step_completed", {"tutorial": f"t{index % 2}", "step": step})
+
+            threads = [threading.Thread(target=worker, args=(index,)) for index in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            counts = exporter.export_counts()
+            self.assertEqual(counts["tutorial_step_completed:t0"], 2000)
+            self.assertEqual(counts["tutorial_step_completed:t1"], 2000)
+            self.assertEqual(len(exporter.events), 4000)
+            self.assertEqual(exporter.flush(), 0)
+            exporter.record("after")
+            self.assertEqual(exporter.flush(), 1)
+            self.assertEqual(exporter.events[-1].name, "after")
+            exporter.clear()
+            self.assertEqual(exporter.events, [])
+
+    def test_concurrent_reads_only_ever_extend_the_merged_order(self) -> None:
+        exporter = MetricsExporter(concurrent=True)
+
+        def worker(index: int) -> None:
+            for step in range(2000):
+                exporter.record("tick", {"worker": index, "step": step})
+
+        threads = [threading.Thread(target=worker, args=(index,)) for index in range(4)]
+        for thread in threads:
+            thread.start()
+        snapshots = []
+        while any(thread.is_alive() for thread in threads):
+            snapshots.append(exporter.events)
+        for thread in threads:
+            thread.join()
+
+        final = exporter.events
+        self.assertEqual(len(final), 8000)
+        for snapshot in snapshots:
+            self.assertEqual(final[: len(snapshot)], snapshot)
+        for index in range(4):
+            steps = [event.payload["step"] for event in final if event.payload["worker"] == index]
+            self.assertEqual(steps, list(range(2000)))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import random
+import threading
+import unittest
+
+from analytics import AdaptiveSampler, FixedRateSampler, MetricsExporter, TutorialFunnel
+
+from fakes import FakeClock
+
+
+class SamplingTestCase(unittest.TestCase):
+    def test_fixed_rate_counts_are_unbiased(self) -> None:
+        for compact in (False, True):
+            exporter = MetricsExporter(
+                compact=compact,
+                sampling={"tutorial_step_engaged": FixedRateSampler(0.1, rng=random.Random(7))},
+            )
+            for _ in range(20_000):
+                exporter.record("tutorial_step_engaged", {"tutorial": "combat_basics", "step": "equip"})
+            exporter.record("tutorial_started", {"tutorial": "combat_basics"})
+
+            counts = exporter.export_counts()
+            self.assertAlmostEqual(counts["tutorial_step_engaged:combat_basics"], 20_000, delta=1_000)
+            self.assertEqual(counts["tutorial_started:combat_basics"], 1)
+            kept = len(exporter.events) - 1
+            self.assertEqual(exporter.dropped["tutorial_step_engaged"], 20_000 - kept)
+            self.assertTrue(all(event.weight == 10 for event in exporter.events[:-1]))
+
+    def test_drop_happens_before_payload_copy(self) -> None:
+        class DropAll:
+            def sample(self) -> float:
+                return 0
+
+        exporter = MetricsExporter(sampling={"noisy": DropAll()})
+        exporter.record("noisy", object())  # type: ignore[arg-type] - would fail if copied
+        self.assertEqual(exporter.events, [])
+        self.assertEqual(exporter.dropped, {"noisy": 1})
+
+    def test_adaptive_sampler_tracks_budget(self) -> None:
+        clock = FakeClock()
+        sampler = AdaptiveSampler(100, clock=clock, rng=random.Random(3))
+        exporter = MetricsExporter(sampling={"tutorial_hints_toggled": sampler})
+        funnel = TutorialFunnel()
+        for second in range(5):
+            for tick in range(1_000):
+                clock.now = second + tick / 1_000
+                exporter.record("tutorial_hints_toggled", {"tutorial": "getting_started"})
+        self.assertAlmostEqual(sampler.probability, 0.1, places=2)
+        self.assertAlmostEqual(exporter.export_counts()["tutorial_hints_toggled:getting_started"], 5_000, delta=500)
+
+        exporter.set_sampler("tutorial_step_engaged", FixedRateSampler(0.5, rng=random.Random(1)))
+        for _ in range(2_000):
+            exporter.record("tutorial_step_engaged", {"tutorial": "getting_started", "step": "welcome"})
+        for event in exporter.events:
+            funnel.observe(event)
+        engaged = funnel.funnel("getting_started")["steps"][0]["engaged"]
+        self.assertAlmostEqual(engaged, 2_000, delta=200)
+
+    def test_concurrent_drops_and_offers_are_not_lost(self) -> None:
+        clock = FakeClock()
+        sampler = AdaptiveSampler(100, clock=clock, rng=random.Random(5))
+        exporter = MetricsExporter(concurrent=True, sampling={"noisy": FixedRateSampler(0.5, rng=random.Random(2))})
+
+        def worker() -> None:
+            for _ in range(5_000):
+                exporter.record("noisy")
+                sampler.sample()
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(exporter.events) + exporter.dropped["noisy"], 20_000)
+        clock.now = 1.0
+        sampler.sample()
+        self.assertAlmostEqual(sampler.probability, 100 / 20_000)
+
+    def test_rejects_invalid_rates(self) -> None:
+        with self.assertRaises(ValueError):
+            FixedRateSampler(0)
+        with self.assertRaises(ValueError):
+            AdaptiveSampler(0)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
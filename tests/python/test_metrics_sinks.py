@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from analytics import MetricsExporter, RotatingNDJSONSink, TutorialAnalytics, aggregate_segments, iter_events
+
+from fakes import FakeClock
+
+
+class RotatingNDJSONSinkTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tempdir.cleanup)
+        self.directory = Path(tempdir.name)
+        self.clock = FakeClock(1_000.0)
+
+    def test_buffers_until_batch_size(self) -> None:
+        sink = RotatingNDJSONSink(self.directory, buffer_size=3, clock=self.clock)
+        exporter = MetricsExporter(sink)
+        exporter.record("a")
+        exporter.record("b")
+        self.assertEqual(list(self.directory.iterdir()), [])
+        exporter.record("c")
+        sink.close()
+        events = list(iter_events(sink.segments()))
+        self.assertEqual([event.name for event in events], ["a", "b", "c"])
+
+    def test_rotates_by_size_and_age_with_gzip(self) -> None:
+        sink = RotatingNDJSONSink(
+            self.directory,
+            buffer_size=1,
+            max_bytes=64,
+            max_age=30,
+            compress=True,
+            clock=self.clock,
+        )
+        exporter = MetricsExporter(sink)
+        for index in range(4):
+            exporter.record("tutorial_started", {"tutorial": f"t{index}"})
+        self.clock.now += 31
+        exporter.record("tick")
+        sink.close()
+
+        segments = sink.segments()
+        self.assertGreater(len(segments), 1)
+        self.assertTrue(all(path.name.endswith(".ndjson.gz") for path in segments))
+        names = [event.name for event in iter_events(segments)]
+        self.assertEqual(names, ["tutorial_started"] * 4 + ["tick"])
+
+    def test_rotation_defers_compression_off_the_recording_thread(self) -> None:
+        sink = RotatingNDJSONSink(
+            self.directory, buffer_size=1, max_bytes=1, compress=True, autoflush=False, clock=self.clock
+        )
+        exporter = MetricsExporter(sink)
+        exporter.record("first")
+        exporter.record("second")
+        segments = sink.segments()
+        self.assertEqual([path.name.endswith(".ndjson") for path in segments], [True, True])
+
+        sink._tick()
+        segments = sink.segments()
+        self.assertTrue(all(path.name.endswith(".ndjson.gz") for path in segments))
+        self.assertEqual(sorted(path.name for path in self.directory.iterdir()), sorted(p.name for p in segments))
+        self.assertEqual([event.name for event in iter_events(segments)], ["first", "second"])
+        sink.close()
+
+    def test_plain_copy_of_a_compressed_segment_is_hidden_and_cleaned(self) -> None:
+        sink = RotatingNDJSONSink(self.directory, buffer_size=1, compress=True, autoflush=False, clock=self.clock)
+        MetricsExporter(sink).record("once")
+        compressed = sink.rotate()
+        plain = compressed.with_name(compressed.name[: -len(".gz")])
+        plain.write_text('{"name":"once"}\n', encoding="utf-8")
+        self.assertEqual(sink.segments(), [compressed])
+
+        RotatingNDJSONSink(self.directory, compress=True, autoflush=False, clock=self.clock).close()
+        self.assertFalse(plain.exists())
+
+    def test_streaming_aggregation_across_segments(self) -> None:
+        sink = RotatingNDJSONSink(self.directory, buffer_size=2, max_bytes=200, clock=self.clock)
+        analytics = TutorialAnalytics(MetricsExporter(sink))
+        for _ in range(2):
+            analytics.track_tutorial_start("combat_basics")
+            analytics.track_step_engaged("combat_basics", "equip")
+        analytics.track_step_completed("combat_basics", "equip")
+        analytics.track_step_engaged("combat_basics", "target")
+        sink.close()
+        with sink.segments()[-1].open("a", encoding="utf-8") as handle:
+            handle.write('{"name": "trunc')
+
+        summary = aggregate_segments(sink.segments())
+        self.assertEqual(summary.events, 6)
+        self.assertEqual(summary.counts["tutorial_started:combat_basics"], 2)
+        funnel = summary.funnel.funnel("combat_basics")
+        self.assertEqual(funnel["started"], 2)
+        steps = {step["step"]: (step["engaged"], step["completed"]) for step in funnel["steps"]}
+        self.assertEqual(steps, {"equip": (2, 1), "target": (1, 0)})
+
+    def test_timer_flushes_and_seals_without_new_events(self) -> None:
+        sink = RotatingNDJSONSink(self.directory, buffer_size=100, flush_interval=0.02, max_age=0.05)
+        self.addCleanup(sink.close)
+        MetricsExporter(sink).record("quiet")
+        deadline = time.monotonic() + 5
+        while not sink.segments() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual([event.name for event in iter_events(sink.segments())], ["quiet"])
+
+    def test_orphaned_active_segments_are_sealed_on_startup(self) -> None:
+        crashed = RotatingNDJSONSink(self.directory, buffer_size=1, autoflush=False, clock=self.clock)
+        MetricsExporter(crashed).record("before_crash")
+        self.assertEqual(crashed.segments(), [])
+
+        sink = RotatingNDJSONSink(self.directory, buffer_size=1, autoflush=False, clock=self.clock)
+        MetricsExporter(sink).record("after_restart")
+        sink.close()
+        segments = sink.segments()
+        self.assertEqual(len(segments), 2)
+        self.assertEqual([event.name for event in iter_events(segments)], ["before_crash", "after_restart"])
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
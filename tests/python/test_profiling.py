@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import io
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from wsgiref.util import setup_testing_defaults
+
+import api.routes as routes
+from server import leaderboard
+from server.profiling import Profiler, _from_environment
+from tutorial import engine as tutorial_engine
+from tutorial.engine import TutorialEngine
+from tutorial.sessions import TutorialSessionManager
+
+from fakes import FakeClock
+
+
+class ProfilerTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tempdir.cleanup)
+        self.output_dir = Path(tempdir.name)
+        self.clock = FakeClock()
+        self.profiler = Profiler(output_dir=self.output_dir, max_files=2, clock=self.clock)
+        self.addCleanup(self.profiler.disable)
+
+    def test_samples_one_in_n_calls(self) -> None:
+        self.profiler.enable(every=3)
+        results = [self.profiler.call(sum, [index, 1]) for index in range(9)]
+        self.assertEqual(results, [index + 1 for index in range(9)])
+        summary = self.profiler.summary()
+        self.assertEqual(summary["profiled"], 3)
+        self.assertIn("function calls", summary["stats"])
+
+    def test_rejects_non_integer_every(self) -> None:
+        for every in (True, 0, 1.5):
+            with self.assertRaises(ValueError):
+                self.profiler.enable(every=every)
+        self.assertFalse(self.profiler.active)
+
+    def test_window_expires_and_unhooks_engine(self) -> None:
+        self.profiler.enable(seconds=5)
+        self.assertIsNotNone(tutorial_engine._RECORD_HOOK)
+        engine = TutorialEngine()
+        engine.load("getting_started")
+        self.assertTrue(engine.record_event("ui:start_pressed"))
+        self.assertEqual(self.profiler.summary(limit=0)["profiled"], 1)
+
+        self.clock.now = 5
+        engine.record_event("noise")
+        self.assertFalse(self.profiler.active)
+        self.assertIsNone(tutorial_engine._RECORD_HOOK)
+
+    def test_session_manager_events_are_profiled(self) -> None:
+        self.profiler.enable()
+        manager = TutorialSessionManager()
+        manager.start("player", "getting_started")
+        self.assertTrue(manager.record_event("player", "ui:start_pressed"))
+        manager.record_events([("player", "noise"), ("player", "noise")])
+        self.assertEqual(self.profiler.summary(limit=0)["profiled"], 3)
+
+    def test_every_enabled_profiler_samples_tutorial_events(self) -> None:
+        other = Profiler(output_dir=self.output_dir, clock=self.clock)
+        self.addCleanup(other.disable)
+        self.profiler.enable()
+        other.enable(every=2)
+        engine = TutorialEngine()
+        engine.load("getting_started")
+        for _ in range(4):
+            engine.record_event("noise")
+        self.assertEqual(self.profiler.summary(limit=0)["profiled"], 4)
+        self.assertEqual(other.summary(limit=0)["profiled"], 2)
+
+    def test_dump_rotates_files(self) -> None:
+        self.assertIsNone(self.profiler.dump())
+        self.profiler.enable()
+        self.profiler.call(sorted, [3, 1, 2])
+        paths = [self.profiler.dump() for _ in range(3)]
+        self.assertTrue(all(path is not None for path in paths))
+        self.assertEqual(len(list(self.output_dir.glob("profile-*.pstats"))), 2)
+
+    def test_profilers_disabled_out_of_order_restore_engine(self) -> None:
+        other = Profiler(output_dir=self.output_dir, clock=self.clock)
+        self.addCleanup(other.disable)
+        self.profiler.enable()
+        other.enable()
+        self.profiler.disable()
+        engine = TutorialEngine()
+        engine.load("getting_started")
+        engine.record_event("ui:start_pressed")
+        self.assertEqual(other.summary(limit=0)["profiled"], 1)
+        other.disable()
+        self.assertIsNone(tutorial_engine._RECORD_HOOK)
+
+    def test_malformed_environment_leaves_profiler_disabled(self) -> None:
+        with mock.patch.dict(os.environ, {"PROFILE_EVERY": "often", "PROFILE_WINDOW_SECONDS": "1m"}):
+            with self.assertWarns(RuntimeWarning):
+                profiler = _from_environment()
+        self.assertFalse(profiler.active)
+
+
+class ProfileRouteTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tempdir.cleanup)
+        leaderboard.configure_storage(Path(tempdir.name) / "leaderboard.json")
+        self.addCleanup(routes.PROFILER.reset)
+        self.addCleanup(routes.PROFILER.disable)
+        patcher = mock.patch.object(routes.PROFILER, "_output_dir", Path(tempdir.name) / "profiles")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _invoke(self, method: str, path: str, payload=None, token=None, query=""):
+        body = json.dumps(payload).encode() if payload is not None else b""
+        environ = {
+            "REQUEST_METHOD": method,
+            "PATH_INFO": path,
+            "QUERY_STRING": query,
+            "CONTENT_LENGTH": str(len(body)),
+            "wsgi.input": io.BytesIO(body),
+            "REMOTE_ADDR": "admin-test",
+        }
+        if token is not None:
+            environ["HTTP_X_ADMIN_TOKEN"] = token
+        setup_testing_defaults(environ)
+        captured = {}
+        chunks = routes.application(environ, lambda status, headers: captured.update(status=status))
+        return captured["status"], json.loads(b"".join(chunks))
+
+    def test_route_hidden_without_token(self) -> None:
+        with mock.patch.dict(os.environ, {}, clear=False):
+            os.environ.pop("PROFILING_ADMIN_TOKEN", None)
+            status, _ = self._invoke("GET", "/api/admin/profile")
+        self.assertTrue(status.startswith("404"))
+
+    def test_admin_can_enable_inspect_and_dump(self) -> None:
+        with mock.patch.dict(os.environ, {"PROFILING_ADMIN_TOKEN": "secret"}):
+            status, _ = self._invoke("GET", "/api/admin/profile", token="wrong")
+            self.assertTrue(status.startswith("403"))
+
+            status, body = self._invoke("POST", "/api/admin/profile", {"action": "enable", "every": 1}, token="secret")
+            self.assertTrue(status.startswith("200"), body)
+            self.assertTrue(body["enabled"])
+
+            status, _ = self._invoke("GET", "/api/leaderboard", query="game=pong")
+            self.assertTrue(status.startswith("200"))
+
+            status, body = self._invoke("GET", "/api/admin/profile", token="secret", query="limit=5")
+            self.assertGreaterEqual(body["profiled"], 1)
+            self.assertIn("function calls", body["stats"])
+
+            status, body = self._invoke("POST", "/api/admin/profile", {"action": "dump"}, token="secret")
+            self.assertTrue(Path(body["path"]).exists())
+
+            status, body = self._invoke("POST", "/api/admin/profile", {"action": "nope"}, token="secret")
+            self.assertTrue(status.startswith("400"))
+
+    def test_dump_failure_is_reported_as_json(self) -> None:
+        with mock.patch.dict(os.environ, {"PROFILING_ADMIN_TOKEN": "secret"}):
+            with mock.patch.object(routes.PROFILER, "dump", side_effect=PermissionError("read-only")):
+                status, body = self._invoke("POST", "/api/admin/profile", {"action": "dump"}, token="secret")
+            self.assertTrue(status.startswith("500"))
+            self.assertIn("read-only", body["error"])
+
+            status, body = self._invoke("POST", "/api/admin/profile", ["dump"], token="secret")
+            self.assertTrue(status.startswith("400"))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
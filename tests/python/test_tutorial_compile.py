@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from tutorial.compile import main, validate_script
+from tutorial.engine import SCRIPTS_PATH, FileSystemScriptLoader, ScriptCache, TutorialEngine
+
+
+def _step(step_id: str, next_step=None, events=("ui:ok",)) -> dict:
+    return {"id": step_id, "completeEvents": list(events), "next": next_step}
+
+
+class ValidateScriptTestCase(unittest.TestCase):
+    def _messages(self, steps) -> list:
+        return [(issue.severity, issue.step, issue.message) for issue in validate_script({"id": "demo", "steps": steps})]
+
+    def test_shipped_scripts_are_valid(self) -> None:
+        for path in SCRIPTS_PATH.glob("*.json"):
+            raw = json.loads(path.read_text(encoding="utf-8"))
+            self.assertEqual(validate_script(raw), [], path.name)
+
+    def test_dangling_next_and_empty_events_are_errors(self) -> None:
+        messages = self._messages([_step("a", "missing"), _step("b", events=())])
+        self.assertIn(("error", "a", "next points to unknown step 'missing'"), messages)
+        self.assertIn(("error", "b", "step has no completeEvents and can never complete"), messages)
+
+    def test_cycle_is_reported_once(self) -> None:
+        messages = self._messages([_step("a", "b"), _step("b", "c"), _step("c", "b")])
+        cycles = [message for message in messages if "cycle" in message[2]]
+        self.assertEqual(cycles, [("error", "b", "steps form a cycle: b -> c -> b")])
+
+    def test_unreachable_step_and_repeated_event_are_warnings(self) -> None:
+        messages = self._messages([_step("a"), _step("orphan", events=("ui:orphan", "ui:orphan"))])
+        self.assertEqual(
+            messages,
+            [
+                ("warning", "orphan", "completion event 'ui:orphan' is listed twice"),
+                ("warning", "orphan", "step is unreachable from the first step"),
+            ],
+        )
+
+    def test_malformed_steps_are_reported_not_raised(self) -> None:
+        messages = self._messages(["a", {"id": "b", "next": ["z"]}, {"id": ["c"], "completeEvents": ["ui:ok"]}])
+        self.assertIn(("error", None, "step at position 0 is not an object"), messages)
+        self.assertIn(("error", "b", "next must be a step id or null"), messages)
+        self.assertIn(("error", "b", "step has no completeEvents and can never complete"), messages)
+        self.assertIn(("error", None, "step at position 2 has a non-string id"), messages)
+
+        messages = self._messages([{"id": "a", "completeEvents": "ui:ok", "hints": {"branches": [["x"]]}}])
+        self.assertIn(("error", "a", "completeEvents must be a list of event names"), messages)
+        self.assertIn(("error", "a", "hints must be an object with default and branches lists"), messages)
+        self.assertEqual(validate_script([]), [validate_script("x")[0]])
+
+
+class CompileCommandTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tempdir.cleanup)
+        self.scripts = Path(tempdir.name)
+        for path in SCRIPTS_PATH.glob("*.json"):
+            shutil.copy(path, self.scripts / path.name)
+
+    def _run(self, *argv: str) -> int:
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            return main(["--scripts", str(self.scripts), *argv])
+
+    def test_loader_prefers_fresh_artifact(self) -> None:
+        self.assertEqual(self._run(), 0)
+        self.assertTrue((self.scripts / "getting_started.tutc").exists())
+        loader = FileSystemScriptLoader(self.scripts)
+        compiled = TutorialEngine(loader, script_cache=ScriptCache()).load("getting_started")
+
+        (self.scripts / "getting_started.json").unlink()
+        from_artifact = TutorialEngine(loader, script_cache=ScriptCache()).load("getting_started")
+        self.assertEqual(from_artifact, compiled)
+        self.assertEqual(loader.script_ids(), ["combat_basics", "getting_started"])
+
+    def test_stale_artifact_falls_back_to_json(self) -> None:
+        self.assertEqual(self._run("getting_started"), 0)
+        path = self.scripts / "getting_started.json"
+        raw = json.loads(path.read_text(encoding="utf-8"))
+        raw["title"] = "Edited after compiling"
+        path.write_text(json.dumps(raw), encoding="utf-8")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        loader = FileSystemScriptLoader(self.scripts)
+        self.assertEqual(loader.load("getting_started")["title"], "Edited after compiling")
+
+    def test_unreadable_artifact_falls_back_to_json(self) -> None:
+        (self.scripts / "getting_started.tutc").mkdir()
+        loader = FileSystemScriptLoader(self.scripts)
+        self.assertEqual(loader.load("getting_started")["id"], "getting_started")
+
+    def test_invalid_script_fails_without_artifact(self) -> None:
+        (self.scripts / "broken.json").write_text(
+            json.dumps({"id": "broken", "steps": [_step("a", "a")]}), encoding="utf-8"
+        )
+        self.assertEqual(self._run(), 1)
+        self.assertFalse((self.scripts / "broken.tutc").exists())
+        self.assertTrue((self.scripts / "combat_basics.tutc").exists())
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
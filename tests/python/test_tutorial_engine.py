@@ -1,10 +1,29 @@
 from __future__ import annotations
 
+import json
+import os
+import shutil
+import tempfile
 import unittest
+from pathlib import Path
 
 from analytics import MetricsExporter, TutorialAnalytics
 from scenes.tutorial_scene import TutorialScene
-from tutorial.engine import TutorialEngine
+from tutorial.engine import (
+    SCRIPTS_PATH,
+    UNKNOWN_EVENT,
+    DefaultHintStrategy,
+    FileSystemScriptLoader,
+    HintBranch,
+    StepHints,
+    ScriptCache,
+    TutorialEngine,
+    TutorialStep,
+    flag_mask,
+    intern_events,
+    lookup_event,
+    preload_scripts,
+)
 
 
 class TutorialEngineTestCase(unittest.TestCase):
@@ -28,6 +47,69 @@ class TutorialEngineTestCase(unittest.TestCase):
         self.assertEqual(counts["tutorial_step_completed:getting_started"], 3)
         self.assertEqual(counts["tutorial_completed:getting_started"], 1)
 
+    def test_compiled_dispatch_accepts_interned_events(self) -> None:
+        script = self.engine.script
+        self.assertEqual(script.step_index["movement"], 1)
+        self.assertEqual(script.transitions[2], {lookup_event("movement:jump_success"): -1})
+        self.assertEqual(lookup_event("noise:never_scripted"), UNKNOWN_EVENT)
+
+        stream = intern_events(
+            ["noise:never_scripted", "ui:start_pressed", "ui:start_pressed", "movement:checkpoint_reached"]
+        )
+        results = [self.engine.record_event(event_id) for event_id in stream]
+        self.assertEqual(results, [False, True, False, True])
+        self.assertEqual(self.engine.current_step.id, "jump")
+        self.assertEqual(lookup_event("noise:never_scripted"), UNKNOWN_EVENT)
+
+    def test_batched_events_advance_once(self) -> None:
+        scene = TutorialScene(self.engine)
+        state = scene.on_player_events(
+            ["noise", "ui:start_pressed", "movement:checkpoint_reached", "noise"],
+            {"flags": ["player_idle"]},
+        )
+        self.assertEqual(state.step, "jump")
+        self.assertEqual(state.completed, ["welcome", "movement"])
+        self.assertIn("Begin walking", state.hints[0])
+        self.assertEqual(self.engine.record_events(["movement:jump_success", "ui:start_pressed"]), 1)
+        self.assertTrue(self.engine.is_completed())
+
+    def test_scene_reuses_state_until_something_changes(self) -> None:
+        calls = []
+
+        def counting_generator(tutorial_id, step, context, fallback):  # noqa: ANN001
+            calls.append(step.id)
+            return None
+
+        engine = TutorialEngine(hint_generator=counting_generator, analytics=self.analytics)
+        scene = TutorialScene(engine)
+        first = scene.start("getting_started")
+        version = engine.version
+        self.assertIs(scene.on_player_event("noise"), first)
+        self.assertEqual(engine.version, version)
+        self.assertEqual(len(calls), 1)
+
+        idle = scene.on_player_event("noise", {"flags": ["player_idle"]})
+        self.assertIsNot(idle, first)
+        self.assertIn("glowing", idle.hints[0])
+        self.assertIs(idle.completed, first.completed)
+        self.assertEqual(len(calls), 2)
+
+        progressed = scene.on_player_event("ui:start_pressed", {"flags": ["player_idle"]})
+        self.assertEqual(progressed.step, "movement")
+        self.assertGreater(engine.version, version)
+
+    def test_scene_delta_reports_changed_fields(self) -> None:
+        scene = TutorialScene(self.engine)
+        self.assertEqual(scene.delta()["step"], "welcome")
+        self.assertEqual(scene.delta(), {})
+        self.engine.record_event("ui:start_pressed")
+        changes = scene.delta()
+        self.assertEqual(changes["step"], "movement")
+        self.assertEqual(changes["completed"], ["welcome"])
+        self.assertNotIn("tutorial", changes)
+        self.assertNotIn("hints_enabled", changes)
+        self.assertEqual(set(scene.delta({"flags": ["player_off_course"]})), {"hints"})
+
     def test_ml_hint_generator_used(self) -> None:
         captured = {}
 
@@ -56,6 +138,30 @@ class TutorialEngineTestCase(unittest.TestCase):
         hints = engine.get_hints({"flags": ["player_hit_barrier"]})
         self.assertIn("Jump a split-second earlier", hints[0])
 
+    def test_hint_branches_match_by_flag_mask(self) -> None:
+        strategy = DefaultHintStrategy()
+        step = TutorialStep(
+            id="custom",
+            text="",
+            objectives=(),
+            complete_events=(),
+            next_step=None,
+            hints=StepHints(
+                default=("default",),
+                branches=(
+                    HintBranch(when=("low_health", "in_combat"), hints=("both",)),
+                    HintBranch(when=("in_combat",), hints=("combat",)),
+                ),
+            ),
+        )
+        self.assertEqual(strategy(step, {"flags": ["in_combat", "low_health"]}), ["both"])
+        self.assertEqual(strategy(step, {"flags": ["in_combat", "unscripted_flag"]}), ["combat"])
+        self.assertEqual(strategy(step, {"flags": ["low_health"]}), ["default"])
+        self.assertEqual(strategy(step), ["default"])
+        precomputed = {"flag_mask": flag_mask(["low_health", "in_combat"]), "flags": []}
+        self.assertEqual(strategy(step, precomputed), ["both"])
+        self.assertEqual(flag_mask(["unscripted_flag"]), 0)
+
     def test_scene_state_and_hint_toggle(self) -> None:
         scene = TutorialScene(self.engine)
         state = scene.state()
@@ -73,5 +179,50 @@ class TutorialEngineTestCase(unittest.TestCase):
         self.assertEqual(counts["tutorial_hints_toggled:getting_started"], 2)
 
 
+class ScriptCacheTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tempdir.cleanup)
+        self.scripts = Path(tempdir.name)
+        for path in SCRIPTS_PATH.glob("*.json"):
+            shutil.copy(path, self.scripts / path.name)
+        self.loader = FileSystemScriptLoader(self.scripts)
+        self.cache = ScriptCache()
+
+    def _engine(self) -> TutorialEngine:
+        return TutorialEngine(self.loader, script_cache=self.cache)
+
+    def test_engines_share_compiled_script(self) -> None:
+        first = self._engine().load("combat_basics")
+        second = self._engine().load("combat_basics")
+        self.assertIs(first, second)
+        self.assertIsInstance(first.steps["equip"].objectives, tuple)
+        with self.assertRaises(TypeError):
+            first.steps["equip"] = first.steps["target"]  # type: ignore[index]
+
+    def test_modified_script_is_recompiled(self) -> None:
+        original = self._engine().load("getting_started")
+        path = self.scripts / "getting_started.json"
+        raw = json.loads(path.read_text(encoding="utf-8"))
+        raw["title"] = "Getting Started (remastered)"
+        path.write_text(json.dumps(raw), encoding="utf-8")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        reloaded = self._engine().load("getting_started")
+        self.assertIsNot(reloaded, original)
+        self.assertEqual(reloaded.title, "Getting Started (remastered)")
+
+    def test_preload_compiles_every_script(self) -> None:
+        scripts = preload_scripts(self.loader, self.cache)
+        self.assertEqual(sorted(scripts), ["combat_basics", "getting_started"])
+        self.assertEqual(len(self.cache), 2)
+        self.assertIs(self._engine().load("getting_started"), scripts["getting_started"])
+
+    def test_missing_script_raises(self) -> None:
+        with self.assertRaises(FileNotFoundError):
+            self._engine().load("missing")
+
+
 if __name__ == "__main__":  # pragma: no cover
     unittest.main()
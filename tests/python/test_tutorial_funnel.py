@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import threading
+import unittest
+
+from analytics import DurationHistogram, MetricsExporter, TutorialAnalytics, TutorialFunnel
+from tutorial.engine import TutorialEngine
+
+from fakes import FakeClock
+
+
+class TutorialFunnelTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.analytics = TutorialAnalytics(MetricsExporter())
+
+    def _engine(self) -> TutorialEngine:
+        return TutorialEngine(analytics=self.analytics, clock=self.clock)
+
+    def test_funnel_tracks_conversion_and_drop_off(self) -> None:
+        finisher = self._engine()
+        finisher.load("getting_started")
+        quitter = self._engine()
+        quitter.load("getting_started")
+
+        self.clock.now = 3.0
+        finisher.record_event("ui:start_pressed")
+        quitter.record_event("ui:start_pressed")
+        self.clock.now = 40.0
+        finisher.record_event("movement:checkpoint_reached")
+        finisher.record_event("movement:jump_success")
+
+        funnel = self.analytics.funnel.funnel("getting_started")
+        self.assertEqual(funnel["started"], 2)
+        self.assertEqual(funnel["completed"], 1)
+        self.assertEqual(funnel["conversion"], 0.5)
+        self.assertEqual([step["step"] for step in funnel["steps"]], ["welcome", "movement", "jump"])
+        movement = funnel["steps"][1]
+        self.assertEqual((movement["engaged"], movement["completed"], movement["dropOff"]), (2, 1, 1))
+        self.assertEqual(funnel["steps"][0]["duration"]["p50"], 5.0)
+        self.assertEqual(funnel["duration"]["total"], 1)
+        self.assertEqual(funnel["duration"]["p50"], 60.0)
+
+    def test_threads_record_without_sharing_counters(self) -> None:
+        funnel = TutorialFunnel()
+
+        def worker() -> None:
+            for _ in range(1000):
+                funnel.record("tutorial_started", {"tutorial": "getting_started"})
+                funnel.record("tutorial_step_engaged", {"tutorial": "getting_started", "step": "welcome"})
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        funnel.record("tutorial_step_engaged", {"tutorial": "getting_started", "step": "movement"})
+        for thread in threads:
+            thread.join()
+
+        result = funnel.funnel("getting_started")
+        self.assertEqual(result["started"], 4000)
+        self.assertEqual({step["step"]: step["engaged"] for step in result["steps"]}, {"welcome": 4000, "movement": 1})
+        self.assertEqual(funnel.tutorials(), ["getting_started"])
+        funnel.clear()
+        self.assertEqual(funnel.funnel("getting_started")["started"], 0)
+
+    def test_unknown_tutorial_returns_empty_funnel(self) -> None:
+        funnel = self.analytics.funnel.funnel("combat_basics")
+        self.assertEqual(funnel["steps"], [])
+        self.assertIsNone(funnel["conversion"])
+
+
+class DurationHistogramTestCase(unittest.TestCase):
+    def test_buckets_and_overflow(self) -> None:
+        histogram = DurationHistogram((1.0, 10.0))
+        for seconds in (0.5, 1.0, 7.0, 99.0):
+            histogram.observe(seconds)
+        self.assertEqual(histogram.counts, [2, 1, 1])
+        self.assertEqual(histogram.percentile(0.5), 1.0)
+        self.assertEqual(histogram.percentile(1.0), float("inf"))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
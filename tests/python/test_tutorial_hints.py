@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import threading
+import time
+import unittest
+
+from analytics import MetricsExporter, TutorialAnalytics
+from tutorial.engine import TutorialEngine
+from tutorial.hints import CachedHintGenerator
+
+from fakes import FakeClock
+
+
+class CachedHintGeneratorTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.calls = []
+        self.clock = FakeClock()
+
+    def _generator(self, tutorial_id, step, context, fallback):  # noqa: ANN001
+        self.calls.append((tutorial_id, step.id, tuple(sorted(context.get("flags", [])))))
+        return [f"ml hint for {step.id}"]
+
+    def _engine(self, generator) -> TutorialEngine:  # noqa: ANN001
+        engine = TutorialEngine(hint_generator=generator, analytics=TutorialAnalytics(MetricsExporter()))
+        engine.load("getting_started")
+        return engine
+
+    def test_memoizes_per_step_and_flag_set(self) -> None:
+        cached = CachedHintGenerator(self._generator, ttl=60, clock=self.clock)
+        engine = self._engine(cached)
+        self.assertEqual(engine.get_hints({"flags": ["a", "b"]}), ["ml hint for welcome"])
+        self.assertEqual(engine.get_hints({"flags": ["b", "a"]}), ["ml hint for welcome"])
+        engine.get_hints({"flags": ["a"]})
+        self.assertEqual(len(self.calls), 2)
+
+        self.clock.now = 61
+        engine.get_hints({"flags": ["a", "b"]})
+        self.assertEqual(len(self.calls), 3)
+        stats = cached.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 3))
+
+    def test_lru_eviction_and_invalidate(self) -> None:
+        cached = CachedHintGenerator(self._generator, maxsize=2, clock=self.clock)
+        engine = self._engine(cached)
+        for flags in (["a"], ["b"], ["c"], ["a"]):
+            engine.get_hints({"flags": flags})
+        self.assertEqual(len(self.calls), 4)
+        cached.invalidate("getting_started")
+        self.assertEqual(cached.stats()["size"], 0)
+
+    def test_errors_fall_back_and_are_not_cached(self) -> None:
+        def broken(*args):  # noqa: ANN002
+            self.calls.append(args)
+            raise RuntimeError("offline")
+
+        engine = self._engine(CachedHintGenerator(broken))
+        fallback = engine.get_hints({"flags": ["player_idle"]})
+        self.assertIn("glowing", fallback[0])
+        engine.get_hints({"flags": ["player_idle"]})
+        self.assertEqual(len(self.calls), 2)
+
+    def test_deadline_returns_fallback_and_fills_cache_later(self) -> None:
+        release = threading.Event()
+
+        def slow(tutorial_id, step, context, fallback):  # noqa: ANN001
+            release.wait(5)
+            return ["slow ml hint"]
+
+        cached = CachedHintGenerator(slow, deadline=0.05)
+        self.addCleanup(cached.close)
+        engine = self._engine(cached)
+        started = time.perf_counter()
+        hints = engine.get_hints({"flags": []})
+        self.assertLess(time.perf_counter() - started, 1)
+        self.assertEqual(hints, ["Tap Start when you're ready to begin."])
+        self.assertEqual(cached.stats()["timeouts"], 1)
+
+        release.set()
+        for _ in range(100):
+            if cached.stats()["size"]:
+                break
+            time.sleep(0.01)
+        self.assertEqual(engine.get_hints({"flags": []}), ["slow ml hint"])
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
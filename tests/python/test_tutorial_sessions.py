@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import json
+import unittest
+
+from analytics import MetricsExporter, TutorialAnalytics
+from tutorial.engine import TutorialEngine
+from tutorial.sessions import TutorialSessionManager
+
+
+class TutorialSessionManagerTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.metrics = MetricsExporter()
+        self.manager = TutorialSessionManager(analytics=TutorialAnalytics(self.metrics))
+
+    def test_sessions_progress_independently(self) -> None:
+        self.manager.start("p1", "getting_started")
+        self.manager.start("p2", "getting_started")
+        self.manager.start("p3", "combat_basics")
+
+        self.assertTrue(self.manager.record_event("p1", "ui:start_pressed"))
+        self.assertFalse(self.manager.record_event("p2", "movement:checkpoint_reached"))
+        self.assertTrue(self.manager.record_event("p3", "inventory:weapon_equipped"))
+
+        self.assertEqual(self.manager.snapshot("p1")["step"], "movement")
+        self.assertEqual(self.manager.snapshot("p2")["step"], "welcome")
+        self.assertEqual(self.manager.snapshot("p3")["completed"], ["equip"])
+        self.assertEqual(len(self.manager), 3)
+
+    def test_matches_single_engine_behaviour(self) -> None:
+        engine = TutorialEngine(analytics=TutorialAnalytics(MetricsExporter()))
+        engine.load("getting_started")
+        self.manager.start("solo", "getting_started")
+        context = {"flags": ["player_idle"]}
+        for event in ("noise", "ui:start_pressed", "movement:checkpoint_reached", "movement:jump_success"):
+            self.assertEqual(self.manager.get_hints("solo", context), engine.get_hints(context))
+            self.assertEqual(self.manager.record_event("solo", event), engine.record_event(event))
+            self.assertEqual(self.manager.snapshot("solo"), engine.snapshot())
+        self.assertTrue(self.manager.is_completed("solo"))
+        self.assertEqual(self.metrics.export_counts()["tutorial_completed:getting_started"], 1)
+
+    def test_multi_session_batch(self) -> None:
+        self.manager.start("p1", "getting_started")
+        self.manager.start("p2", "combat_basics")
+        advanced = self.manager.record_events(
+            [
+                ("p1", "ui:start_pressed"),
+                ("p2", "noise"),
+                ("p2", "inventory:weapon_equipped"),
+                ("p1", "movement:checkpoint_reached"),
+            ]
+        )
+        self.assertEqual(advanced, {"p1": 2, "p2": 1})
+        self.assertEqual(self.manager.snapshot("p1")["step"], "jump")
+        with self.assertRaises(KeyError):
+            self.manager.record_events([("ghost", "ui:start_pressed")])
+
+    def test_hint_toggle_and_unknown_session(self) -> None:
+        self.manager.start("p1", "combat_basics")
+        self.manager.set_hints_enabled("p1", False)
+        self.assertEqual(self.manager.get_hints("p1"), [])
+        self.assertEqual(self.metrics.export_counts()["tutorial_hints_toggled:combat_basics"], 1)
+        with self.assertRaises(KeyError):
+            self.manager.snapshot("nobody")
+
+    def test_dump_and_restore_round_trip(self) -> None:
+        self.manager.start("p1", "getting_started")
+        self.manager.start("p2", "combat_basics")
+        self.manager.record_event("p1", "ui:start_pressed")
+        self.manager.set_hints_enabled("p2", False)
+        dumped = json.loads(json.dumps(self.manager.dump()))
+
+        restored = TutorialSessionManager()
+        self.assertEqual(restored.restore(dumped), 2)
+        for session_id in ("p1", "p2"):
+            self.assertEqual(restored.snapshot(session_id), self.manager.snapshot(session_id))
+        self.assertTrue(restored.record_event("p1", "movement:checkpoint_reached"))
+
+        dumped["sessions"][0][2] = 99
+        with self.assertRaises(ValueError):
+            restored.restore(dumped)
+
+    def test_restore_maps_progress_by_step_id_and_keeps_tuple_ids(self) -> None:
+        self.manager.start(("eu", 7), "getting_started")
+        self.manager.record_event(("eu", 7), "ui:start_pressed")
+        dumped = json.loads(json.dumps(self.manager.dump()))
+        self.assertEqual(dumped["steps"]["getting_started"], ["welcome", "movement", "jump"])
+
+        # Simulate a script edit that swapped the first two steps.
+        dumped["steps"]["getting_started"] = ["movement", "welcome", "jump"]
+        dumped["sessions"][0][2:4] = [1, 0b01]
+        restored = TutorialSessionManager()
+        restored.restore(dumped)
+        snapshot = restored.snapshot(("eu", 7))
+        self.assertEqual((snapshot["step"], snapshot["completed"]), ("welcome", ["movement"]))
+
+        dumped["steps"]["getting_started"][0] = "removed"
+        with self.assertRaises(ValueError):
+            restored.restore(dumped)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from analytics import MetricsExporter, TutorialAnalytics
+from tutorial.engine import TutorialEngine
+from tutorial.sessions import TutorialSessionManager
+from tutorial.store import MemorySessionStore, SQLiteSessionStore
+
+from fakes import FakeClock
+
+
+class EngineRestoreTestCase(unittest.TestCase):
+    def test_restore_round_trips_snapshot(self) -> None:
+        engine = TutorialEngine(analytics=TutorialAnalytics(MetricsExporter()))
+        engine.load("getting_started")
+        engine.record_event("ui:start_pressed")
+        engine.set_hints_enabled(False)
+        snapshot = engine.snapshot()
+
+        metrics = MetricsExporter()
+        restored = TutorialEngine(analytics=TutorialAnalytics(metrics))
+        version = restored.version
+        restored.restore(snapshot)
+        self.assertEqual(restored.snapshot(), snapshot)
+        self.assertGreater(restored.version, version)
+        self.assertEqual(metrics.export_counts(), {})
+
+        self.assertTrue(restored.record_event("movement:checkpoint_reached"))
+        self.assertEqual(restored.completed_steps, ["welcome", "movement"])
+
+    def test_restore_rejects_unknown_steps(self) -> None:
+        engine = TutorialEngine()
+        with self.assertRaises(ValueError):
+            engine.restore({"tutorial": "getting_started", "step": "missing", "completed": []})
+
+
+class SQLiteSessionStoreTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tempdir.cleanup)
+        self.path = Path(tempdir.name) / "sessions.db"
+        self.clock = FakeClock()
+
+    def _store(self, **kwargs) -> SQLiteSessionStore:
+        store = SQLiteSessionStore(self.path, clock=self.clock, **kwargs)
+        self.addCleanup(store.close)
+        return store
+
+    def test_writes_coalesce_until_flush(self) -> None:
+        store = self._store(batch_size=10, flush_interval=60)
+        for step in ("welcome", "movement", "jump"):
+            store.save("p1", {"tutorial": "getting_started", "step": step})
+        store.save("p2", {"tutorial": "combat_basics", "step": "equip"})
+        self.assertEqual(store.pending, 2)
+        self.assertEqual(store.load("p1")["step"], "jump")
+        self.assertIsNone(self._store().load("p1"))
+
+        store.flush()
+        self.assertEqual(store.pending, 0)
+        self.assertEqual(self._store().load("p1")["step"], "jump")
+
+    def test_batch_size_and_interval_trigger_flush(self) -> None:
+        store = self._store(batch_size=2, flush_interval=5)
+        store.save("p1", {"step": "a"})
+        store.save("p2", {"step": "b"})
+        self.assertEqual(store.pending, 0)
+
+        store.save("p3", {"step": "c"})
+        self.clock.now = 5
+        store.delete("p1")
+        self.assertEqual(store.pending, 0)
+        reader = self._store()
+        self.assertIsNone(reader.load("p1"))
+        self.assertEqual(reader.load("p3"), {"step": "c"})
+
+    def test_timer_flushes_idle_store_and_accepts_tuple_ids(self) -> None:
+        store = SQLiteSessionStore(self.path, batch_size=100, flush_interval=0.02)
+        self.addCleanup(store.close)
+        store.save(("eu", 7), {"step": "a"})
+        deadline = time.monotonic() + 5
+        while store.pending and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(store.pending, 0)
+        self.assertEqual(self._store().load(("eu", 7)), {"step": "a"})
+
+    def test_close_flushes_pending_writes(self) -> None:
+        store = SQLiteSessionStore(self.path, batch_size=100, flush_interval=60, autoflush=False)
+        store.save("p1", {"step": "a"})
+        store.close()
+        self.assertEqual(self._store().load("p1"), {"step": "a"})
+
+
+class SessionManagerStoreTestCase(unittest.TestCase):
+    def test_session_resumes_on_another_manager(self) -> None:
+        store = MemorySessionStore()
+        first = TutorialSessionManager(session_store=store)
+        first.start("p1", "getting_started")
+        first.record_event("p1", "ui:start_pressed")
+
+        second = TutorialSessionManager(session_store=store)
+        self.assertIsNone(second.resume("unknown"))
+        self.assertEqual(second.resume("p1"), first.snapshot("p1"))
+        self.assertTrue(second.record_event("p1", "movement:checkpoint_reached"))
+
+        second.end("p1")
+        self.assertEqual(len(store), 0)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
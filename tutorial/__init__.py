@@ -1,5 +1,19 @@
 """Tutorial package exposing the engine and script utilities."""
 
-from .engine import TutorialEngine, TutorialScript, TutorialStep
+from .engine import ScriptCache, TutorialEngine, TutorialScript, TutorialStep, preload_scripts
+from .hints import CachedHintGenerator
+from .sessions import TutorialSessionManager
+from .store import MemorySessionStore, SQLiteSessionStore, SessionStore
 
-__all__ = ["TutorialEngine", "TutorialScript", "TutorialStep"]
+__all__ = [
+    "CachedHintGenerator",
+    "MemorySessionStore",
+    "SQLiteSessionStore",
+    "ScriptCache",
+    "SessionStore",
+    "TutorialEngine",
+    "TutorialScript",
+    "TutorialSessionManager",
+    "TutorialStep",
+    "preload_scripts",
+]
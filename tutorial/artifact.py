@@ -0,0 +1,74 @@
+"""Binary artifact format for precompiled tutorial scripts.
+
+An artifact is a small header followed by a ``marshal`` dump of the
+compiled script from :func:`tutorial.engine.compile_script`::
+
+    MAGIC | marshal version (1 byte) | source mtime_ns (8) | source size (8) | payload
+
+The source stamp ties the artifact to the JSON file it was built from, so a
+script edited after compilation falls back to JSON until it is recompiled.
+"""
+
+from __future__ import annotations
+
+import marshal
+import os
+import struct
+from pathlib import Path
+from typing import Optional, Tuple
+
+ARTIFACT_SUFFIX = ".tutc"
+MAGIC = b"GGTUT\x02"
+_HEADER = struct.Struct("<BQQ")
+
+
+def write_artifact(path: Path, compiled: Tuple[object, ...], source: Optional[Path] = None) -> int:
+    """Write ``compiled`` to ``path`` atomically and return the artifact size."""
+
+    mtime_ns = size = 0
+    if source is not None:
+        stat = source.stat()
+        mtime_ns, size = stat.st_mtime_ns, stat.st_size
+    data = MAGIC + _HEADER.pack(marshal.version, mtime_ns, size) + marshal.dumps(compiled)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+    return len(data)
+
+
+def read_artifact(path: Path, source: Optional[Path] = None) -> Optional[Tuple[object, ...]]:
+    """Return the compiled script in ``path`` or ``None`` if it is unreadable or stale.
+
+    When ``source`` exists, its mtime and size must match the stamp recorded
+    at compile time. Artifacts written by a different ``marshal`` version are
+    ignored, as are artifacts from an older layout (a different ``MAGIC``).
+    """
+
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None
+    header_end = len(MAGIC) + _HEADER.size
+    if len(data) < header_end or not data.startswith(MAGIC):
+        return None
+    version, mtime_ns, size = _HEADER.unpack_from(data, len(MAGIC))
+    if version != marshal.version:
+        return None
+    if source is not None:
+        try:
+            stat = source.stat()
+        except FileNotFoundError:
+            pass
+        except OSError:
+            return None
+        else:
+            if (stat.st_mtime_ns, stat.st_size) != (mtime_ns, size):
+                return None
+    try:
+        raw = marshal.loads(data[header_end:])
+    except (EOFError, ValueError, TypeError):
+        return None
+    return raw if isinstance(raw, tuple) else None
+
+
+__all__ = ["ARTIFACT_SUFFIX", "read_artifact", "write_artifact"]
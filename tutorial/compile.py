@@ -0,0 +1,195 @@
+"""Validate tutorial scripts and compile them into ``.tutc`` artifacts.
+
+Usage::
+
+    python -m tutorial.compile [--check] [--scripts DIR] [--output DIR] [ids ...]
+
+Every script is checked for malformed fields, broken step graphs (dangling
+``next`` targets, cycles, unreachable steps) and steps that can never
+complete. Scripts with errors are not compiled and make the command exit
+with status 1. Artifacts hold the compiled step table, so loading one skips
+JSON decoding and target resolution.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from .artifact import ARTIFACT_SUFFIX, write_artifact
+from .engine import SCRIPTS_PATH, compile_script
+
+ERROR = "error"
+WARNING = "warning"
+
+
+@dataclass(frozen=True)
+class ScriptIssue:
+    """A single validation finding for a tutorial script."""
+
+    severity: str
+    message: str
+    step: Optional[str] = None
+
+    def __str__(self) -> str:
+        where = f" [{self.step}]" if self.step else ""
+        return f"{self.severity}{where}: {self.message}"
+
+
+def validate_script(raw: object) -> List[ScriptIssue]:
+    """Return the problems found in the JSON form of a tutorial script.
+
+    Malformed documents (wrong types anywhere in the step list) are reported
+    as errors rather than raised.
+    """
+
+    if not isinstance(raw, dict):
+        return [ScriptIssue(ERROR, "script must be a JSON object")]
+    issues: List[ScriptIssue] = []
+    steps = raw.get("steps", [])
+    if not raw.get("id"):
+        issues.append(ScriptIssue(ERROR, "script has no id"))
+    if not isinstance(steps, list):
+        issues.append(ScriptIssue(ERROR, "steps must be a list"))
+        return issues
+    if not steps:
+        issues.append(ScriptIssue(ERROR, "script has no steps"))
+        return issues
+
+    by_id: Dict[str, Dict[str, object]] = {}
+    first: Optional[str] = None
+    for position, step in enumerate(steps):
+        if not isinstance(step, dict):
+            issues.append(ScriptIssue(ERROR, f"step at position {position} is not an object"))
+            continue
+        step_id = step.get("id")
+        if not step_id:
+            issues.append(ScriptIssue(ERROR, f"step at position {position} has no id"))
+            continue
+        if not isinstance(step_id, str):
+            issues.append(ScriptIssue(ERROR, f"step at position {position} has a non-string id"))
+            continue
+        if step_id in by_id:
+            issues.append(ScriptIssue(ERROR, "duplicate step id", step_id))
+            continue
+        by_id[step_id] = step
+        if position == 0:
+            first = step_id
+
+    successors: Dict[str, Optional[str]] = {}
+    for step_id, step in by_id.items():
+        successors[step_id] = None
+        target = step.get("next")
+        if target is not None and not isinstance(target, str):
+            issues.append(ScriptIssue(ERROR, "next must be a step id or null", step_id))
+        elif target and target not in by_id:
+            issues.append(ScriptIssue(ERROR, f"next points to unknown step '{target}'", step_id))
+        elif target:
+            successors[step_id] = target
+        events = step.get("completeEvents", [])
+        if not _is_string_list(events):
+            issues.append(ScriptIssue(ERROR, "completeEvents must be a list of event names", step_id))
+        elif not events:
+            issues.append(ScriptIssue(ERROR, "step has no completeEvents and can never complete", step_id))
+        else:
+            seen = set()
+            for event in events:
+                if event in seen:
+                    issues.append(ScriptIssue(WARNING, f"completion event '{event}' is listed twice", step_id))
+                seen.add(event)
+        if not _is_string_list(step.get("objectives", [])):
+            issues.append(ScriptIssue(ERROR, "objectives must be a list of strings", step_id))
+        if not _valid_hints(step.get("hints", {})):
+            issues.append(ScriptIssue(ERROR, "hints must be an object with default and branches lists", step_id))
+
+    # Each step has at most one successor, so following ``next`` from every
+    # step finds all cycles.
+    reported = set()
+    for start in successors:
+        path: List[str] = []
+        on_path = set()
+        current: Optional[str] = start
+        while current is not None and current not in on_path:
+            path.append(current)
+            on_path.add(current)
+            current = successors[current]
+        if current in on_path:
+            cycle = tuple(path[path.index(current):])
+            key = frozenset(cycle)
+            if key not in reported:
+                reported.add(key)
+                issues.append(ScriptIssue(ERROR, "steps form a cycle: " + " -> ".join(cycle + (current,)), current))
+
+    reachable = set()
+    current = first
+    while current is not None and current not in reachable:
+        reachable.add(current)
+        current = successors[current]
+    if first is not None:
+        for step_id in by_id:
+            if step_id not in reachable:
+                issues.append(ScriptIssue(WARNING, "step is unreachable from the first step", step_id))
+    return issues
+
+
+def _is_string_list(value: object) -> bool:
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+
+def _valid_hints(hints: object) -> bool:
+    if not isinstance(hints, dict) or not _is_string_list(hints.get("default", [])):
+        return False
+    branches = hints.get("branches", [])
+    return isinstance(branches, list) and all(
+        isinstance(branch, dict)
+        and _is_string_list(branch.get("when", []))
+        and _is_string_list(branch.get("hints", []))
+        for branch in branches
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m tutorial.compile", description=__doc__.splitlines()[0])
+    parser.add_argument("ids", nargs="*", help="script ids to process (default: every script)")
+    parser.add_argument("--scripts", type=Path, default=SCRIPTS_PATH, help="directory holding <id>.json scripts")
+    parser.add_argument("--output", type=Path, default=None, help="artifact directory (default: next to the scripts)")
+    parser.add_argument("--check", action="store_true", help="validate only; do not write artifacts")
+    args = parser.parse_args(argv)
+
+    ids = args.ids or sorted(path.stem for path in args.scripts.glob("*.json"))
+    if args.output is not None:
+        args.output.mkdir(parents=True, exist_ok=True)
+    failed = False
+    for script_id in ids:
+        source = args.scripts / f"{script_id}.json"
+        try:
+            with source.open("r", encoding="utf-8") as handle:
+                raw = json.load(handle)
+        except (OSError, ValueError) as exc:
+            print(f"{source}: error: {exc}", file=sys.stderr)
+            failed = True
+            continue
+        issues = validate_script(raw)
+        for issue in issues:
+            print(f"{source}: {issue}", file=sys.stderr)
+        if any(issue.severity == ERROR for issue in issues):
+            failed = True
+            continue
+        if args.check:
+            print(f"{source}: ok")
+            continue
+        target = (args.output or source.parent) / f"{script_id}{ARTIFACT_SUFFIX}"
+        size = write_artifact(target, compile_script(raw), source)
+        print(f"{source} -> {target} ({size} bytes)")
+    return 1 if failed else 0
+
+
+__all__ = ["ScriptIssue", "main", "validate_script"]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
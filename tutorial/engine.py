@@ -3,29 +3,111 @@
 from __future__ import annotations
 
 import json
+import threading
+import time
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Callable, Dict, Iterable, List, Optional, Sequence
+from types import MappingProxyType
+from typing import Callable, Dict, FrozenSet, Hashable, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
 
 from analytics import TutorialAnalytics
 
+from .artifact import ARTIFACT_SUFFIX, read_artifact
+
 SCRIPTS_PATH = Path(__file__).with_name("scripts")
 
+UNKNOWN_EVENT = -1
+"""Event id returned by :func:`lookup_event` for events no script listens to."""
+
+_EVENT_IDS: Dict[str, int] = {}
+_EVENT_IDS_LOCK = threading.Lock()
+
+
+def intern_event(name: str) -> int:
+    """Return the process-wide integer id for ``name``, allocating one if needed."""
+
+    event_id = _EVENT_IDS.get(name)
+    if event_id is None:
+        with _EVENT_IDS_LOCK:
+            event_id = _EVENT_IDS.setdefault(name, len(_EVENT_IDS))
+    return event_id
+
+
+def lookup_event(name: str) -> int:
+    """Return the id for ``name`` or :data:`UNKNOWN_EVENT` without interning it.
+
+    Only events referenced by a compiled script are interned, so noise
+    events never grow the vocabulary.
+    """
+
+    return _EVENT_IDS.get(name, UNKNOWN_EVENT)
+
+
+def intern_events(names: Iterable[str]) -> List[int]:
+    """Translate an event stream to ids once, ready for repeated replays."""
+
+    return [_EVENT_IDS.get(name, UNKNOWN_EVENT) for name in names]
+
+
+_FLAG_BITS: Dict[str, int] = {}
+_FLAG_BITS_LOCK = threading.Lock()
+
+
+def _intern_flag(name: str) -> int:
+    bit = _FLAG_BITS.get(name)
+    if bit is None:
+        with _FLAG_BITS_LOCK:
+            bit = _FLAG_BITS.setdefault(name, 1 << len(_FLAG_BITS))
+    return bit
+
+
+def flag_mask(flags: Iterable[str]) -> int:
+    """Return the bitmask for ``flags`` over the interned hint flag vocabulary.
+
+    Flags that no hint branch mentions have no bit and are ignored, which is
+    safe because they can never complete a branch condition. Callers that
+    reuse a flag set can pass the result as ``context["flag_mask"]``.
+    """
+
+    mask = 0
+    bits = _FLAG_BITS
+    for flag in flags:
+        mask |= bits.get(flag, 0)
+    return mask
+
+
+def flags_key(context: Optional[Dict[str, object]]) -> Union[FrozenSet[str], int]:
+    """Return a hashable key for the hint-relevant flags of ``context``."""
+
+    if not context:
+        return frozenset()
+    flags = context.get("flags")
+    if flags is None:
+        return int(context.get("flag_mask", 0))
+    return frozenset(flags)
+
 
 @dataclass(frozen=True)
 class HintBranch:
     """A conditional hint variant selected when the context matches."""
 
     when: Sequence[str]
-    hints: List[str]
+    hints: Tuple[str, ...]
+    mask: int = field(init=False, compare=False, repr=False)
+
+    def __post_init__(self) -> None:
+        mask = 0
+        for flag in self.when:
+            mask |= _intern_flag(flag)
+        object.__setattr__(self, "mask", mask)
 
 
 @dataclass(frozen=True)
 class StepHints:
     """Collection of hints for a tutorial step."""
 
-    default: List[str] = field(default_factory=list)
-    branches: List[HintBranch] = field(default_factory=list)
+    default: Tuple[str, ...] = ()
+    branches: Tuple[HintBranch, ...] = ()
 
 
 @dataclass(frozen=True)
@@ -34,22 +116,112 @@ class TutorialStep:
 
     id: str
     text: str
-    objectives: List[str]
-    complete_events: List[str]
+    objectives: Tuple[str, ...]
+    complete_events: Tuple[str, ...]
     next_step: Optional[str]
     hints: StepHints = field(default_factory=StepHints)
 
 
 @dataclass(frozen=True)
 class TutorialScript:
-    """Parsed representation of a tutorial script."""
+    """Parsed representation of a tutorial script.
+
+    Scripts are deeply immutable (tuples and read-only mappings) so a single
+    instance can be shared by every engine through :class:`ScriptCache`.
+
+    :func:`parse_script` also compiles the step graph into an integer state
+    machine: ``step_list[i]`` is the step at position ``i`` of ``order`` and
+    ``transitions[i]`` maps interned event ids to the next position, ``-1``
+    meaning the tutorial ends.
+    """
 
     id: str
     title: str
     description: str
-    steps: Dict[str, TutorialStep]
-    order: List[str]
-    completion: Dict[str, object] = field(default_factory=dict)
+    steps: Mapping[str, TutorialStep]
+    order: Tuple[str, ...]
+    completion: Mapping[str, object] = field(default_factory=lambda: MappingProxyType({}))
+    step_list: Tuple[TutorialStep, ...] = field(default=(), compare=False, repr=False)
+    step_index: Mapping[str, int] = field(default_factory=lambda: MappingProxyType({}), compare=False, repr=False)
+    transitions: Tuple[Mapping[int, int], ...] = field(default=(), compare=False, repr=False)
+
+
+def parse_script(raw: Dict[str, object]) -> TutorialScript:
+    """Build an immutable :class:`TutorialScript` from its JSON form."""
+
+    return build_script(compile_script(raw))
+
+
+def compile_script(raw: Dict[str, object]) -> Tuple[object, ...]:
+    """Flatten the JSON form of a script into the builtin tuples stored in ``.tutc`` artifacts.
+
+    Step ids are resolved to positions here, so :func:`build_script` only
+    has to create the step objects and intern event names.
+    """
+
+    definitions: Dict[str, Tuple[object, ...]] = {}
+    order: List[str] = []
+    for entry in raw.get("steps", []):
+        row = _compile_step(entry)
+        definitions[row[0]] = row
+        order.append(row[0])
+    step_index: Dict[str, int] = {}
+    for position, step_id in enumerate(order):
+        step_index.setdefault(step_id, position)
+    rows = tuple(definitions[step_id] for step_id in order)
+    # A dangling ``next`` ends the tutorial (``python -m tutorial.compile``
+    # reports it).
+    targets = tuple(step_index.get(row[4], -1) if row[4] else -1 for row in rows)
+    return (
+        raw.get("id", ""),
+        raw.get("title", ""),
+        raw.get("description", ""),
+        dict(raw.get("completion", {})),
+        rows,
+        step_index,
+        targets,
+    )
+
+
+def _compile_step(raw: Dict[str, object]) -> Tuple[object, ...]:
+    hints = raw.get("hints", {})
+    return (
+        raw.get("id", ""),
+        raw.get("text", ""),
+        tuple(raw.get("objectives", [])),
+        tuple(raw.get("completeEvents", [])),
+        raw.get("next"),
+        tuple(hints.get("default", [])),
+        tuple((tuple(branch.get("when", [])), tuple(branch.get("hints", []))) for branch in hints.get("branches", [])),
+    )
+
+
+def build_script(compiled: Tuple[object, ...]) -> TutorialScript:
+    """Create a :class:`TutorialScript` from the output of :func:`compile_script`."""
+
+    script_id, title, description, completion, rows, step_index, targets = compiled
+    steps: Dict[str, TutorialStep] = {}
+    for step_id, text, objectives, events, next_step, default, branches in rows:
+        if step_id not in steps:
+            hints = StepHints(default, tuple(HintBranch(when, branch_hints) for when, branch_hints in branches))
+            steps[step_id] = TutorialStep(step_id, text, objectives, events, next_step, hints)
+    step_list = tuple(steps[row[0]] for row in rows)
+    # Event ids are process-local, so transitions are keyed here rather than
+    # in the artifact. Plain dicts keep the hot lookup cheap.
+    transitions = tuple(
+        {intern_event(event): target for event in step.complete_events} for step, target in zip(step_list, targets)
+    )
+    return TutorialScript(
+        id=script_id,
+        title=title,
+        description=description,
+        steps=MappingProxyType(steps),
+        order=tuple(row[0] for row in rows),
+        completion=MappingProxyType(completion),
+        step_list=step_list,
+        step_index=MappingProxyType(step_index),
+        transitions=transitions,
+    )
 
 
 class ScriptLoader:
@@ -58,33 +230,217 @@ class ScriptLoader:
     def load(self, script_id: str) -> Dict[str, object]:  # pragma: no cover - interface
         raise NotImplementedError
 
+    def load_script(self, script_id: str) -> TutorialScript:
+        """Return the compiled script; loaders with a faster path than :meth:`load` override this."""
+
+        return parse_script(self.load(script_id))
+
+    def fingerprint(self, script_id: str) -> Optional[Tuple[Hashable, Hashable]]:
+        """Return ``(source, version)`` identifying the current script contents.
+
+        ``source`` names where the script lives and ``version`` changes
+        whenever its contents do. Loaders returning ``None`` are never cached.
+        """
+
+        return None
+
+    def script_ids(self) -> List[str]:
+        """Return the ids this loader can serve, used for preloading."""
+
+        return []
+
 
 class FileSystemScriptLoader(ScriptLoader):
-    """Loads tutorial definitions from ``tutorial/scripts``."""
+    """Loads tutorial definitions from ``tutorial/scripts``.
+
+    :meth:`load_script` prefers a precompiled ``<id>.tutc`` artifact (see
+    ``python -m tutorial.compile``) over ``<id>.json`` while it matches the
+    JSON file it was built from; stale or unreadable artifacts fall back to
+    JSON. :meth:`load` always returns the JSON document.
+    """
 
     def __init__(self, base_path: Path = SCRIPTS_PATH) -> None:
         self._base_path = base_path
 
+    def _path(self, script_id: str) -> Path:
+        return self._base_path / f"{script_id}.json"
+
+    def _artifact_path(self, script_id: str) -> Path:
+        return self._base_path / f"{script_id}{ARTIFACT_SUFFIX}"
+
     def load(self, script_id: str) -> Dict[str, object]:
-        path = self._base_path / f"{script_id}.json"
+        path = self._path(script_id)
         if not path.exists():
             raise FileNotFoundError(f"Tutorial script '{script_id}' not found at {path}")
         with path.open("r", encoding="utf-8") as handle:
             return json.load(handle)
 
+    def load_script(self, script_id: str) -> TutorialScript:
+        compiled = read_artifact(self._artifact_path(script_id), self._path(script_id))
+        if compiled is not None:
+            try:
+                return build_script(compiled)
+            except (TypeError, ValueError):
+                pass
+        return parse_script(self.load(script_id))
+
+    def fingerprint(self, script_id: str) -> Optional[Tuple[Hashable, Hashable]]:
+        for path in (self._path(script_id), self._artifact_path(script_id)):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            return str(path), (stat.st_mtime_ns, stat.st_size)
+        raise FileNotFoundError(f"Tutorial script '{script_id}' not found at {self._path(script_id)}")
+
+    def script_ids(self) -> List[str]:
+        ids = {path.stem for path in self._base_path.glob("*.json")}
+        ids.update(path.stem for path in self._base_path.glob(f"*{ARTIFACT_SUFFIX}"))
+        return sorted(ids)
+
+
+class ScriptCache:
+    """Process-wide cache of compiled scripts shared by engine instances.
+
+    Entries are keyed by the loader's fingerprint source and revalidated
+    against its version (file mtime and size for the filesystem loader) on
+    every lookup, so an edited script is recompiled on its next load.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[Hashable, Tuple[Hashable, TutorialScript]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, loader: ScriptLoader, script_id: str) -> TutorialScript:
+        fingerprint = loader.fingerprint(script_id)
+        if fingerprint is None:
+            return loader.load_script(script_id)
+        source, version = fingerprint
+        entry = self._entries.get(source)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        script = loader.load_script(script_id)
+        with self._lock:
+            self._entries[source] = (version, script)
+        return script
+
+    def preload(self, loader: ScriptLoader) -> Dict[str, TutorialScript]:
+        """Compile every script ``loader`` knows about."""
+
+        return {script_id: self.get(loader, script_id) for script_id in loader.script_ids()}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+SCRIPT_CACHE = ScriptCache()
+
+
+def preload_scripts(
+    loader: Optional[ScriptLoader] = None,
+    cache: Optional[ScriptCache] = None,
+) -> Dict[str, TutorialScript]:
+    """Warm the shared script cache, typically once at process startup."""
+
+    return (cache if cache is not None else SCRIPT_CACHE).preload(loader or FileSystemScriptLoader())
+
 
 class DefaultHintStrategy:
-    """Deterministic hint selection using scripted branches."""
+    """Deterministic hint selection using scripted branches.
+
+    Branch conditions are matched as bitmasks: a branch applies when every
+    bit of its ``mask`` is set in the context mask. Contexts may carry a
+    precomputed ``flag_mask`` (see :func:`flag_mask`) to skip the per-call
+    translation of ``flags``.
+    """
 
     def __call__(self, step: TutorialStep, context: Optional[Dict[str, object]] = None) -> List[str]:
-        if not step.hints.default and not step.hints.branches:
+        hints = step.hints
+        if not hints.default and not hints.branches:
             return []
         context = context or {}
-        flags = set(context.get("flags", []))
-        for branch in step.hints.branches:
-            if set(branch.when).issubset(flags):
+        mask = context.get("flag_mask")
+        if mask is None:
+            mask = flag_mask(context.get("flags", ()))
+        for branch in hints.branches:
+            if branch.mask & mask == branch.mask:
                 return list(branch.hints)
-        return list(step.hints.default)
+        return list(hints.default)
+
+
+HintGenerator = Callable[[str, TutorialStep, Dict[str, object], List[str]], Optional[Iterable[str]]]
+HintStrategy = Callable[[TutorialStep, Optional[Dict[str, object]]], List[str]]
+
+
+def resolve_hints(
+    script_id: str,
+    step: TutorialStep,
+    context: Optional[Dict[str, object]],
+    strategy: HintStrategy,
+    generator: Optional[HintGenerator] = None,
+) -> List[str]:
+    """Return generated hints for ``step``, falling back to ``strategy``."""
+
+    fallback = list(strategy(step, context))
+    if generator is None:
+        return fallback
+    try:
+        generated = generator(script_id, step, context or {}, list(fallback))
+    except Exception:
+        return fallback
+    if not generated:
+        return fallback
+    return list(generated)
+
+
+# When set, both ``record_event`` implementations run as ``hook(func, *args)``
+# and return its result; the hook must call ``func(*args)`` exactly once.
+# server.profiling installs one while a profiler is enabled.
+_RECORD_HOOK: Optional[Callable[..., bool]] = None
+
+
+class _Progress:
+    """Position in a compiled script shared by the engine and session manager.
+
+    ``step`` is the current step index (``-1`` once finished) and
+    ``completed`` a bitmask of completed step indexes.
+    """
+
+    __slots__ = ("script", "step", "completed", "started_at", "step_started_at")
+
+    def __init__(self, script: TutorialScript, step: int, completed: int, now: float) -> None:
+        self.script = script
+        self.step = step
+        self.completed = completed
+        self.started_at = now
+        self.step_started_at = now
+
+    def advance(self, event: Union[str, int], analytics: TutorialAnalytics, clock: Callable[[], float]) -> bool:
+        """Complete the current step if ``event`` finishes it, emitting analytics."""
+
+        position = self.step
+        if position < 0 or self.completed >> position & 1:
+            return False
+        script = self.script
+        event_id = _EVENT_IDS.get(event, UNKNOWN_EVENT) if isinstance(event, str) else event
+        target = script.transitions[position].get(event_id)
+        if target is None:
+            return False
+        step = script.step_list[position]
+        now = clock()
+        self.completed |= 1 << position
+        analytics.track_step_completed(script.id, step.id, now - self.step_started_at)
+        self.step_started_at = now
+        self.step = target
+        if target >= 0:
+            analytics.track_step_engaged(script.id, script.step_list[target].id)
+        else:
+            analytics.track_tutorial_completed(script.id, bin(self.completed).count("1"), now - self.started_at)
+        return True
 
 
 class TutorialEngine:
@@ -94,21 +450,22 @@ class TutorialEngine:
         self,
         script_loader: Optional[ScriptLoader] = None,
         *,
-        hint_generator: Optional[
-            Callable[[str, TutorialStep, Dict[str, object], List[str]], Optional[Iterable[str]]]
-        ] = None,
+        hint_generator: Optional[HintGenerator] = None,
         analytics: Optional[TutorialAnalytics] = None,
-        fallback_hint_strategy: Optional[Callable[[TutorialStep, Optional[Dict[str, object]]], List[str]]] = None,
+        fallback_hint_strategy: Optional[HintStrategy] = None,
+        clock: Callable[[], float] = time.monotonic,
+        script_cache: Optional[ScriptCache] = None,
     ) -> None:
         self._loader = script_loader or FileSystemScriptLoader()
+        self._script_cache = script_cache if script_cache is not None else SCRIPT_CACHE
         self._hint_generator = hint_generator
         self._analytics = analytics or TutorialAnalytics()
         self._hint_strategy = fallback_hint_strategy or DefaultHintStrategy()
-        self._script: Optional[TutorialScript] = None
-        self._current_step_id: Optional[str] = None
+        self._progress: Optional[_Progress] = None
         self._completed_steps: List[str] = []
-        self._completed_lookup: set[str] = set()
         self._hints_enabled: bool = True
+        self._version: int = 0
+        self._clock = clock
 
     @property
     def analytics(self) -> TutorialAnalytics:
@@ -116,13 +473,14 @@ class TutorialEngine:
 
     @property
     def script(self) -> Optional[TutorialScript]:
-        return self._script
+        return self._progress.script if self._progress else None
 
     @property
     def current_step(self) -> Optional[TutorialStep]:
-        if not self._script or not self._current_step_id:
+        progress = self._progress
+        if progress is None or progress.step < 0:
             return None
-        return self._script.steps.get(self._current_step_id)
+        return progress.script.step_list[progress.step]
 
     @property
     def completed_steps(self) -> List[str]:
@@ -132,105 +490,92 @@ class TutorialEngine:
     def hints_enabled(self) -> bool:
         return self._hints_enabled
 
+    @property
+    def version(self) -> int:
+        """Counter bumped whenever the observable tutorial state changes."""
+
+        return self._version
+
     def set_hints_enabled(self, enabled: bool) -> None:
-        self._hints_enabled = bool(enabled)
+        enabled = bool(enabled)
+        if enabled != self._hints_enabled:
+            self._hints_enabled = enabled
+            self._version += 1
 
     def load(self, script_id: str) -> TutorialScript:
-        raw = self._loader.load(script_id)
-        script = self._parse_script(raw)
-        self._script = script
+        script = self._script_cache.get(self._loader, script_id)
+        self._progress = _Progress(script, 0 if script.step_list else -1, 0, self._clock())
         self._completed_steps = []
-        self._completed_lookup = set()
-        self._current_step_id = script.order[0] if script.order else None
+        self._version += 1
         self._analytics.track_tutorial_start(script.id)
-        if self._current_step_id:
-            self._analytics.track_step_engaged(script.id, self._current_step_id)
+        if script.step_list:
+            self._analytics.track_step_engaged(script.id, script.step_list[0].id)
         return script
 
-    def _parse_script(self, raw: Dict[str, object]) -> TutorialScript:
-        steps: Dict[str, TutorialStep] = {}
-        order: List[str] = []
-        for entry in raw.get("steps", []):
-            step = self._parse_step(entry)
-            steps[step.id] = step
-            order.append(step.id)
-        return TutorialScript(
-            id=raw.get("id", ""),
-            title=raw.get("title", ""),
-            description=raw.get("description", ""),
-            steps=steps,
-            order=order,
-            completion=raw.get("completion", {}),
-        )
+    def is_completed(self) -> bool:
+        return self._progress is not None and self._progress.step < 0
 
-    def _parse_step(self, raw: Dict[str, object]) -> TutorialStep:
-        hints_raw = raw.get("hints", {})
-        branches = [
-            HintBranch(
-                when=list(branch.get("when", [])),
-                hints=list(branch.get("hints", [])),
-            )
-            for branch in hints_raw.get("branches", [])
-        ]
-        hints = StepHints(
-            default=list(hints_raw.get("default", [])),
-            branches=branches,
-        )
-        return TutorialStep(
-            id=raw.get("id", ""),
-            text=raw.get("text", ""),
-            objectives=list(raw.get("objectives", [])),
-            complete_events=list(raw.get("completeEvents", [])),
-            next_step=raw.get("next"),
-            hints=hints,
-        )
+    def record_event(self, event: Union[str, int], context: Optional[Dict[str, object]] = None) -> bool:
+        """Advance the tutorial if ``event`` completes the current step.
 
-    def is_completed(self) -> bool:
-        return bool(self._script) and self._current_step_id is None
+        ``event`` may be a name or an id from :func:`intern_event` /
+        :func:`intern_events`; routing is a single dict lookup either way.
+        """
 
-    def record_event(self, event: str, context: Optional[Dict[str, object]] = None) -> bool:
-        step = self.current_step
-        if not self._script or not step or step.id in self._completed_lookup:
+        hook = _RECORD_HOOK
+        if hook is not None:
+            return hook(self._record_event, event)
+        return self._record_event(event)
+
+    def _record_event(self, event: Union[str, int]) -> bool:
+        progress = self._progress
+        if progress is None:
             return False
-        if event not in step.complete_events:
+        position = progress.step
+        if not progress.advance(event, self._analytics, self._clock):
             return False
-        self._completed_lookup.add(step.id)
-        self._completed_steps.append(step.id)
-        self._analytics.track_step_completed(self._script.id, step.id)
-        if step.next_step:
-            self._current_step_id = step.next_step
-            self._analytics.track_step_engaged(self._script.id, step.next_step)
-        else:
-            self._current_step_id = None
-            self._analytics.track_tutorial_completed(self._script.id, len(self._completed_steps))
+        self._completed_steps.append(progress.script.step_list[position].id)
+        self._version += 1
         return True
 
+    def record_events(
+        self,
+        events: Iterable[Union[str, int]],
+        context: Optional[Dict[str, object]] = None,
+    ) -> int:
+        """Feed a burst of events through :meth:`record_event`.
+
+        Returns how many steps were completed. Events after the tutorial
+        finishes are ignored.
+        """
+
+        completed = 0
+        record = self.record_event
+        for event in events:
+            if self.is_completed():
+                break
+            if record(event, context):
+                completed += 1
+        return completed
+
     def get_hints(self, context: Optional[Dict[str, object]] = None) -> List[str]:
         if not self._hints_enabled:
             return []
         step = self.current_step
         if not step:
             return []
-        fallback = list(self._hint_strategy(step, context))
-        if self._hint_generator is None:
-            return fallback
-        try:
-            generated = self._hint_generator(
-                self._script.id if self._script else "",
-                step,
-                context or {},
-                list(fallback),
-            )
-        except Exception:
-            return fallback
-        if not generated:
-            return fallback
-        return list(generated)
+        return resolve_hints(
+            self._progress.script.id,
+            step,
+            context,
+            self._hint_strategy,
+            self._hint_generator,
+        )
 
     def snapshot(self) -> Dict[str, object]:
         step = self.current_step
         return {
-            "tutorial": self._script.id if self._script else None,
+            "tutorial": self._progress.script.id if self._progress else None,
             "step": step.id if step else None,
             "objectives": list(step.objectives) if step else [],
             "completed": list(self._completed_steps),
@@ -238,6 +583,44 @@ class TutorialEngine:
             "hintsEnabled": self._hints_enabled,
         }
 
+    def restore(self, snapshot: Dict[str, object]) -> Optional[TutorialScript]:
+        """Resume from a :meth:`snapshot`, e.g. one read back from a session store.
+
+        No analytics are emitted; step timers restart from now. Snapshots that
+        no longer fit the current script raise ``ValueError``.
+        """
+
+        tutorial_id = snapshot.get("tutorial")
+        if tutorial_id is None:
+            self._progress = None
+            self._completed_steps = []
+        else:
+            script = self._script_cache.get(self._loader, tutorial_id)
+            position, mask = _position_from_snapshot(script, snapshot)
+            self._progress = _Progress(script, position, mask, self._clock())
+            self._completed_steps = list(snapshot.get("completed", []))
+        self._hints_enabled = bool(snapshot.get("hintsEnabled", True))
+        self._version += 1
+        return self.script
+
+
+def _position_from_snapshot(script: TutorialScript, snapshot: Dict[str, object]) -> Tuple[int, int]:
+    """Return the ``(step index, completed mask)`` described by ``snapshot``."""
+
+    mask = 0
+    for step_id in snapshot.get("completed", []):
+        index = script.step_index.get(step_id)
+        if index is None:
+            raise ValueError(f"Tutorial '{script.id}' has no step {step_id!r}")
+        mask |= 1 << index
+    step_id = snapshot.get("step")
+    if step_id is None:
+        return -1, mask
+    index = script.step_index.get(step_id)
+    if index is None:
+        raise ValueError(f"Tutorial '{script.id}' has no step {step_id!r}")
+    return index, mask
+
 
 __all__ = [
     "TutorialEngine",
@@ -245,4 +628,15 @@ __all__ = [
     "TutorialStep",
     "ScriptLoader",
     "FileSystemScriptLoader",
+    "ScriptCache",
+    "SCRIPT_CACHE",
+    "build_script",
+    "compile_script",
+    "intern_event",
+    "intern_events",
+    "flag_mask",
+    "flags_key",
+    "lookup_event",
+    "parse_script",
+    "preload_scripts",
 ]
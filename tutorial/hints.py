@@ -0,0 +1,169 @@
+"""Caching and deadline enforcement for tutorial hint generators."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, FrozenSet, Hashable, List, Optional, Tuple, Union
+
+from .engine import HintGenerator, TutorialStep, flags_key
+
+_CacheKey = Tuple[str, str, Union[FrozenSet[str], int]]
+
+
+class CachedHintGenerator:
+    """Wraps a ``hint_generator`` with an LRU+TTL cache and an optional deadline.
+
+    Instances are drop-in ``hint_generator`` callables for
+    :class:`~tutorial.engine.TutorialEngine` and
+    :class:`~tutorial.sessions.TutorialSessionManager`. Results are cached
+    per ``(script id, step id, flag set)``.
+
+    With ``deadline`` set, the wrapped generator runs on a worker pool. If it
+    has not answered within ``deadline`` seconds the call returns ``None``,
+    so the engine serves its fallback hints at once. The late result still
+    lands in the cache for the next call. Concurrent misses for the same key
+    share a single in-flight call.
+    """
+
+    def __init__(
+        self,
+        generator: HintGenerator,
+        *,
+        maxsize: int = 1024,
+        ttl: float = 300.0,
+        deadline: Optional[float] = None,
+        max_workers: int = 4,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._generator = generator
+        self._maxsize = max(int(maxsize), 1)
+        self._ttl = float(ttl)
+        self._deadline = deadline
+        self._max_workers = max(int(max_workers), 1)
+        self._clock = clock
+        self._entries: "OrderedDict[_CacheKey, Tuple[float, Tuple[str, ...]]]" = OrderedDict()
+        self._inflight: Dict[_CacheKey, Future] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stats = {"hits": 0, "misses": 0, "timeouts": 0, "errors": 0}
+
+    def __call__(
+        self,
+        script_id: str,
+        step: TutorialStep,
+        context: Dict[str, object],
+        fallback: List[str],
+    ) -> Optional[List[str]]:
+        key = (script_id, step.id, flags_key(context))
+        with self._lock:
+            cached = self._lookup_unlocked(key)
+            if cached is not None:
+                self._stats["hits"] += 1
+                return list(cached)
+            self._stats["misses"] += 1
+        if self._deadline is None:
+            try:
+                generated = self._generator(script_id, step, context, fallback)
+            except Exception:
+                with self._lock:
+                    self._stats["errors"] += 1
+                raise
+            hints = tuple(generated or ())
+            with self._lock:
+                self._store_unlocked(key, hints)
+            return list(hints) or None
+        future = self._submit(key, script_id, step, context, fallback)
+        try:
+            hints = future.result(timeout=self._deadline)
+        except FutureTimeoutError:
+            with self._lock:
+                self._stats["timeouts"] += 1
+            return None
+        return list(hints) or None
+
+    def _lookup_unlocked(self, key: _CacheKey) -> Optional[Tuple[str, ...]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, hints = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return hints
+
+    def _store_unlocked(self, key: _CacheKey, hints: Tuple[str, ...]) -> None:
+        self._entries[key] = (self._clock() + self._ttl, hints)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def _submit(
+        self,
+        key: _CacheKey,
+        script_id: str,
+        step: TutorialStep,
+        context: Dict[str, object],
+        fallback: List[str],
+    ) -> Future:
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix="tutorial-hints",
+                )
+            future = self._executor.submit(self._generate, script_id, step, dict(context), list(fallback))
+            self._inflight[key] = future
+        future.add_done_callback(lambda done: self._complete(key, done))
+        return future
+
+    def _generate(
+        self,
+        script_id: str,
+        step: TutorialStep,
+        context: Dict[str, object],
+        fallback: List[str],
+    ) -> Tuple[str, ...]:
+        return tuple(self._generator(script_id, step, context, fallback) or ())
+
+    def _complete(self, key: _CacheKey, future: Future) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+            if future.cancelled() or future.exception() is not None:
+                self._stats["errors"] += 1
+                return
+            self._store_unlocked(key, future.result())
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit, miss, timeout and error counters plus the cache size."""
+
+        with self._lock:
+            return {**self._stats, "size": len(self._entries), "inflight": len(self._inflight)}
+
+    def invalidate(self, script_id: Optional[Hashable] = None) -> None:
+        """Drop cached hints for ``script_id``, or everything when omitted."""
+
+        with self._lock:
+            if script_id is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key[0] == script_id]:
+                del self._entries[key]
+
+    def close(self, wait: bool = False) -> None:
+        """Shut down the worker pool, if one was started."""
+
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+__all__ = ["CachedHintGenerator"]
@@ -0,0 +1,276 @@
+"""Multi-session tutorial management with compact per-player state."""
+
+from __future__ import annotations
+
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from analytics import TutorialAnalytics
+
+from . import engine
+from .engine import (
+    SCRIPT_CACHE,
+    DefaultHintStrategy,
+    FileSystemScriptLoader,
+    HintGenerator,
+    HintStrategy,
+    ScriptCache,
+    ScriptLoader,
+    TutorialScript,
+    TutorialStep,
+    _position_from_snapshot,
+    _Progress,
+    resolve_hints,
+)
+from .store import SessionId, SessionStore
+
+_DUMP_VERSION = 2
+
+
+class _Session(_Progress):
+    """Per-player progress plus the hint toggle."""
+
+    __slots__ = ("hints_enabled",)
+
+    def __init__(self, script: TutorialScript, step: int, completed: int, hints_enabled: bool, now: float) -> None:
+        super().__init__(script, step, completed, now)
+        self.hints_enabled = hints_enabled
+
+
+class TutorialSessionManager:
+    """Serves many concurrent tutorial sessions from shared compiled scripts.
+
+    Each session only stores a step index (``-1`` once finished), a bitmask
+    of completed steps and the hint toggle. Operations mirror
+    :class:`~tutorial.engine.TutorialEngine` but are keyed by session id.
+    Completed steps are reported in script order.
+
+    With a ``session_store``, every state change is saved as a snapshot and
+    :meth:`resume` picks a session back up on any worker sharing the store.
+    """
+
+    def __init__(
+        self,
+        script_loader: Optional[ScriptLoader] = None,
+        *,
+        hint_generator: Optional[HintGenerator] = None,
+        analytics: Optional[TutorialAnalytics] = None,
+        fallback_hint_strategy: Optional[HintStrategy] = None,
+        clock: Callable[[], float] = time.monotonic,
+        script_cache: Optional[ScriptCache] = None,
+        session_store: Optional[SessionStore] = None,
+    ) -> None:
+        self._loader = script_loader or FileSystemScriptLoader()
+        self._script_cache = script_cache if script_cache is not None else SCRIPT_CACHE
+        self._hint_generator = hint_generator
+        self._analytics = analytics or TutorialAnalytics()
+        self._hint_strategy = fallback_hint_strategy or DefaultHintStrategy()
+        self._clock = clock
+        self._sessions: Dict[SessionId, _Session] = {}
+        self._store = session_store
+
+    @property
+    def analytics(self) -> TutorialAnalytics:
+        return self._analytics
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: SessionId) -> bool:
+        return session_id in self._sessions
+
+    def __iter__(self) -> Iterator[SessionId]:
+        return iter(list(self._sessions))
+
+    def _session(self, session_id: SessionId) -> _Session:
+        try:
+            return self._sessions[session_id]
+        except KeyError:
+            raise KeyError(f"Unknown tutorial session {session_id!r}") from None
+
+    def start(self, session_id: SessionId, tutorial_id: str) -> Dict[str, object]:
+        """Begin (or restart) ``tutorial_id`` for ``session_id``."""
+
+        script = self._script_cache.get(self._loader, tutorial_id)
+        first = 0 if script.step_list else -1
+        session = _Session(script, first, 0, True, self._clock())
+        self._sessions[session_id] = session
+        self._analytics.track_tutorial_start(script.id)
+        if first >= 0:
+            self._analytics.track_step_engaged(script.id, script.step_list[first].id)
+        return self._save(session_id, session)
+
+    def resume(self, session_id: SessionId) -> Optional[Dict[str, object]]:
+        """Load ``session_id`` from the session store if it is not live yet.
+
+        Returns the session snapshot, or ``None`` when the store has no record.
+        """
+
+        session = self._sessions.get(session_id)
+        if session is not None:
+            return self._snapshot(session)
+        snapshot = self._store.load(session_id) if self._store is not None else None
+        if snapshot is None:
+            return None
+        script = self._script_cache.get(self._loader, snapshot["tutorial"])
+        step, completed = _position_from_snapshot(script, snapshot)
+        session = _Session(script, step, completed, bool(snapshot.get("hintsEnabled", True)), self._clock())
+        self._sessions[session_id] = session
+        return self._snapshot(session)
+
+    def end(self, session_id: SessionId) -> None:
+        """Forget ``session_id``; unknown ids are ignored."""
+
+        self._sessions.pop(session_id, None)
+        if self._store is not None:
+            self._store.delete(session_id)
+
+    def current_step(self, session_id: SessionId) -> Optional[TutorialStep]:
+        session = self._session(session_id)
+        return session.script.step_list[session.step] if session.step >= 0 else None
+
+    def is_completed(self, session_id: SessionId) -> bool:
+        return self._session(session_id).step < 0
+
+    def set_hints_enabled(self, session_id: SessionId, enabled: bool) -> None:
+        session = self._session(session_id)
+        session.hints_enabled = bool(enabled)
+        self._analytics.track_hint_visibility(session.script.id, session.hints_enabled)
+        self._save(session_id, session)
+
+    def record_event(self, session_id: SessionId, event: Union[str, int]) -> bool:
+        hook = engine._RECORD_HOOK
+        if hook is not None:
+            return hook(self._record_event, session_id, event)
+        return self._record_event(session_id, event)
+
+    def _record_event(self, session_id: SessionId, event: Union[str, int]) -> bool:
+        session = self._session(session_id)
+        if not session.advance(event, self._analytics, self._clock):
+            return False
+        self._save(session_id, session)
+        return True
+
+    def record_events(self, pairs: Iterable[Tuple[SessionId, Union[str, int]]]) -> Dict[SessionId, int]:
+        """Process ``(session_id, event)`` pairs in one call.
+
+        Returns the number of completed steps per session that advanced.
+        Unknown session ids raise ``KeyError``; pairs before it stay applied.
+        """
+
+        advanced: Dict[SessionId, int] = {}
+        record = self.record_event
+        for session_id, event in pairs:
+            if record(session_id, event):
+                advanced[session_id] = advanced.get(session_id, 0) + 1
+        return advanced
+
+    def get_hints(self, session_id: SessionId, context: Optional[Dict[str, object]] = None) -> List[str]:
+        session = self._session(session_id)
+        if not session.hints_enabled or session.step < 0:
+            return []
+        return resolve_hints(
+            session.script.id,
+            session.script.step_list[session.step],
+            context,
+            self._hint_strategy,
+            self._hint_generator,
+        )
+
+    def snapshot(self, session_id: SessionId) -> Dict[str, object]:
+        """Return the same shape as :meth:`TutorialEngine.snapshot`."""
+
+        return self._snapshot(self._session(session_id))
+
+    def _save(self, session_id: SessionId, session: _Session) -> Dict[str, object]:
+        snapshot = self._snapshot(session)
+        if self._store is not None:
+            self._store.save(session_id, snapshot)
+        return snapshot
+
+    def _snapshot(self, session: _Session) -> Dict[str, object]:
+        steps = session.script.step_list
+        step = steps[session.step] if session.step >= 0 else None
+        return {
+            "tutorial": session.script.id,
+            "step": step.id if step else None,
+            "objectives": list(step.objectives) if step else [],
+            "completed": [steps[i].id for i in range(len(steps)) if session.completed >> i & 1],
+            "isCompleted": step is None,
+            "hintsEnabled": session.hints_enabled,
+        }
+
+    def dump(self) -> Dict[str, object]:
+        """Serialize every session into a JSON-compatible document.
+
+        Sessions are stored as ``[session_id, tutorial, step_index,
+        completed_mask, hints_enabled]`` rows so large populations stay small.
+        ``steps`` records each tutorial's step ids once, so :meth:`restore`
+        can map indexes and bits onto an edited script by step id. Tuple
+        session ids come back as tuples.
+        """
+
+        steps: Dict[str, List[str]] = {}
+        rows = []
+        for session_id, session in self._sessions.items():
+            script = session.script
+            if script.id not in steps:
+                steps[script.id] = [step.id for step in script.step_list]
+            rows.append([session_id, script.id, session.step, session.completed, session.hints_enabled])
+        return {"version": _DUMP_VERSION, "steps": steps, "sessions": rows}
+
+    def restore(self, data: Dict[str, object]) -> int:
+        """Load sessions produced by :meth:`dump`, returning how many were restored.
+
+        Restored sessions replace live sessions with the same id. Rows that
+        refer to a step the current script no longer has are rejected.
+        """
+
+        if data.get("version") != _DUMP_VERSION:
+            raise ValueError(f"Unsupported tutorial session dump version: {data.get('version')!r}")
+        dumped_steps: Dict[str, List[str]] = data.get("steps", {})
+        remaps: Dict[str, Tuple[TutorialScript, List[Optional[int]]]] = {}
+        now = self._clock()
+        restored: Dict[SessionId, _Session] = {}
+        for session_id, tutorial_id, step, completed, hints_enabled in data.get("sessions", []):
+            session_id = _session_key(session_id)
+            remap = remaps.get(tutorial_id)
+            if remap is None:
+                script = self._script_cache.get(self._loader, tutorial_id)
+                indexes = [script.step_index.get(step_id) for step_id in dumped_steps.get(tutorial_id, [])]
+                remap = remaps[tutorial_id] = (script, indexes)
+            script, indexes = remap
+            position = _remap_step(indexes, step)
+            mask = 0
+            for index in range(completed.bit_length()):
+                if completed >> index & 1:
+                    target = _remap_step(indexes, index)
+                    if target is None or target < 0:
+                        position = None
+                        break
+                    mask |= 1 << target
+            if position is None:
+                raise ValueError(f"Session {session_id!r} does not match tutorial '{tutorial_id}'")
+            restored[session_id] = _Session(script, position, mask, bool(hints_enabled), now)
+        self._sessions.update(restored)
+        return len(restored)
+
+
+def _remap_step(indexes: List[Optional[int]], index: int) -> Optional[int]:
+    """Map a dumped step index onto the current script; ``-1`` stays finished."""
+
+    if index == -1:
+        return -1
+    if not 0 <= index < len(indexes):
+        return None
+    return indexes[index]
+
+
+def _session_key(value: object) -> SessionId:
+    # JSON turns tuples into lists; lists cannot be session ids, so convert back.
+    if isinstance(value, list):
+        return tuple(_session_key(item) for item in value)
+    return value
+
+
+__all__ = ["TutorialSessionManager"]
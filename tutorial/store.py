@@ -0,0 +1,197 @@
+"""Pluggable persistence for tutorial session snapshots."""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Hashable, Optional
+
+from analytics.timers import start_flush_timer, stop_flush_timer
+
+SessionId = Hashable
+
+
+class SessionStore:
+    """Abstract store mapping session ids to :meth:`TutorialEngine.snapshot` dicts."""
+
+    def load(self, session_id: SessionId) -> Optional[Dict[str, object]]:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    def save(self, session_id: SessionId, snapshot: Dict[str, object]) -> None:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    def delete(self, session_id: SessionId) -> None:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        """Persist buffered writes; a no-op for unbuffered stores."""
+
+    def close(self) -> None:
+        self.flush()
+
+
+class MemorySessionStore(SessionStore):
+    """Keeps snapshots in a dict; useful for tests and single-process setups."""
+
+    def __init__(self) -> None:
+        self._snapshots: Dict[SessionId, Dict[str, object]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    def load(self, session_id: SessionId) -> Optional[Dict[str, object]]:
+        with self._lock:
+            snapshot = self._snapshots.get(session_id)
+        return dict(snapshot) if snapshot is not None else None
+
+    def save(self, session_id: SessionId, snapshot: Dict[str, object]) -> None:
+        with self._lock:
+            self._snapshots[session_id] = dict(snapshot)
+
+    def delete(self, session_id: SessionId) -> None:
+        with self._lock:
+            self._snapshots.pop(session_id, None)
+
+
+class SQLiteSessionStore(SessionStore):
+    """Write-behind SQLite store for tutorial snapshots.
+
+    :meth:`save` only updates an in-memory pending map, so repeated saves for
+    one session between flushes coalesce into a single row write. Pending
+    writes are committed in one transaction once ``batch_size`` sessions are
+    dirty or the oldest pending write is older than ``flush_interval``
+    seconds. Unless ``autoflush`` is false, a daemon thread applies that
+    deadline while no writes arrive, and open stores are closed at
+    interpreter exit. :meth:`load` sees pending writes before they reach
+    disk; writes still pending are lost if the process is killed.
+
+    Session ids are keyed by their JSON encoding, so ids made of strings,
+    numbers and tuples of them all work.
+    """
+
+    def __init__(
+        self,
+        path: os.PathLike[str] | str,
+        *,
+        batch_size: int = 256,
+        flush_interval: float = 1.0,
+        autoflush: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._path = os.fspath(path)
+        self._batch_size = max(int(batch_size), 1)
+        self._flush_interval = max(float(flush_interval), 0.0)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Optional[str]] = {}
+        self._pending_since: float = 0.0
+        self._connection: Optional[sqlite3.Connection] = sqlite3.connect(self._path, check_same_thread=False)
+        with self._connection:
+            if self._path != ":memory:":
+                self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS tutorial_sessions ("
+                "session_id TEXT PRIMARY KEY, snapshot TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+        self._stop: Optional[threading.Event] = None
+        if autoflush:
+            self._start_timer()
+
+    @property
+    def pending(self) -> int:
+        """Number of sessions with writes not yet committed."""
+
+        with self._lock:
+            return len(self._pending)
+
+    def load(self, session_id: SessionId) -> Optional[Dict[str, object]]:
+        key = _encode_id(session_id)
+        with self._lock:
+            if key in self._pending:
+                encoded = self._pending[key]
+            else:
+                row = self._connected().execute(
+                    "SELECT snapshot FROM tutorial_sessions WHERE session_id = ?", (key,)
+                ).fetchone()
+                encoded = row[0] if row else None
+        return json.loads(encoded) if encoded is not None else None
+
+    def save(self, session_id: SessionId, snapshot: Dict[str, object]) -> None:
+        self._stage(session_id, json.dumps(snapshot, ensure_ascii=False, separators=(",", ":")))
+
+    def delete(self, session_id: SessionId) -> None:
+        self._stage(session_id, None)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_unlocked()
+
+    def close(self) -> None:
+        if self._stop is not None:
+            stop_flush_timer(self, self._stop)
+            self._stop = None
+        with self._lock:
+            if self._connection is None:
+                return
+            self._flush_unlocked()
+            self._connection.close()
+            self._connection = None
+
+    def _start_timer(self) -> None:
+        self._stop = start_flush_timer(
+            self,
+            SQLiteSessionStore._tick,
+            self._flush_interval,
+            name="tutorial-session-flush",
+            retry=(sqlite3.Error, ValueError),
+        )
+
+    def _tick(self) -> None:
+        with self._lock:
+            if self._pending and self._clock() - self._pending_since >= self._flush_interval:
+                self._flush_unlocked()
+
+    def _connected(self) -> sqlite3.Connection:
+        if self._connection is None:
+            raise ValueError("Session store is closed")
+        return self._connection
+
+    def _stage(self, session_id: SessionId, encoded: Optional[str]) -> None:
+        key = _encode_id(session_id)
+        now = self._clock()
+        with self._lock:
+            self._connected()
+            if not self._pending:
+                self._pending_since = now
+            self._pending[key] = encoded
+            if len(self._pending) >= self._batch_size or now - self._pending_since >= self._flush_interval:
+                self._flush_unlocked()
+
+    def _flush_unlocked(self) -> None:
+        if not self._pending:
+            return
+        now = time.time()
+        upserts = [(key, encoded, now) for key, encoded in self._pending.items() if encoded is not None]
+        deletes = [(key,) for key, encoded in self._pending.items() if encoded is None]
+        with self._connected() as connection:
+            if upserts:
+                connection.executemany(
+                    "INSERT INTO tutorial_sessions (session_id, snapshot, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(session_id) DO UPDATE SET snapshot = excluded.snapshot, "
+                    "updated_at = excluded.updated_at",
+                    upserts,
+                )
+            if deletes:
+                connection.executemany("DELETE FROM tutorial_sessions WHERE session_id = ?", deletes)
+        self._pending.clear()
+
+
+def _encode_id(session_id: SessionId) -> str:
+    return json.dumps(session_id, ensure_ascii=False, separators=(",", ":"))
+
+
+__all__ = ["MemorySessionStore", "SQLiteSessionStore", "SessionStore"]
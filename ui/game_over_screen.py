@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+import inspect
 from dataclasses import dataclass, field
 from typing import Iterable, List, Optional
 
@@ -23,6 +25,7 @@ class GameOverScreen:
         self.allow_share: bool = leaderboard_settings.get("enableSharing", True)
         self.allow_handle: bool = leaderboard_settings.get("collectUserHandle", True)
         self.top_scores: List[LeaderboardEntry] = []
+        self.rank: Optional[int] = None
         self.error: Optional[str] = None
         self.share_prompt: Optional[str] = None
 
@@ -47,20 +50,134 @@ class GameOverScreen:
     def refresh(self, limit: int = 5) -> List[LeaderboardEntry]:
         return self.load(limit)
 
-    def submit(self, score: int, *, handle: Optional[str] = None, share: bool = False) -> None:
+    def submit(self, score: int, *, handle: Optional[str] = None, share: bool = False, limit: int = 5) -> None:
+        """Submit ``score`` and update ``top_scores`` and ``rank``.
+
+        Clients exposing ``submit_score_and_rank`` answer in a single round
+        trip; older clients fall back to ``submit_score`` plus :meth:`refresh`.
+        """
         final_handle = handle if self.allow_handle else None
         final_share = share if self.allow_share else False
-        result = self.client.submit_score(
-            self.game_id,
-            score,
-            handle=final_handle,
-            share=final_share,
-        )
+        submit_and_rank = getattr(self.client, "submit_score_and_rank", None)
+        if submit_and_rank is not None:
+            response = submit_and_rank(
+                self.game_id,
+                score,
+                handle=final_handle,
+                share=final_share,
+                limit=limit,
+            )
+            result = response.get("submitted", {})
+            self.top_scores = [self._build_entry(entry) for entry in response.get("scores", [])]
+            self.rank = response.get("rank")
+            self.error = None
+        else:
+            result = self.client.submit_score(
+                self.game_id,
+                score,
+                handle=final_handle,
+                share=final_share,
+            )
+            self.rank = None
+            self.refresh(limit)
+        self._update_share_prompt(result)
+
+    def _update_share_prompt(self, result: dict) -> None:
         if result.get("shared"):
             self.share_prompt = "Share your score with friends!"
         else:
             self.share_prompt = None
-        self.refresh()
+
+    async def _call_client(self, name: str, *args, timeout: Optional[float] = None, **kwargs):
+        method = getattr(self.client, name)
+        if inspect.iscoroutinefunction(method):
+            call = method(*args, **kwargs)
+        else:
+            call = asyncio.to_thread(method, *args, **kwargs)
+        return await asyncio.wait_for(call, timeout)
+
+    def _fall_back(self, exc: BaseException, limit: int) -> None:
+        self.error = str(exc) or "Leaderboard request timed out"
+        if self.top_scores:
+            return
+        last_known = getattr(self.client, "last_known", None)
+        raw_entries = last_known(self.game_id, limit) if last_known else None
+        self.top_scores = [self._build_entry(entry) for entry in raw_entries or []]
+
+    async def load_async(self, limit: int = 5, *, timeout: Optional[float] = None) -> List[LeaderboardEntry]:
+        """Non-blocking :meth:`load` with an optional deadline in seconds.
+
+        Unlike :meth:`load`, a failure or timeout keeps the last-known scores
+        (from this screen or the client's ``last_known``) and sets ``error``.
+        """
+        try:
+            raw_entries = await self._call_client("get_top_scores", self.game_id, limit=limit, timeout=timeout)
+        except Exception as exc:
+            self._fall_back(exc, limit)
+            return self.top_scores
+        self.top_scores = [self._build_entry(entry) for entry in raw_entries]
+        self.error = None
+        return self.top_scores
+
+    async def submit_async(
+        self,
+        score: int,
+        *,
+        handle: Optional[str] = None,
+        share: bool = False,
+        limit: int = 5,
+        timeout: Optional[float] = None,
+    ) -> Optional[dict]:
+        """Non-blocking :meth:`submit`; returns the stored entry or ``None`` on failure.
+
+        Without ``submit_score_and_rank`` on the client, the submission and
+        the leaderboard fetch run concurrently and the new score is merged
+        into the fetched list locally; ``rank`` is then only known within the
+        top ``limit``. Failures set ``error`` instead of raising.
+        """
+        final_handle = handle if self.allow_handle else None
+        final_share = share if self.allow_share else False
+        kwargs = {"handle": final_handle, "share": final_share, "timeout": timeout}
+        if hasattr(self.client, "submit_score_and_rank"):
+            try:
+                response = await self._call_client("submit_score_and_rank", self.game_id, score, limit=limit, **kwargs)
+            except Exception as exc:
+                self._fall_back(exc, limit)
+                return None
+            result = response.get("submitted", {})
+            self.top_scores = [self._build_entry(entry) for entry in response.get("scores", [])]
+            self.rank = response.get("rank")
+            self.error = None
+            self._update_share_prompt(result)
+            return result
+
+        submitted, fetched = await asyncio.gather(
+            self._call_client("submit_score", self.game_id, score, **kwargs),
+            self._call_client("get_top_scores", self.game_id, limit=limit, timeout=timeout),
+            return_exceptions=True,
+        )
+        if isinstance(submitted, BaseException):
+            if not isinstance(fetched, BaseException):
+                # Still show the fresh list even though the score was not saved.
+                self.top_scores = [self._build_entry(entry) for entry in fetched]
+            self._fall_back(submitted, limit)
+            self.rank = None
+            return None
+        self._update_share_prompt(submitted)
+        if isinstance(fetched, BaseException):
+            self._fall_back(fetched, limit)
+            self.rank = None
+            return submitted
+        raw_entries = list(fetched)
+        # The fetch may have been served before the write landed.
+        if submitted not in raw_entries:
+            raw_entries.append(submitted)
+            raw_entries.sort(key=lambda item: item.get("score", 0), reverse=True)
+        raw_entries = raw_entries[:limit]
+        self.top_scores = [self._build_entry(entry) for entry in raw_entries]
+        self.rank = raw_entries.index(submitted) + 1 if submitted in raw_entries else None
+        self.error = None
+        return submitted
 
     def dismiss_share_prompt(self) -> None:
         self.share_prompt = None
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Tuple
+
+_CacheKey = Tuple[str, int]
+
+
+class CachingLeaderboardClient:
+    """Wraps a leaderboard client with a shared TTL cache for top scores.
+
+    Pass one instance as the ``client`` of every :class:`GameOverScreen`
+    showing the same games. ``get_top_scores`` results are cached per
+    ``(game_id, limit)`` for ``ttl`` seconds, and concurrent identical
+    requests share a single call to the wrapped client. Submitting through
+    the wrapper drops the cached scores for that game. If the wrapped client
+    offers ``submit_score_and_rank``, the wrapper offers it too and caches
+    the scores it returns.
+    """
+
+    def __init__(
+        self,
+        client,
+        *,
+        ttl: float = 5.0,
+        maxsize: int = 256,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.client = client
+        self._ttl = float(ttl)
+        self._maxsize = max(int(maxsize), 1)
+        self._clock = clock
+        self._entries: "OrderedDict[_CacheKey, Tuple[float, List[dict]]]" = OrderedDict()
+        self._inflight: Dict[_CacheKey, Future] = {}
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "coalesced": 0}
+        if hasattr(client, "submit_score_and_rank"):
+            self.submit_score_and_rank = self._submit_score_and_rank
+
+    def get_top_scores(self, game_id: str, limit: int = 5) -> List[dict]:
+        key = (game_id, limit)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self._clock():
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return list(entry[1])
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+                generation = self._generations.get(game_id, 0)
+                self._stats["misses"] += 1
+            else:
+                self._stats["coalesced"] += 1
+        if not leader:
+            return list(future.result())
+
+        try:
+            scores = list(self.client.get_top_scores(game_id, limit=limit))
+        except BaseException as exc:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(exc)
+            raise
+        with self._lock:
+            self._inflight.pop(key, None)
+            # A submit while the fetch was running makes its result stale.
+            if self._generations.get(game_id, 0) == generation:
+                self._store_unlocked(key, scores)
+        future.set_result(scores)
+        return list(scores)
+
+    def submit_score(self, game_id: str, score: int, **kwargs) -> dict:
+        try:
+            return self.client.submit_score(game_id, score, **kwargs)
+        finally:
+            self.invalidate(game_id)
+
+    def _submit_score_and_rank(self, game_id: str, score: int, *, limit: int = 5, **kwargs) -> dict:
+        try:
+            response = self.client.submit_score_and_rank(game_id, score, limit=limit, **kwargs)
+        finally:
+            self.invalidate(game_id)
+        scores = response.get("scores")
+        if scores is not None:
+            with self._lock:
+                self._store_unlocked((game_id, limit), list(scores))
+        return response
+
+    def _store_unlocked(self, key: _CacheKey, scores: List[dict]) -> None:
+        self._entries[key] = (self._clock() + self._ttl, scores)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, game_id: Optional[str] = None) -> None:
+        """Drop cached scores for ``game_id``, or for every game when omitted."""
+
+        with self._lock:
+            if game_id is None:
+                self._entries.clear()
+                for known in {key[0] for key in self._inflight} | set(self._generations):
+                    self._generations[known] = self._generations.get(known, 0) + 1
+                return
+            self._generations[game_id] = self._generations.get(game_id, 0) + 1
+            for key in [key for key in self._entries if key[0] == game_id]:
+                del self._entries[key]
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit, miss and coalesced-request counters plus the cache size."""
+
+        with self._lock:
+            return {**self._stats, "size": len(self._entries)}
+
+
+class AsyncLeaderboardClient:
+    """Asyncio façade over a blocking leaderboard client with per-call deadlines.
+
+    Each call runs the wrapped client in a worker thread via
+    :func:`asyncio.to_thread` and raises :class:`asyncio.TimeoutError` once
+    ``timeout`` seconds pass. The worker thread cannot be interrupted and
+    finishes in the background. Successful ``get_top_scores`` results are
+    remembered, and :meth:`last_known` returns them for fallback display.
+    """
+
+    def __init__(self, client, *, timeout: Optional[float] = 2.0) -> None:
+        self.client = client
+        self.timeout = timeout
+        self._last_known: Dict[_CacheKey, List[dict]] = {}
+        if hasattr(client, "submit_score_and_rank"):
+            self.submit_score_and_rank = self._submit_score_and_rank
+
+    async def _call(self, method: Callable, *args, timeout: Optional[float], **kwargs):
+        deadline = self.timeout if timeout is None else timeout
+        return await asyncio.wait_for(asyncio.to_thread(method, *args, **kwargs), deadline)
+
+    async def get_top_scores(self, game_id: str, limit: int = 5, *, timeout: Optional[float] = None) -> List[dict]:
+        scores = list(await self._call(self.client.get_top_scores, game_id, limit=limit, timeout=timeout))
+        self._last_known[(game_id, limit)] = scores
+        return list(scores)
+
+    async def submit_score(self, game_id: str, score: int, *, timeout: Optional[float] = None, **kwargs) -> dict:
+        return await self._call(self.client.submit_score, game_id, score, timeout=timeout, **kwargs)
+
+    async def _submit_score_and_rank(
+        self,
+        game_id: str,
+        score: int,
+        *,
+        limit: int = 5,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> dict:
+        response = await self._call(
+            self.client.submit_score_and_rank, game_id, score, limit=limit, timeout=timeout, **kwargs
+        )
+        if response.get("scores") is not None:
+            self._last_known[(game_id, limit)] = list(response["scores"])
+        return response
+
+    def last_known(self, game_id: str, limit: int = 5) -> Optional[List[dict]]:
+        """Return the most recent successful scores for ``(game_id, limit)``."""
+
+        scores = self._last_known.get((game_id, limit))
+        return list(scores) if scores is not None else None
+
+
+__all__ = ["AsyncLeaderboardClient", "CachingLeaderboardClient"]